@@ -1,39 +1,198 @@
 # Standard imports
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappushpop
+from itertools import count, repeat
+from math import ceil, log, sqrt
+import sys
+from statistics import NormalDist
+from time import perf_counter
+from warnings import warn
 # import itertools
 # import unittest
-from copy import deepcopy
 # from timeit import timeit
 # from collections import Counter
 
 # Third-party imports
-# from pandas import DataFrame as df
+import numpy as np
+from pandas import DataFrame as df
 # from pandas import read_csv
 
+# Local imports
+from ml_projects.transaction_store import TransactionStore
+
+
+
+try:
+    _count_bits = int.bit_count # Python 3.10+
+except AttributeError:
+    def _count_bits(bitset):
+        return bin(bitset).count('1')
+
+
+
+# Prefix trie of candidate itemsets (section 6.2.4 of the chapter below). Every node keeps
+# [count, children]; a transaction visits each prefix it contains exactly once, so after
+# one pass over the data a node's count is the support count of its prefix.
+# Transactions must be sorted and free of duplicates, as in TransactionStore.
+class _CandidateTrie(object):
+    def __init__(self, itemsets):
+        # Attributes
+        self.items = set()
+        self.root = dict()
+
+        # Call methods
+        for itemset in itemsets:
+            self.insert(itemset)
+
+
+    def insert(self, itemset):
+        children = self.root
+        for item in sorted(itemset):
+            node = children.get(item)
+            if node is None:
+                node = children[item] = [0, dict()]
+                self.items.add(item)
+            children = node[1]
+        return self
+
+
+    def count_transaction(self, transaction):
+        items = [item for item in transaction if item in self.items]
+        stack = [(self.root, 0)]
+        while stack:
+            children, start = stack.pop()
+            for i in range(start, len(items)):
+                node = children.get(items[i])
+                if node is not None:
+                    node[0] += 1
+                    if node[1]:
+                        stack.append((node[1], i + 1))
+        return self
+
+
+    def get_count(self, itemset):
+        node = None
+        children = self.root
+        for item in sorted(itemset):
+            node = children.get(item)
+            if node is None:
+                return 0
+            children = node[1]
+        return node[0] if node else None
+
+
+
+# Workers of the partitioned (SON) mining, module-level so that process pools can pickle them
+def _mine_partition(transaction_store, minsup, support_counting):
+    apriori_algorithm = AprioriAlgorithm(dataset = transaction_store, minsup = minsup, support_counting = support_counting)
+    return list(apriori_algorithm._mine_frequent_itemset_counts())
+
+
+def _count_partition(transaction_store, itemsets, support_counting):
+    apriori_algorithm = AprioriAlgorithm(dataset = transaction_store, support_counting = support_counting)
+    return apriori_algorithm._count_itemsets(itemsets)
+
 
 
 # https://www-users.cs.umn.edu/~kumar001/dmbook/ch6.pdf
+# Mining runs on the integer item codes of a TransactionStore; itemsets are sorted tuples of
+# codes internally and are decoded back to frozensets of labels in all_frequent_itemsets.
 class AprioriAlgorithm(object):
-    def __init__(self, *, dataset = None, minsup = None, minconf = None):
+    ITEMSET_MODES = ('all', 'closed', 'maximal')
+    MAX_CANDIDATES_ACTIONS = ('warn', 'raise')
+    RULE_METRICS = ('support', 'confident', 'lift')
+    SAMPLING_MODES = ('verify', 'estimate')
+    SUPPORT_COUNTING_MODES = ('horizontal', 'vertical')
+
+    def __init__(self, *, dataset = None, minsup = None, minconf = None, support_counting = 'horizontal',
+                 n_jobs = None, n_partitions = None, profile = False, max_candidates = None, itemset_mode = 'all',
+                 sample_size = None):
         # Attributes
         self.all_frequent_itemsets = None
         self.all_rules = None
         self.dataset = None
+        self.itemset_mode = None # 'all' frequent itemsets, or only the 'closed' or 'maximal' ones, see set_itemset_mode
+        self.level_stats = None # per-level stats of the last run when profiling, see set_profiling
+        self.max_candidates = None # candidate count of a level that triggers max_candidates_action
+        self.max_candidates_action = None
         self.minconf = None
         self.minsup = None
         self.n = None # number of transaction
+        self.n_jobs = None # worker processes of the partitioned mining, serial mining when None or 1
+        self.n_partitions = None # partitions of the dataset, one per worker when None
+        self.profile = None
+        self.profile_callback = None
+        self.sample_size = None # transactions drawn for sampled mining, exact mining when None, see set_sampling
+        self.sampling_delta = None
+        self.sampling_error = None
+        self.sampling_mode = None
+        self.sampling_random_state = None
+        self.sampling_stats = None # sample size, lowered minsup, negative border and misses of the last sampled run
+        self.support_bounds = None # itemset -> (lower, upper) confidence bounds of estimated supports
+        self.support_counting = None
+        self.transaction_store = None # encoded dataset, built lazily from a plain list of transactions
+        self._closed_itemsets_by_item = None # item code -> [(closed itemset codes, count)], in closed mode
+        self._item_tidsets = None # item code -> bitset of transaction ids, built lazily in vertical mode
+        self._itemset_counts = None # counts of the frequent itemsets and of their negative border, kept for add_transactions
+        self._n_scanned_transactions = 0 # transactions read by the counting passes
+        self._owns_transaction_store = False # False while transaction_store may be shared, add_transactions copies it first
 
         # Call methods
         self.set_dataset(dataset) if dataset else None
         self.set_minsup(minsup)
         self.set_minconf(minconf)
+        self.set_support_counting(support_counting)
+        self.set_parallelism(n_jobs, n_partitions = n_partitions)
+        self.set_profiling(profile)
+        self.set_max_candidates(max_candidates)
+        self.set_itemset_mode(itemset_mode)
+        self.set_sampling(sample_size)
 
 
     def set_dataset(self, dataset):
+        # Iterators of transactions are streamed into a transaction store
+        self._owns_transaction_store = not hasattr(dataset, '__len__')
+        if self._owns_transaction_store:
+            dataset = TransactionStore(dataset)
         self.dataset = dataset
         self.n = len(self.dataset)
+        self.transaction_store = dataset if isinstance(dataset, TransactionStore) else None
+        self._item_tidsets = None
+        self._itemset_counts = None
         return self
     
     
+    # 'closed': only itemsets without a superset of the same support (CHARM, Zaki & Hsiao, 2002). Every frequent
+    # itemset's support is still known: it is the largest support of its closed supersets (see get_support),
+    # and generate_all_rules gives a non-redundant basis of the rules: exact rules from the minimal generators
+    # of each closed itemset and approximate rules between closed itemsets.
+    # 'maximal': only itemsets without a frequent superset (GenMax-style depth-first search, Gouda & Zaki, 2005);
+    # subsets are frequent but their supports are counted on demand, and rules are not available.
+    # Both modes mine the tidsets depth-first, serially, and are much smaller and faster on dense data. They always
+    # count on tidsets, so n_jobs > 1, sampling and support_counting 'vertical' raise a ValueError with them.
+    def set_itemset_mode(self, itemset_mode):
+        if itemset_mode not in self.ITEMSET_MODES:
+            raise ValueError(f'itemset_mode must be one of {self.ITEMSET_MODES}, got {itemset_mode!r}')
+        self.itemset_mode = itemset_mode
+        self.all_frequent_itemsets = None
+        self.all_rules = None
+        self._itemset_counts = None
+        return self
+
+
+    def set_max_candidates(self, max_candidates, *, action = 'warn'):
+        # Guard against candidate explosion: warn, or raise a RuntimeError before counting a level
+        # with more than max_candidates candidates. Closed and maximal itemsets and FPGrowth generate no
+        # candidates and warn that max_candidates is ignored.
+        if action not in self.MAX_CANDIDATES_ACTIONS:
+            raise ValueError(f'action must be one of {self.MAX_CANDIDATES_ACTIONS}, got {action!r}')
+        self.max_candidates = max_candidates
+        self.max_candidates_action = action
+        return self
+
+
     def set_minconf(self, minconf):
         self.minconf = minconf
         return self
@@ -41,125 +200,835 @@ class AprioriAlgorithm(object):
 
     def set_minsup(self, minsup):
         self.minsup = minsup
+        self._itemset_counts = None
+        return self
+
+
+    def set_parallelism(self, n_jobs, *, n_partitions = None):
+        self.n_jobs = n_jobs
+        self.n_partitions = n_partitions
+        return self
+
+
+    # Profiling of the serial level-wise mining and of rule generation. level_stats[k-1] holds, for itemsets of size k:
+    # n_candidates, n_pruned (joined candidates dropped by downward closure), n_frequent, n_scanned_transactions,
+    # candidate_generation_seconds, counting_seconds, and after generate_all_rules n_rules and rule_generation_seconds.
+    # callback(apriori_algorithm, stats) is called with a level's stats when its counting or its rules are done.
+    # Nothing is timed or recorded when profile is False. add_transactions and sampling mode 'verify' are profiled
+    # too; partitioned mining, closed and maximal itemsets, sampling mode 'estimate' and FPGrowth warn and record nothing.
+    def set_profiling(self, profile, *, callback = None):
+        self.profile = profile or callback is not None
+        self.profile_callback = callback
+        return self
+
+
+    # Sampled mining (Toivonen, 1996), for itemset_mode 'all'. sample_size transactions are drawn without replacement;
+    # error and delta give the missing one: an itemset of support minsup has a sample support below minsup - error
+    # with probability at most exp(-2*error^2*sample_size) = delta.
+    # 'verify': the sample is mined at minsup - error, then one pass over the whole dataset counts these itemsets and
+    # their negative border. Results are exact; a frequent border itemset (a miss) only costs extra passes for the
+    # levels it opens, and sampling_stats['n_missed'] tells how often that happened. It saves full passes, not time:
+    # the one pass also counts the negative border, often many times the frequent itemsets, so on an in-memory
+    # store it is about as slow as exact mining, and sometimes slower.
+    # 'estimate': the sample alone is mined at minsup and supports are estimates, with Wilson score bounds at
+    # confidence 1 - delta in support_bounds. The dataset is never scanned, which suits minsup/minconf sweeps.
+    def set_sampling(self, sample_size = None, *, error = None, delta = 0.05, mode = 'verify', random_state = None):
+        if mode not in self.SAMPLING_MODES:
+            raise ValueError(f'mode must be one of {self.SAMPLING_MODES}, got {mode!r}')
+        if not 0 < delta < 1:
+            raise ValueError(f'delta must be between 0 and 1, got {delta!r}')
+        if error is not None and not 0 < error < 1:
+            raise ValueError(f'error must be between 0 and 1, got {error!r}')
+        if error is not None and mode == 'verify' and self.minsup is not None and error >= self.minsup:
+            raise ValueError(f"error must be below minsup in mode 'verify', got {error!r}")
+        if sample_size is None and error is not None:
+            sample_size = ceil(log(1/delta) / (2*error**2))
+        elif sample_size is not None and error is None:
+            error = sqrt(log(1/delta) / (2*sample_size))
+        self.sample_size = sample_size
+        self.sampling_delta = delta
+        self.sampling_error = error
+        self.sampling_mode = mode
+        self.sampling_random_state = random_state
+        self._itemset_counts = None
+        return self
+
+
+    def set_support_counting(self, support_counting):
+        if support_counting not in self.SUPPORT_COUNTING_MODES:
+            raise ValueError(f'support_counting must be one of {self.SUPPORT_COUNTING_MODES}, got {support_counting!r}')
+        self.support_counting = support_counting
         return self
         
 
     def set_transaction_dataset(self, *, transaction_dataset, transaction_id_column, itemset_column):
-        transaction_dataset_cloned = transaction_dataset.copy(deep = True)
-        transaction_dataset_cloned = transaction_dataset_cloned[{
-            transaction_id_column,
-            itemset_column
-        }] \
-        .dropna() \
-        .drop_duplicates() \
-        .sort_values([transaction_id_column, itemset_column]) \
-        .set_index([transaction_id_column])
-
-        self.dataset = []
-        for transaction_id in transaction_dataset_cloned.index.unique():
-            itemsets = transaction_dataset_cloned.loc[[transaction_id], itemset_column].tolist()
-            self.dataset.append(tuple(itemsets))
-        self.n = len(self.dataset)
+        transaction_store = TransactionStore.from_dataframe(
+            transaction_dataset,
+            transaction_id_column = transaction_id_column,
+            itemset_column = itemset_column
+        )
+        self.set_dataset(transaction_store)
+        self._owns_transaction_store = True
+        return self
+
+
+    # FUP algorithm (Cheung et al., 1996): only the new transactions are counted against the frequent
+    # itemsets and their negative border. The old transactions are rescanned only for itemsets that
+    # were infrequent before and are frequent among the new transactions. A transaction store passed to set_dataset
+    # is copied before the first transactions are added, so other users of that store are not affected.
+    def add_transactions(self, transactions):
+        transaction_store = self._get_transaction_store()
+        if not self._owns_transaction_store:
+            transaction_store = self.transaction_store = transaction_store.copy()
+            self._owns_transaction_store = True
+        n_old = self.n
+        transaction_store.add_transactions(transactions)
+        self.dataset = transaction_store
+        self.n = len(transaction_store)
+        self._item_tidsets = None
+
+        if self.all_frequent_itemsets is None:
+            return self
+        if self._itemset_counts is None or n_old == 0:
+            self.generate_all_frequent_itemsets()
+        else:
+            self._update_all_frequent_itemsets(n_old)
+
+        if self.all_rules is not None:
+            self.generate_all_rules()
         return self
 
 
     def generate_all_frequent_itemsets(self):
+        transaction_store = self._get_transaction_store()
         self.all_frequent_itemsets = dict()
+        self.support_bounds = None
+        self._check_itemset_mode()
 
-        frequent_single_itemsets = previous_frequent_itemsets = self._generate_frequent_single_itemsets()
-        self.all_frequent_itemsets.update(frequent_single_itemsets)
-
-        while True:
-            previous_itemsets = list(previous_frequent_itemsets.keys())
-            candidate_itemsets = self._generate_candidate_itemsets(previous_itemsets)
-            frequent_itemsets = self._prune_frequent_itemsets(candidate_itemsets)
+        if self.sample_size is not None and self.sampling_mode == 'estimate':
+            self._warn_profiling_unsupported("sampling mode 'estimate'")
+            frequent_itemset_counts = self._estimate_frequent_itemset_counts()
+        elif self.sample_size is not None:
+            frequent_itemset_counts = self._mine_frequent_itemset_counts_sampled()
+        elif self.itemset_mode == 'closed':
+            self._warn_profiling_unsupported("itemset_mode 'closed'")
+            self._warn_settings_ignored("itemset_mode 'closed'")
+            self._itemset_counts = None
+            frequent_itemset_counts = self._mine_closed_itemset_counts()
+        elif self.itemset_mode == 'maximal':
+            self._warn_profiling_unsupported("itemset_mode 'maximal'")
+            self._warn_settings_ignored("itemset_mode 'maximal'")
+            self._itemset_counts = None
+            frequent_itemset_counts = self._mine_maximal_itemset_counts()
+        elif self.n_jobs and self.n_jobs > 1:
+            self._warn_profiling_unsupported('n_jobs > 1')
+            self._itemset_counts = None
+            frequent_itemset_counts = self._mine_frequent_itemset_counts_partitioned()
+        else:
+            frequent_itemset_counts = self._mine_frequent_itemset_counts()
 
-            if frequent_itemsets:
-                self.all_frequent_itemsets.update(frequent_itemsets)
-                previous_frequent_itemsets = frequent_itemsets
-            else:
-                break
+        for itemset, count in frequent_itemset_counts.items():
+            self.all_frequent_itemsets[transaction_store.decode_itemset(itemset)] = round(count/self.n, 7)
         return self
 
 
     def generate_all_rules(self):
         self.all_rules = dict()
+        for antecedent, consequent, metrics in self.iter_rules():
+            self.all_rules[(antecedent, consequent)] = metrics
+        return self
+
+
+    def get_support(self, itemset):
+        # Support of any itemset: looked up, reconstructed from its closed supersets, or counted
+        if self.all_frequent_itemsets is None:
+            self.generate_all_frequent_itemsets()
+        itemset = frozenset(itemset)
+        support = self.all_frequent_itemsets.get(itemset)
+        if support is not None:
+            return support
 
+        codes = self._get_transaction_store().encode_itemset(itemset)
+        if codes is None:
+            return 0.0
+        count = self._get_closed_count(frozenset(codes)) if self.itemset_mode == 'closed' else None
+        if count is None:
+            count = self._count_itemsets([codes])[codes]
+        return round(count/self.n, 7)
+
+
+    # Rules are (antecedent, consequent, {'support', 'confident', 'lift'}) tuples, generated lazily from the
+    # supports of all_frequent_itemsets. With top_k only the best top_k rules by sort_by are kept in a heap
+    # and they are returned from best to worst.
+    def iter_rules(self, *, minconf = None, min_lift = None, top_k = None, sort_by = 'lift'):
         if not self.all_frequent_itemsets:
             self.generate_all_frequent_itemsets()
+        if sort_by not in self.RULE_METRICS:
+            raise ValueError(f'sort_by must be one of {self.RULE_METRICS}, got {sort_by!r}')
+        if top_k is not None and top_k < 0:
+            raise ValueError(f'top_k must be None or non-negative, got {top_k!r}')
+        if self.itemset_mode == 'maximal':
+            raise ValueError("Rules need the supports of all frequent itemsets, use itemset_mode 'all' or 'closed'")
+
+        rules = self._iter_rules(self.minconf if minconf is None else minconf, min_lift)
+        if top_k is None:
+            return rules
+        if top_k == 0:
+            return iter(())
+
+        # Min-heap of the best rules so far; the counter breaks ties without comparing frozensets
+        top_rules = list()
+        tiebreaker = count()
+        for rule in rules:
+            heap_item = (rule[2][sort_by], -next(tiebreaker), rule)
+            if len(top_rules) < top_k:
+                heappush(top_rules, heap_item)
+            elif heap_item > top_rules[0]:
+                heappushpop(top_rules, heap_item)
+        return iter([heap_item[2] for heap_item in sorted(top_rules, reverse = True)])
+
+
+    def rules_dataframe(self, **iter_rules_kwargs):
+        rows = (
+            (antecedent, consequent, metrics['support'], metrics['confident'], metrics['lift'])
+            for antecedent, consequent, metrics in self.iter_rules(**iter_rules_kwargs)
+        )
+        return df(data = list(rows), columns = ['antecedent', 'consequent', *self.RULE_METRICS])
+
+
+    def _build_item_tidsets(self, codes):
+        # One pass over the dataset: bit i of an item's tidset is set when transaction i contains the item
+        codes = set(codes)
+        item_tids = {code: array('q') for code in codes}
+        for tid, transaction in enumerate(self._get_transaction_store().iter_encoded_transactions()):
+            for code in transaction:
+                if code in codes:
+                    item_tids[code].append(tid)
+
+        self._n_scanned_transactions += self.n
+        n_bytes = (self.n + 7) // 8
+        for code, tids in item_tids.items():
+            bits = bytearray(n_bytes)
+            for tid in tids:
+                bits[tid >> 3] |= 1 << (tid & 7)
+            self._item_tidsets[code] = int.from_bytes(bits, 'little')
+        return self._item_tidsets
+
+
+    @staticmethod
+    def _add_maximal_itemset(itemset, count, maximal_itemsets_by_item):
+        for code in itemset:
+            maximal_itemsets_by_item.setdefault(code, []).append((itemset, count))
+
 
-        for frequent_itemset, support in self.all_frequent_itemsets.items():
-            if len(frequent_itemset) <= 1:
-                continue
-            
-            self._generate_rules(itemset=frequent_itemset)
-        return self
-    
-    
     def _calculate_support(self, itemset):
-        itemset_cloned = frozenset(itemset)
-        support = 0.0
-        for event in self.dataset:
-            if itemset_cloned.issubset(frozenset(event)):
-                support += 1
-        return support/self.n
+        itemset_cloned = self._get_transaction_store().encode_itemset(itemset)
+        if itemset_cloned is None:
+            return 0/self.n
+        return self._count_itemsets([itemset_cloned])[itemset_cloned]/self.n
+
+
+    def _check_itemset_mode(self):
+        if self.itemset_mode == 'all':
+            return
+        if self.sample_size is not None:
+            raise ValueError(f"Sampling needs itemset_mode 'all', got {self.itemset_mode!r}")
+        if self.n_jobs and self.n_jobs > 1:
+            raise ValueError(f"n_jobs > 1 needs itemset_mode 'all', got {self.itemset_mode!r}")
+        if self.support_counting == 'vertical':
+            raise ValueError(f"support_counting 'vertical' needs itemset_mode 'all', got {self.itemset_mode!r}")
+
+
+    def _check_max_candidates(self, candidate_itemsets):
+        if not candidate_itemsets or len(candidate_itemsets) <= self.max_candidates:
+            return
+        message = (
+            f'{len(candidate_itemsets)} candidate itemsets of size {len(candidate_itemsets[0])} '
+            f'exceed max_candidates = {self.max_candidates}; consider a higher minsup'
+        )
+        if self.max_candidates_action == 'raise':
+            raise RuntimeError(message)
+        warn(message, RuntimeWarning, stacklevel = self._get_warning_stacklevel())
+
+
+    def _count_frequent_item_tidsets(self):
+        # (code, tidset, count) of the frequent items, by ascending support
+        if self._item_tidsets is None:
+            self._item_tidsets = dict()
+        item_counts = {itemset[0]: count for itemset, count in self._count_frequent_single_itemsets().items()}
+        missing_codes = [code for code in item_counts if code not in self._item_tidsets]
+        if missing_codes:
+            self._build_item_tidsets(missing_codes)
+        return sorted(
+            ((code, self._item_tidsets[code], count) for code, count in item_counts.items()),
+            key = lambda item: (item[2], item[0])
+        )
+
+
+    def _count_frequent_single_itemsets(self):
+        return self._filter_frequent_itemset_counts(self._count_single_itemsets())
+
+
+    def _count_single_itemsets(self):
+        item_counts = self._get_transaction_store().item_counts
+        return {(code,): count for code, count in enumerate(item_counts)}
+
+
+    def _count_itemsets(self, itemsets, start = 0, stop = None):
+        if self.support_counting == 'vertical' and start == 0 and stop is None:
+            return self._count_itemsets_vertical(itemsets)
+
+        # One pass over the dataset (or over transactions start..stop-1) for the whole batch of candidates
+        candidate_trie = _CandidateTrie(itemsets)
+        for transaction in self._get_transaction_store().iter_encoded_transactions(start, stop):
+            candidate_trie.count_transaction(transaction)
+
+        n = (self.n if stop is None else stop) - start
+        self._n_scanned_transactions += n
+        itemset_counts = dict()
+        for itemset in itemsets:
+            count = candidate_trie.get_count(itemset)
+            itemset_counts[itemset] = n if count is None else count
+        return itemset_counts
+
+
+    def _count_itemsets_vertical(self, itemsets):
+        if self._item_tidsets is None:
+            self._item_tidsets = dict()
+        missing_codes = {code for itemset in itemsets for code in itemset if code not in self._item_tidsets}
+        if missing_codes:
+            self._build_item_tidsets(missing_codes)
+
+        # Candidates are joined siblings in prefix order, so the tidset of a shared prefix is intersected only once
+        prefix = prefix_tidset = None
+        itemset_counts = dict()
+        for itemset in itemsets:
+            if not itemset:
+                itemset_counts[itemset] = self.n
+                continue
+
+            if itemset[:-1] != prefix:
+                prefix = itemset[:-1]
+                prefix_tidset = -1 # all bits set
+                for code in prefix:
+                    prefix_tidset &= self._item_tidsets[code]
+            itemset_counts[itemset] = _count_bits(prefix_tidset & self._item_tidsets[itemset[-1]])
+        return itemset_counts
+
+
+    def _count_supports(self, itemsets):
+        transaction_store = self._get_transaction_store()
+        encoded_itemsets = {itemset: transaction_store.encode_itemset(itemset) for itemset in itemsets}
+        itemset_counts = self._count_itemsets([
+            encoded_itemset for encoded_itemset in encoded_itemsets.values() if encoded_itemset is not None
+        ])
+
+        supports = dict()
+        for itemset, encoded_itemset in encoded_itemsets.items():
+            supports[itemset] = (0 if encoded_itemset is None else itemset_counts[encoded_itemset])/self.n
+        return supports
+
+
+    def _estimate_frequent_itemset_counts(self):
+        # Sample counts scaled to the dataset size, so that count/n is the sample support
+        transaction_store = self._get_transaction_store()
+        self._itemset_counts = None
+        sample_algorithm = self._mine_sample(self.minsup)
+        sample_size = sample_algorithm.n
+        frequent_itemset_counts = sample_algorithm._filter_frequent_itemset_counts(sample_algorithm._itemset_counts)
+
+        # Wilson score interval, with the finite population correction folded into z
+        z = NormalDist().inv_cdf(1 - self.sampling_delta/2) * sqrt((self.n - sample_size) / max(self.n - 1, 1))
+        self.support_bounds = dict()
+        for itemset, count in frequent_itemset_counts.items():
+            support = count/sample_size
+            center = (support + z**2/(2*sample_size)) / (1 + z**2/sample_size)
+            half_width = z/(1 + z**2/sample_size) * sqrt(support*(1 - support)/sample_size + z**2/(4*sample_size**2))
+            self.support_bounds[transaction_store.decode_itemset(itemset)] = (
+                round(max(center - half_width, 0.0), 7), round(min(center + half_width, 1.0), 7)
+            )
+
+        self.sampling_stats = {
+            'sample_size': sample_size,
+            'mining_minsup': self.minsup,
+            'n_sample_frequent': len(frequent_itemset_counts),
+            'n_scanned_transactions': sample_algorithm._n_scanned_transactions
+        }
+        return {itemset: count*self.n/sample_size for itemset, count in frequent_itemset_counts.items()}
+
+
+    def _extend_closed_itemsets(self, nodes, closed_itemsets):
+        # CHARM over [itemset, tidset, count] nodes sharing a prefix, by ascending support. Itemsets grow in place with
+        # every item whose tidset contains theirs (properties 1 and 2); a node whose tidset is contained in the current
+        # one is only explored below it (property 3). closed_itemsets maps a tidset to its closed itemset.
+        for i in range(len(nodes)):
+            itemset, tidset, count = nodes[i]
+            if itemset is None:
+                continue
+
+            children = list()
+            for j in range(i + 1, len(nodes)):
+                other_itemset, other_tidset, other_count = nodes[j]
+                if other_itemset is None:
+                    continue
+                child_tidset = tidset & other_tidset
+                if child_tidset == tidset:
+                    itemset |= other_itemset
+                    if count == other_count:
+                        nodes[j][0] = None
+                elif child_tidset == other_tidset:
+                    nodes[j][0] = None
+                    children.append([other_itemset, child_tidset, other_count])
+                else:
+                    child_count = _count_bits(child_tidset)
+                    if child_count/self.n >= self.minsup:
+                        children.append([other_itemset, child_tidset, child_count])
+
+            if children:
+                for child in children:
+                    child[0] = itemset | child[0]
+                children.sort(key = lambda child: child[2])
+                self._extend_closed_itemsets(children, closed_itemsets)
+
+            # Itemsets found for one tidset are all subsets of its closure
+            closed_itemset = closed_itemsets.get(tidset)
+            closed_itemsets[tidset] = (itemset if closed_itemset is None else closed_itemset[0] | itemset, count)
+
+
+    def _extend_maximal_itemsets(self, head, head_count, tail, maximal_itemsets_by_item):
+        # GenMax-style search over the (code, tidset, count) extensions of head, tidsets already intersected with head's.
+        # Extensions in every transaction of head join it (parent equivalence), and a branch whose head plus tail is
+        # inside a known maximal itemset is skipped.
+        head = head + tuple(code for code, tidset, count in tail if count == head_count)
+        tail = [extension for extension in tail if extension[2] != head_count]
+        if self._is_subsumed(frozenset(head).union(code for code, tidset, count in tail), maximal_itemsets_by_item):
+            return
+        if not tail:
+            if head:
+                self._add_maximal_itemset(frozenset(head), head_count, maximal_itemsets_by_item)
+            return
+
+        for i, (code, tidset, count) in enumerate(tail):
+            child_tail = list()
+            for other_code, other_tidset, other_count in tail[i + 1:]:
+                child_tidset = tidset & other_tidset
+                child_count = _count_bits(child_tidset)
+                if child_count/self.n >= self.minsup:
+                    child_tail.append((other_code, child_tidset, child_count))
+            self._extend_maximal_itemsets(head + (code,), count, child_tail, maximal_itemsets_by_item)
+
+
+    def _filter_frequent_itemset_counts(self, itemset_counts):
+        return {itemset: count for itemset, count in itemset_counts.items() if count/self.n >= self.minsup}
+
 
-    
     @staticmethod
     def _generate_candidate_itemsets(itemsets):
-        candidate_itemsets = list()
-        for i, itemset in enumerate(itemsets[:-1]):
-            for itemset2 in itemsets[i+1:]:
-                itemset_cloned = list(deepcopy(itemset))
-                itemset_cloned.sort()
-                itemset2_cloned = list(deepcopy(itemset2))
-                itemset2_cloned.sort()
-                if itemset_cloned[:-1] == itemset2_cloned[:-1]:
-                    candidate_itemset = set().union(itemset_cloned, itemset2_cloned)
-                    candidate_itemsets.append(frozenset(candidate_itemset))
-        return candidate_itemsets
+        candidate_itemsets = AprioriAlgorithm._join_itemsets(tuple(sorted(itemset)) for itemset in itemsets)
+        return [frozenset(candidate_itemset) for candidate_itemset in candidate_itemsets]
 
 
     def _generate_frequent_single_itemsets(self):
-        single_itemsets = set()
-        for event in self.dataset:
-            for item in event:
-                single_itemsets.add(frozenset([item]))
-        frequent_single_itemsets = self._prune_frequent_itemsets(single_itemsets)
-        return frequent_single_itemsets
+        transaction_store = self._get_transaction_store()
+        return {
+            transaction_store.decode_itemset(itemset): round(count/self.n, 7)
+            for itemset, count in self._count_frequent_single_itemsets().items()
+        }
 
 
-    def _generate_rules(self, itemset, previous_consequents=None):
-        if previous_consequents:
-            consequents = self._generate_candidate_itemsets(previous_consequents)
-        else:
-            consequents = list(deepcopy(itemset))
+    def _get_closed_count(self, codes):
+        # Largest count of the closed supersets of codes, None when codes is not frequent
+        if not codes:
+            return self.n
+        closed_itemsets = min((self._closed_itemsets_by_item.get(code, []) for code in codes), key = len)
+        counts = [count for itemset_codes, count in closed_itemsets if codes <= itemset_codes]
+        return max(counts) if counts else None
+
+
+    def _get_transaction_store(self):
+        if self.transaction_store is None:
+            self.transaction_store = TransactionStore(self.dataset)
+            self._owns_transaction_store = True
+        return self.transaction_store
+
+
+    def _get_warning_stacklevel(self):
+        # Stack level of the first caller outside the modules of this miner's classes, for warnings raised deep
+        # inside the mining
+        module_names = {cls.__module__ for cls in type(self).__mro__}
+        frame = sys._getframe(1)
+        stacklevel = 1
+        while frame.f_back is not None and frame.f_globals.get('__name__') in module_names:
+            frame = frame.f_back
+            stacklevel += 1
+        return stacklevel
+
+
+    @staticmethod
+    def _is_subsumed(itemset, maximal_itemsets_by_item):
+        if not itemset:
+            return bool(maximal_itemsets_by_item)
+        maximal_itemsets = min((maximal_itemsets_by_item.get(code, []) for code in itemset), key = len)
+        return any(itemset <= maximal_itemset for maximal_itemset, count in maximal_itemsets)
+
+
+    def _iter_itemset_rules(self, itemset, supports, minconf, min_lift):
+        # Level-wise consequents (ap-genrules): confidence is anti-monotone in the consequent of rules from the
+        # same itemset, so only consequents of confident rules are joined into the next level. Itemsets are sorted
+        # tuples of item codes, keys of supports, and are decoded only in the rules
+        transaction_store = self._get_transaction_store()
+        itemset_support = supports[itemset]
+        consequents = [(code,) for code in itemset]
+        while consequents and len(consequents[0]) < len(itemset):
+            confident_consequents = list()
+            for consequent in consequents:
+                antecedent = tuple(code for code in itemset if code not in consequent)
+                confident = itemset_support / supports[antecedent]
+                if confident < minconf:
+                    continue
+                confident_consequents.append(consequent)
+
+                lift = confident / supports[consequent]
+                if min_lift is None or lift >= min_lift:
+                    yield transaction_store.decode_itemset(antecedent), transaction_store.decode_itemset(consequent), {
+                        'support': itemset_support,
+                        'confident': round(confident, 7),
+                        'lift': round(lift, 7)
+                    }
+            consequents = self._join_itemsets(confident_consequents)
+
+
+    def _iter_closed_rules(self, minconf, min_lift):
+        # Non-redundant rules (Zaki, 2000), for every closed itemset C2:
+        # - exact rules G -> C2 - G for the minimal generators G of C2, the smallest subsets with the support of C2.
+        #   Any rule X -> Y of confidence 1 follows from them: X contains a generator of closure(X), which contains Y.
+        # - approximate rules C1 -> C2 - C1 for closed C1 within C2. Any other rule X -> Y with closure(X) = C1 and
+        #   closure(X | Y) = C2 has the same support and confidence.
+        transaction_store = self._get_transaction_store()
+        for itemset_codes, itemset_count in self._iter_closed_itemset_counts():
+            itemset_support = round(itemset_count/self.n, 7)
+            antecedent_counts = {
+                antecedent_codes: antecedent_count
+                for code in itemset_codes
+                for antecedent_codes, antecedent_count in self._closed_itemsets_by_item[code]
+                if antecedent_codes < itemset_codes
+            }
+            antecedent_counts.update(
+                (generator_codes, itemset_count) for generator_codes in self._iter_minimal_generators(itemset_codes, itemset_count)
+            )
+            for antecedent_codes, antecedent_count in antecedent_counts.items():
+                confident = itemset_support / round(antecedent_count/self.n, 7)
+                if confident < minconf:
+                    continue
+                consequent_codes = itemset_codes - antecedent_codes
+                lift = confident / round(self._get_closed_count(consequent_codes)/self.n, 7)
+                if min_lift is None or lift >= min_lift:
+                    yield transaction_store.decode_itemset(antecedent_codes), transaction_store.decode_itemset(consequent_codes), {
+                        'support': itemset_support,
+                        'confident': round(confident, 7),
+                        'lift': round(lift, 7)
+                    }
+
+
+    def _iter_closed_itemset_counts(self):
+        seen_itemsets = set()
+        for closed_itemsets in self._closed_itemsets_by_item.values():
+            for itemset_codes, count in closed_itemsets:
+                if itemset_codes not in seen_itemsets:
+                    seen_itemsets.add(itemset_codes)
+                    yield itemset_codes, count
+
+
+    def _iter_minimal_generators(self, itemset_codes, itemset_count):
+        # Proper non-empty subsets of a closed itemset with its count and no such subset of their own, level-wise:
+        # only subsets with a larger count are extended by one more item
+        generators = list()
+        subsets = {frozenset([code]) for code in itemset_codes}
+        for size in range(1, len(itemset_codes)):
+            next_subsets = set()
+            for subset in subsets:
+                if any(generator <= subset for generator in generators):
+                    continue
+                if self._get_closed_count(subset) == itemset_count:
+                    generators.append(subset)
+                    yield subset
+                else:
+                    next_subsets.update(subset.union([code]) for code in itemset_codes if code not in subset)
+            subsets = next_subsets
+
 
-        if consequents and len(itemset) == len(consequents[0]):
+    def _iter_rules(self, minconf, min_lift):
+        minconf = minconf or 0
+        if self.itemset_mode == 'closed':
+            self._warn_profiling_unsupported("itemset_mode 'closed'")
+            yield from self._iter_closed_rules(minconf, min_lift)
             return
 
-        for consequent in deepcopy(consequents):
-            antecedent =  itemset.difference(frozenset([consequent]))
-            confident = self.all_frequent_itemsets[frozenset(itemset)] / self.all_frequent_itemsets[frozenset(antecedent)]
-            if confident >= self.minconf:
-                lift = confident / self.all_frequent_itemsets[frozenset([consequent])]
-                self.all_rules[(frozenset(antecedent), frozenset([consequent]))] = {
-                    'support': self.all_frequent_itemsets[frozenset(itemset)],
-                    'confident': round(confident, 7),
-                    'lift': round(lift, 7)
-                }
-            else:
-                consequents.remove(consequent)
-        
-        if consequents and len(itemset) > len(consequents[0]) + 1:
-            self._generate_rules(itemset, previous_consequents = consequents)
-        
+        # Supports by sorted code tuple, so that consequents are joined on codes whatever the label types are.
+        # When profiling, itemsets go by size so that the rules of each size are timed together
+        # (including the consumer's time)
+        transaction_store = self._get_transaction_store()
+        supports = {
+            transaction_store.encode_itemset(itemset): support for itemset, support in self.all_frequent_itemsets.items()
+        }
+        itemsets = sorted(supports, key = len) if self.profile else supports
+        k = n_rules = start_time = None
+        for itemset in itemsets:
+            if len(itemset) < 2:
+                continue
+            if self.profile and len(itemset) != k:
+                if k is not None:
+                    self._record_level_stats(k = k, n_rules = n_rules, rule_generation_seconds = perf_counter() - start_time)
+                k, n_rules, start_time = len(itemset), 0, perf_counter()
+            for rule in self._iter_itemset_rules(itemset, supports, minconf, min_lift):
+                if self.profile:
+                    n_rules += 1
+                yield rule
+        if self.profile and k is not None:
+            self._record_level_stats(k = k, n_rules = n_rules, rule_generation_seconds = perf_counter() - start_time)
+
+
+    @staticmethod
+    def _join_itemsets(itemsets):
+        # Canonical sorted tuples, grouped by their (k-1) prefix: only siblings are joined
+        sorted_itemsets = sorted(set(itemsets))
+        previous_itemsets = set(sorted_itemsets)
+        siblings = dict()
+        for itemset in sorted_itemsets:
+            siblings.setdefault(itemset[:-1], []).append(itemset[-1])
+
+        candidate_itemsets = list()
+        for prefix, last_items in siblings.items():
+            for i, item in enumerate(last_items[:-1]):
+                for item2 in last_items[i+1:]:
+                    candidate_itemset = prefix + (item, item2)
+                    # Downward closure: drop the candidate if any of its (k-1) subsets is missing.
+                    # Subsets without one of the last two items are the joined itemsets themselves.
+                    if all(
+                        candidate_itemset[:j] + candidate_itemset[j+1:] in previous_itemsets
+                        for j in range(len(prefix))
+                    ):
+                        candidate_itemsets.append(candidate_itemset)
+        return candidate_itemsets
+
+
+    def _mine_closed_itemset_counts(self):
+        closed_itemsets = dict()
+        nodes = [[{code}, tidset, count] for code, tidset, count in self._count_frequent_item_tidsets()]
+        self._extend_closed_itemsets(nodes, closed_itemsets)
+
+        self._closed_itemsets_by_item = dict()
+        closed_itemset_counts = dict()
+        for itemset, count in closed_itemsets.values():
+            itemset_codes = frozenset(itemset)
+            closed_itemset_counts[tuple(sorted(itemset_codes))] = count
+            for code in itemset_codes:
+                self._closed_itemsets_by_item.setdefault(code, []).append((itemset_codes, count))
+        return closed_itemset_counts
+
+
+    def _mine_frequent_itemset_counts(self, count_candidate_itemsets = None):
+        # Level-wise mining; count_candidate_itemsets(candidate_itemsets) returns the support counts of a level,
+        # one pass over the dataset by default. The sampled and incremental paths plug in their own counting.
+        # _itemset_counts ends up with the counts of the frequent itemsets and of their negative border.
+        count_candidate_itemsets = count_candidate_itemsets or self._count_itemsets
+        if self.profile:
+            self.level_stats = list()
+            start_time = perf_counter()
+        self._itemset_counts = self._count_single_itemsets()
+        frequent_itemset_counts = previous_frequent_itemset_counts = self._filter_frequent_itemset_counts(self._itemset_counts)
+        if self.profile:
+            self._record_level_stats(
+                n_candidates = len(self._itemset_counts),
+                n_pruned = 0,
+                n_frequent = len(previous_frequent_itemset_counts),
+                n_scanned_transactions = 0, # item counts are kept by the transaction store
+                candidate_generation_seconds = 0.0,
+                counting_seconds = perf_counter() - start_time
+            )
+
+        while previous_frequent_itemset_counts:
+            if self.profile:
+                start_time = perf_counter()
+                n_joined = sum(n*(n - 1)//2 for n in Counter(itemset[:-1] for itemset in previous_frequent_itemset_counts).values())
+            candidate_itemsets = self._join_itemsets(previous_frequent_itemset_counts)
+            if self.profile:
+                counting_start_time = perf_counter()
+                n_scanned_transactions = self._n_scanned_transactions
+            if self.max_candidates is not None:
+                self._check_max_candidates(candidate_itemsets)
+
+            itemset_counts = count_candidate_itemsets(candidate_itemsets)
+            self._itemset_counts.update(itemset_counts)
+            previous_frequent_itemset_counts = self._filter_frequent_itemset_counts(itemset_counts)
+            frequent_itemset_counts.update(previous_frequent_itemset_counts)
+            if self.profile:
+                self._record_level_stats(
+                    n_candidates = len(candidate_itemsets),
+                    n_pruned = n_joined - len(candidate_itemsets),
+                    n_frequent = len(previous_frequent_itemset_counts),
+                    n_scanned_transactions = self._n_scanned_transactions - n_scanned_transactions,
+                    candidate_generation_seconds = counting_start_time - start_time,
+                    counting_seconds = perf_counter() - counting_start_time
+                )
+        return frequent_itemset_counts
+
+
+    def _mine_frequent_itemset_counts_partitioned(self):
+        # SON algorithm: an itemset frequent in the whole dataset is frequent in at least one partition
+        transaction_store = self._get_transaction_store()
+        n_partitions = min(self.n_partitions or self.n_jobs, self.n) or 1
+        bounds = [self.n * i // n_partitions for i in range(n_partitions + 1)]
+        partitions = [transaction_store.get_partition(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        with ProcessPoolExecutor(max_workers = self.n_jobs) as executor:
+            # Phase 1: locally frequent itemsets of every partition, with a tiny slack against float rounding
+            candidate_itemsets = set()
+            local_minsup = self.minsup * (1 - 1e-9)
+            for itemsets in executor.map(_mine_partition, partitions, repeat(local_minsup), repeat(self.support_counting)):
+                candidate_itemsets.update(itemsets)
+
+            # Phase 2: global support count of the union of the candidates
+            candidate_itemsets = sorted(candidate_itemsets)
+            itemset_counts = dict.fromkeys(candidate_itemsets, 0)
+            for partition_itemset_counts in executor.map(
+                _count_partition, partitions, repeat(candidate_itemsets), repeat(self.support_counting)
+            ):
+                for itemset, count in partition_itemset_counts.items():
+                    itemset_counts[itemset] += count
+        return self._filter_frequent_itemset_counts(itemset_counts)
+
+
+    def _mine_frequent_itemset_counts_sampled(self):
+        # Itemsets frequent in the sample at the lowered minsup, and their negative border, are the counts the sample
+        # miner keeps. One pass over the dataset counts them all; the level-wise mining then only counts candidates
+        # that are missing, which happens when a border itemset was missed.
+        # The lowered minsup is clamped to the smallest positive float, every itemset of the sample, when error >= minsup
+        sample_minsup = max(self.minsup - self.sampling_error, sys.float_info.min)
+        sample_algorithm = self._mine_sample(sample_minsup)
+        sample_itemset_counts = sample_algorithm._itemset_counts
+        n_sample_frequent = len(sample_algorithm._filter_frequent_itemset_counts(sample_itemset_counts))
+
+        n_scanned_transactions = self._n_scanned_transactions
+        known_itemset_counts = self._count_itemsets([itemset for itemset in sample_itemset_counts if len(itemset) > 1])
+        n_missed = sum(
+            1 for itemset, count in {**self._count_single_itemsets(), **known_itemset_counts}.items()
+            if count/self.n >= self.minsup and sample_itemset_counts[itemset]/sample_algorithm.n < sample_minsup
+        )
+
+        def count_candidate_itemsets(candidate_itemsets):
+            missing_itemsets = [itemset for itemset in candidate_itemsets if itemset not in known_itemset_counts]
+            if missing_itemsets:
+                known_itemset_counts.update(self._count_itemsets(missing_itemsets))
+            return {itemset: known_itemset_counts[itemset] for itemset in candidate_itemsets}
+
+        frequent_itemset_counts = self._mine_frequent_itemset_counts(count_candidate_itemsets)
+        self.sampling_stats = {
+            'sample_size': sample_algorithm.n,
+            'mining_minsup': sample_minsup,
+            'n_sample_frequent': n_sample_frequent,
+            'n_negative_border': len(sample_itemset_counts) - n_sample_frequent,
+            'n_missed': n_missed,
+            'n_scanned_transactions': sample_algorithm._n_scanned_transactions + self._n_scanned_transactions - n_scanned_transactions
+        }
+        return frequent_itemset_counts
+
+
+    def _mine_maximal_itemset_counts(self):
+        maximal_itemsets_by_item = dict()
+        self._extend_maximal_itemsets((), self.n, self._count_frequent_item_tidsets(), maximal_itemsets_by_item)
+        maximal_itemset_counts = dict()
+        for maximal_itemsets in maximal_itemsets_by_item.values():
+            for itemset, count in maximal_itemsets:
+                maximal_itemset_counts[tuple(sorted(itemset))] = count
+        return maximal_itemset_counts
+
+
+    def _mine_sample(self, minsup):
+        # Serial level-wise mining of a random sample sharing the item codes of the dataset
+        sample_size = min(self.sample_size, self.n)
+        rng = np.random.default_rng(self.sampling_random_state)
+        indices = np.sort(rng.choice(self.n, size = sample_size, replace = False))
+        sample_algorithm = AprioriAlgorithm(
+            dataset = self._get_transaction_store().get_subset(indices),
+            minsup = minsup,
+            support_counting = self.support_counting
+        )
+        sample_algorithm.set_max_candidates(self.max_candidates, action = self.max_candidates_action)
+        sample_algorithm._mine_frequent_itemset_counts()
+        return sample_algorithm
+
 
     def _prune_frequent_itemsets(self, itemsets):
         frequent_itemsets = dict()
-        for itemset in itemsets:
-            itemset_cloned = frozenset(itemset)
-            support = self._calculate_support(itemset_cloned)
+        itemsets_cloned = [frozenset(itemset) for itemset in itemsets]
+        for itemset, support in self._count_supports(itemsets_cloned).items():
             if support >= self.minsup:
-                frequent_itemsets[itemset_cloned] = round(support, 7)
-        return frequent_itemsets
\ No newline at end of file
+                frequent_itemsets[itemset] = round(support, 7)
+        return frequent_itemsets
+
+
+    def _record_level_stats(self, *, k = None, **stats):
+        # New level when k is None, otherwise the stats of level k are updated
+        if self.level_stats is None:
+            self.level_stats = list()
+        if k is None:
+            k = len(self.level_stats) + 1
+        while len(self.level_stats) < k:
+            self.level_stats.append({'k': len(self.level_stats) + 1})
+        level_stats = self.level_stats[k - 1]
+        level_stats.update(stats)
+        if self.profile_callback is not None:
+            self.profile_callback(self, level_stats)
+        return level_stats
+
+
+    def _update_all_frequent_itemsets(self, n_old):
+        transaction_store = self._get_transaction_store()
+        n_new = self.n - n_old
+        previous_itemset_counts = self._itemset_counts
+
+        # Item counts of the store already include the new transactions; larger candidates are counted in the
+        # new transactions and added to their previous counts
+        def count_candidate_itemsets(candidate_itemsets):
+            new_itemset_counts = self._count_itemsets(candidate_itemsets, start = n_old)
+
+            # Candidates missing from the previous counts had an infrequent subset, so they were infrequent
+            # in the old transactions: they can only be frequent now if they are frequent in the new ones
+            itemset_counts = dict()
+            rescanned_itemsets = list()
+            for itemset in candidate_itemsets:
+                if itemset in previous_itemset_counts:
+                    itemset_counts[itemset] = previous_itemset_counts[itemset] + new_itemset_counts[itemset]
+                elif n_new and new_itemset_counts[itemset]/n_new >= self.minsup:
+                    rescanned_itemsets.append(itemset)
+            if rescanned_itemsets:
+                old_itemset_counts = self._count_itemsets(rescanned_itemsets, stop = n_old)
+                for itemset in rescanned_itemsets:
+                    itemset_counts[itemset] = old_itemset_counts[itemset] + new_itemset_counts[itemset]
+            return itemset_counts
+
+        frequent_itemset_counts = self._mine_frequent_itemset_counts(count_candidate_itemsets)
+        self.all_frequent_itemsets = dict()
+        for itemset, count in frequent_itemset_counts.items():
+            self.all_frequent_itemsets[transaction_store.decode_itemset(itemset)] = round(count/self.n, 7)
+        return self
+
+
+    def _warn_profiling_unsupported(self, path):
+        # Only the serial level-wise mining (exact, verified sampling or add_transactions) is profiled
+        if not self.profile:
+            return
+        self.level_stats = None
+        warn(f'Profiling records nothing with {path}', RuntimeWarning, stacklevel = self._get_warning_stacklevel())
+
+
+    def _warn_settings_ignored(self, path):
+        # max_candidates and n_jobs only apply to the level-wise mining
+        ignored_settings = list()
+        if self.max_candidates is not None:
+            ignored_settings.append('max_candidates')
+        if self.n_jobs and self.n_jobs > 1:
+            ignored_settings.append('n_jobs > 1')
+        if ignored_settings:
+            warn(f"{' and '.join(ignored_settings)} ignored with {path}", RuntimeWarning, stacklevel = self._get_warning_stacklevel())
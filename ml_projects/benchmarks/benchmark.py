@@ -0,0 +1,211 @@
+# Standard imports
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from ml_projects.apriori_algorithm import AprioriAlgorithm
+from ml_projects.benchmarks.generators import (
+    CAR_INPUT_FEATURES, CAR_OUTPUT_FEATURE, generate_regression_data, generate_transactions, transactions_to_line_items
+)
+from ml_projects.fp_growth import FPGrowth
+from ml_projects.linear_regression.multivariate import MultivariateLinearRegression
+from ml_projects.linear_regression.univariate import UnivariateLinearRegression
+
+
+
+# Wall-clock time and tracemalloc peak of named phases:
+#     benchmark = Benchmark(config = {...})
+#     with benchmark.phase('apriori.generate_all_frequent_itemsets'):
+#         ...
+#     benchmark.save('results.json')
+# tracemalloc slows allocation-heavy code down, so trace_memory = False gives cleaner timings.
+class Benchmark(object):
+    def __init__(self, *, config = None, trace_memory = True):
+        # Parameters
+        self.config = dict(config or {})
+        self.trace_memory = trace_memory
+
+        # Attributes
+        self.phases = list()
+        self._peak_stack = list() # tracemalloc peak so far of each open phase, kept when a nested phase resets it
+
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path) as file:
+            results = json.load(file)
+        benchmark = cls(config = results['config'], trace_memory = results['trace_memory'])
+        benchmark.phases = results['phases']
+        return benchmark
+
+
+    def compare(self, baseline, *, time_tolerance = 0.2, memory_tolerance = 0.2):
+        # Phases that are slower or use more memory than in the baseline by more than the relative tolerance
+        if baseline.config != self.config:
+            raise ValueError(f'Cannot compare runs with different configs: {baseline.config} != {self.config}')
+        baseline_phases = {phase['name']: phase for phase in baseline.phases}
+        regressions = list()
+        for phase in self.phases:
+            baseline_phase = baseline_phases.get(phase['name'])
+            if baseline_phase is None:
+                continue
+            for metric, tolerance in [('seconds', time_tolerance), ('peak_memory_bytes', memory_tolerance)]:
+                value, baseline_value = phase[metric], baseline_phase[metric]
+                if value is None or baseline_value is None:
+                    continue
+                if value > baseline_value * (1 + tolerance):
+                    regressions.append({
+                        'name': phase['name'],
+                        'metric': metric,
+                        'baseline': baseline_value,
+                        'value': value,
+                        'ratio': value / baseline_value if baseline_value else float('inf')
+                    })
+        return regressions
+
+
+    @contextmanager
+    def phase(self, name):
+        # Nested phases share the tracemalloc peak: the enclosing phase's peak is saved before it is reset,
+        # and the nested phase's peak is folded back into it when the nested phase ends
+        is_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if is_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            if self._peak_stack:
+                self._peak_stack[-1] = max(self._peak_stack[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if self.trace_memory:
+            self._peak_stack.append(0)
+        start_memory = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        start_time = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start_time
+            peak_memory = None
+            if self.trace_memory:
+                peak = max(self._peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peak_stack:
+                    self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+                peak_memory = peak - start_memory
+            if is_tracing:
+                tracemalloc.stop()
+            self.phases.append({'name': name, 'seconds': seconds, 'peak_memory_bytes': peak_memory})
+
+
+    def save(self, file_path):
+        with open(file_path, 'w') as file:
+            json.dump(self.to_dict(), file, indent = 2)
+        return self
+
+
+    def to_dict(self):
+        return {
+            'config': self.config,
+            'environment': {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine()},
+            'trace_memory': self.trace_memory,
+            'phases': self.phases
+        }
+
+
+
+# Mining and regression hot paths on seeded synthetic data; scale multiplies every dataset size
+def run_benchmarks(*, scale = 1.0, minsup = 0.01, minconf = 0.5, n_items = 1000, avg_transaction_size = 10,
+                   random_state = 0, trace_memory = True):
+    n_transactions = int(round(10000 * scale))
+    benchmark = Benchmark(config = {
+        'scale': scale,
+        'n_transactions': n_transactions,
+        'n_items': n_items,
+        'avg_transaction_size': avg_transaction_size,
+        'minsup': minsup,
+        'minconf': minconf,
+        'random_state': random_state
+    }, trace_memory = trace_memory)
+
+    with benchmark.phase('generators.generate_transactions'):
+        transactions = generate_transactions(
+            n_transactions = n_transactions,
+            n_items = n_items,
+            avg_transaction_size = avg_transaction_size,
+            random_state = random_state
+        )
+        line_items_df = transactions_to_line_items(transactions)
+
+    with benchmark.phase('apriori.set_transaction_dataset'):
+        apriori_algorithm = AprioriAlgorithm(minsup = minsup, minconf = minconf).set_transaction_dataset(
+            transaction_dataset = line_items_df,
+            transaction_id_column = 'order_id',
+            itemset_column = 'item'
+        )
+    for support_counting in AprioriAlgorithm.SUPPORT_COUNTING_MODES:
+        apriori_algorithm.set_support_counting(support_counting).set_minsup(minsup)
+        with benchmark.phase(f'apriori.generate_all_frequent_itemsets.{support_counting}'):
+            apriori_algorithm.generate_all_frequent_itemsets()
+    with benchmark.phase('apriori.generate_all_rules'):
+        apriori_algorithm.generate_all_rules()
+    with benchmark.phase('fp_growth.generate_all_frequent_itemsets'):
+        FPGrowth(dataset = apriori_algorithm.transaction_store, minsup = minsup, minconf = minconf).generate_all_frequent_itemsets()
+
+    with benchmark.phase('generators.generate_regression_data'):
+        regression_df = generate_regression_data(scale = scale, random_state = random_state)
+    # Gradient descent runs a fixed number of iterations, so the timings do not depend on convergence
+    with benchmark.phase('univariate.train'):
+        model = UnivariateLinearRegression(regression_df, 'Engine HP', CAR_OUTPUT_FEATURE)
+        model.set_cost_tolerance(None)
+        model.set_max_iterations(10000)
+        model.train()
+    with benchmark.phase('univariate.fit'):
+        UnivariateLinearRegression(regression_df, 'Engine HP', CAR_OUTPUT_FEATURE).fit()
+    with benchmark.phase('multivariate.train'):
+        model = MultivariateLinearRegression(regression_df, CAR_INPUT_FEATURES, CAR_OUTPUT_FEATURE)
+        model.set_learning_rate(0.01)
+        model.set_cost_tolerance(None)
+        model.set_max_iterations(1000)
+        model.train()
+    with benchmark.phase('multivariate.fit'):
+        MultivariateLinearRegression(regression_df, CAR_INPUT_FEATURES, CAR_OUTPUT_FEATURE).fit()
+    return benchmark
+
+
+def main(argv = None):
+    # python -m ml_projects.benchmarks.benchmark --output new.json --baseline old.json
+    parser = argparse.ArgumentParser(description = 'Benchmark the mining and regression hot paths.')
+    parser.add_argument('--scale', type = float, default = 1.0)
+    parser.add_argument('--minsup', type = float, default = 0.01)
+    parser.add_argument('--random-state', type = int, default = 0)
+    parser.add_argument('--no-trace-memory', action = 'store_true')
+    parser.add_argument('--output', help = 'JSON file for the results')
+    parser.add_argument('--baseline', help = 'JSON results of an earlier run to compare with')
+    parser.add_argument('--tolerance', type = float, default = 0.2)
+    args = parser.parse_args(argv)
+
+    benchmark = run_benchmarks(
+        scale = args.scale, minsup = args.minsup, random_state = args.random_state, trace_memory = not args.no_trace_memory
+    )
+    for phase in benchmark.phases:
+        peak_memory = '' if phase['peak_memory_bytes'] is None else f"{phase['peak_memory_bytes'] / 2**20:10.1f} MiB"
+        print(f"{phase['name']:<50}{phase['seconds']:10.4f} s{peak_memory}")
+    if args.output:
+        benchmark.save(args.output)
+
+    if args.baseline:
+        regressions = benchmark.compare(
+            Benchmark.load(args.baseline), time_tolerance = args.tolerance, memory_tolerance = args.tolerance
+        )
+        for regression in regressions:
+            print(f"Regression in {regression['name']} ({regression['metric']}): x{regression['ratio']:.2f}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+# Standard imports
+import os
+
+# Third-party imports
+import numpy as np
+from pandas import DataFrame as df
+from pandas import read_csv
+
+# Local imports
+
+
+
+CAR_DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'linear_regression', 'car_dataset.csv')
+CAR_INPUT_FEATURES = ('Year', 'Engine HP', 'Engine Cylinders', 'highway MPG', 'city mpg', 'Popularity')
+CAR_OUTPUT_FEATURE = 'MSRP'
+
+
+
+# Synthetic market baskets in the style of the IBM Quest generator (Agrawal & Srikant, 1994):
+# - n_patterns potentially frequent itemsets, of Poisson(avg_pattern_size) items, each sharing an
+#   exponentially distributed fraction (mean correlation) of its items with the previous pattern
+# - pattern weights are exponentially distributed, every pattern has a corruption level ~ N(0.5, 0.1)
+# - a transaction of Poisson(avg_transaction_size) items is filled with weighted patterns, dropping
+#   each item of a pattern with its corruption level
+# Items are the integers 0..n_items-1. The same random_state always gives the same transactions.
+# A transaction size is capped at the number of items the patterns can supply, and a transaction is closed after
+# 100 draws per item, so small n_items (or rare patterns) cannot stall the generator.
+def generate_transactions(*, n_transactions, n_items, avg_transaction_size, avg_pattern_size = 4, n_patterns = None,
+                          correlation = 0.5, random_state = None):
+    rng = np.random.default_rng(random_state)
+    n_patterns = n_patterns or max(n_items // 5, 1)
+
+    patterns = list()
+    for _ in range(n_patterns):
+        size = min(max(rng.poisson(avg_pattern_size), 1), n_items)
+        pattern = set()
+        if patterns:
+            n_shared = min(int(round(min(rng.exponential(correlation), 1) * size)), len(patterns[-1]))
+            pattern.update(rng.choice(patterns[-1], size = n_shared, replace = False).tolist())
+        while len(pattern) < size:
+            pattern.add(int(rng.integers(n_items)))
+        patterns.append(np.array(sorted(pattern)))
+    weights = rng.exponential(1.0, n_patterns)
+    weights /= weights.sum()
+    corruptions = np.clip(rng.normal(0.5, 0.1, n_patterns), 0, 1)
+    n_reachable_items = len(set().union(*(
+        pattern.tolist() for pattern, corruption in zip(patterns, corruptions) if corruption < 1
+    )))
+
+    transactions = list()
+    pattern_ids = iter(())
+    for size in np.maximum(rng.poisson(avg_transaction_size, n_transactions), 1).tolist():
+        size = min(size, n_reachable_items)
+        transaction = set()
+        for _ in range(100*size):
+            if len(transaction) >= size:
+                break
+            pattern_id = next(pattern_ids, None)
+            if pattern_id is None:
+                pattern_ids = iter(rng.choice(n_patterns, size = 1024, p = weights).tolist())
+                continue
+            pattern = patterns[pattern_id]
+            pattern = pattern[rng.uniform(size = len(pattern)) >= corruptions[pattern_id]]
+
+            # A pattern that does not fit is kept half of the time, otherwise the transaction is closed
+            if len(transaction) + len(pattern) > size and transaction and rng.uniform() < 0.5:
+                break
+            transaction.update(pattern.tolist())
+        transactions.append(tuple(sorted(transaction)))
+    return transactions
+
+
+def transactions_to_line_items(transactions, *, transaction_id_column = 'order_id', itemset_column = 'item'):
+    # One (transaction id, item) row per line item, the layout set_transaction_dataset expects
+    sizes = np.fromiter(map(len, transactions), dtype = np.int64, count = len(transactions))
+    return df({
+        transaction_id_column: np.repeat(np.arange(len(transactions)), sizes),
+        itemset_column: np.fromiter((item for transaction in transactions for item in transaction), dtype = np.int64, count = int(sizes.sum()))
+    })
+
+
+# Regression rows with the means, covariance and linear fit of the car dataset's numeric columns:
+# inputs ~ multivariate normal, output = least squares fit + normal noise with the residual's std.
+# n_rows defaults to the car dataset's row count times scale.
+def generate_regression_data(*, n_rows = None, scale = 1.0, random_state = None, file_path = CAR_DATASET_PATH,
+                             input_features = CAR_INPUT_FEATURES, output_feature = CAR_OUTPUT_FEATURE):
+    input_features = list(input_features)
+    car_df = read_csv(file_path, usecols = input_features + [output_feature]).dropna()
+    X = car_df[input_features].to_numpy(dtype = np.float64)
+    Y = car_df[output_feature].to_numpy(dtype = np.float64)
+    X_1 = np.column_stack([X, np.ones(len(X))])
+    theta = np.linalg.lstsq(X_1, Y, rcond = None)[0]
+    residual_std = (Y - X_1.dot(theta)).std()
+
+    rng = np.random.default_rng(random_state)
+    n_rows = n_rows or int(round(len(car_df) * scale))
+    generated_X = rng.multivariate_normal(X.mean(axis = 0), np.cov(X, rowvar = False), size = n_rows)
+    generated_Y = generated_X.dot(theta[:-1]) + theta[-1] + rng.normal(0, residual_std, n_rows)
+
+    generated_df = df(generated_X, columns = input_features)
+    generated_df[output_feature] = generated_Y
+    return generated_df
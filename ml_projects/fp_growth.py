@@ -0,0 +1,113 @@
+# Standard imports
+from collections import Counter
+
+# Third-party imports
+
+# Local imports
+from ml_projects.apriori_algorithm import AprioriAlgorithm
+
+
+
+class _FPNode(object):
+    __slots__ = ('item', 'count', 'parent', 'children')
+
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = dict()
+
+
+
+# https://www-users.cs.umn.edu/~kumar001/dmbook/ch6.pdf (section 6.6)
+# Same interface and output format as AprioriAlgorithm, but frequent itemsets are mined from
+# a compressed FP-tree with conditional trees instead of level-wise candidate generation.
+# Only all frequent itemsets of the whole dataset are mined, closed and maximal itemsets and sampling need
+# AprioriAlgorithm.
+class FPGrowth(AprioriAlgorithm):
+    ITEMSET_MODES = ('all',)
+
+    def set_sampling(self, sample_size = None, *, error = None, **sampling_kwargs):
+        if sample_size is not None or error is not None:
+            raise ValueError('FPGrowth mines the whole dataset, sampling needs AprioriAlgorithm')
+        return super().set_sampling(sample_size, error = error, **sampling_kwargs)
+
+
+    def generate_all_frequent_itemsets(self):
+        transaction_store = self._get_transaction_store()
+        self.all_frequent_itemsets = dict()
+        self._warn_profiling_unsupported('FPGrowth')
+        self._warn_settings_ignored('FPGrowth')
+
+        # First pass: support count of every single item, read from the transaction store
+        frequent_item_counts = {
+            itemset[0]: count for itemset, count in self._count_frequent_single_itemsets().items()
+        }
+
+        # Items of a transaction are inserted by descending support so that common prefixes are shared
+        item_order = sorted(frequent_item_counts, key = lambda code: -frequent_item_counts[code])
+        item_rank = {code: rank for rank, code in enumerate(item_order)}
+
+        # Second pass: build the FP-tree
+        weighted_transactions = (
+            (sorted((code for code in transaction if code in item_rank), key = item_rank.__getitem__), 1)
+            for transaction in transaction_store.iter_encoded_transactions()
+        )
+        header_table = self._build_fp_tree(weighted_transactions)
+
+        frequent_itemset_counts = dict()
+        self._mine_fp_tree(header_table, frozenset(), item_rank, frequent_itemset_counts)
+        for itemset, count in frequent_itemset_counts.items():
+            self.all_frequent_itemsets[transaction_store.decode_itemset(itemset)] = round(count/self.n, 7)
+        return self
+
+
+    @staticmethod
+    def _build_fp_tree(weighted_transactions):
+        root = _FPNode(None, None)
+        header_table = dict() # item -> all nodes of that item
+        for transaction, count in weighted_transactions:
+            node = root
+            for item in transaction:
+                child = node.children.get(item)
+                if child is None:
+                    child = node.children[item] = _FPNode(item, node)
+                    header_table.setdefault(item, []).append(child)
+                child.count += count
+                node = child
+        return header_table
+
+
+    def _mine_fp_tree(self, header_table, suffix, item_rank, frequent_itemset_counts):
+        # Least frequent items first, each one is the suffix of a conditional tree
+        for item in sorted(header_table, key = item_rank.__getitem__, reverse = True):
+            nodes = header_table[item]
+            itemset = suffix.union([item])
+            frequent_itemset_counts[itemset] = sum(node.count for node in nodes)
+
+            # Conditional pattern base: prefix paths of every node of the item
+            conditional_pattern_base = list()
+            conditional_item_counts = Counter()
+            for node in nodes:
+                path = list()
+                parent = node.parent
+                while parent.item is not None:
+                    path.append(parent.item)
+                    parent = parent.parent
+                if path:
+                    path.reverse()
+                    conditional_pattern_base.append((path, node.count))
+                    for path_item in path:
+                        conditional_item_counts[path_item] += node.count
+
+            conditional_frequent_items = {
+                path_item for path_item, count in conditional_item_counts.items() if count/self.n >= self.minsup
+            }
+            if not conditional_frequent_items:
+                continue
+
+            conditional_header_table = self._build_fp_tree(
+                ([path_item for path_item in path if path_item in conditional_frequent_items], count)
+                for path, count in conditional_pattern_base
+            )
+            self._mine_fp_tree(conditional_header_table, itemset, item_rank, frequent_itemset_counts)
@@ -1,57 +1,347 @@
 import numpy as np 
 import matplotlib.pyplot as plt
+import os
+import re
 import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, groupby, repeat
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
 from pandas import DataFrame as df
+from pandas import concat
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from pandas.io.sql import get_schema
 
 
 
-def plot_by_feature(df_, output_feature):
-    input_features = df_.columns.to_list()
-    input_features.remove(output_feature)
+PLOT_KINDS = ('auto', 'scatter', 'sample', 'hist2d', 'hexbin')
 
-    for input_feature in input_features:
-        if df_[input_feature].dtype not in [np.int64, np.float64]:
-            continue
-            
-        plt.plot(df_[input_feature], df_[output_feature], 'r.')
-        plt.xlabel(input_feature)
-        plt.ylabel(output_feature)
-        plt.suptitle(input_feature)
+
+
+# One plot of output_feature against every numeric input feature (all int, uint and float widths, nullable too).
+# kind: 'scatter' draws every row, 'sample' a downsample of max_points rows stratified on bins of the input feature
+# (sparse ranges and outliers are kept), 'hist2d' and 'hexbin' draw the counts of a bins x bins grid binned with NumPy.
+# 'auto' is 'scatter' up to max_points rows and 'hist2d' above.
+# All plots go into one figure grid of n_cols columns. With show the grid is shown with pyplot and None is returned,
+# so a notebook renders it once; without show it is built without pyplot and returned unshown, for savefig or for a
+# notebook to render as the cell's value. With output_dir every plot is saved as a PNG instead, by n_jobs worker
+# processes (serially when None or 1), named after its feature (made unique), and the file paths are returned.
+def plot_by_feature(df_, output_feature, *, kind = 'auto', max_points = 100000, bins = 100, n_cols = 3,
+                    output_dir = None, n_jobs = None, random_state = 0, show = True):
+    if kind not in PLOT_KINDS:
+        raise ValueError(f'kind must be one of {PLOT_KINDS}, got {kind!r}')
+    input_features = [
+        input_feature for input_feature in df_.columns
+        if input_feature != output_feature and is_numeric_dtype(df_[input_feature]) and not is_bool_dtype(df_[input_feature])
+    ]
+    y = df_[output_feature].to_numpy(dtype = np.float64, na_value = np.nan)
+    rng = np.random.default_rng(random_state)
+    plots = [
+        _aggregate_feature_plot(input_feature, df_[input_feature].to_numpy(dtype = np.float64, na_value = np.nan), y,
+                                kind, max_points, bins, rng)
+        for input_feature in input_features
+    ]
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok = True)
+        file_paths = [
+            os.path.join(output_dir, file_name + '.png') for file_name in _get_file_names([plot['feature'] for plot in plots])
+        ]
+        if n_jobs and n_jobs > 1:
+            with ProcessPoolExecutor(max_workers = n_jobs) as executor:
+                return list(executor.map(_save_feature_plot, plots, repeat(output_feature), file_paths))
+        return list(map(_save_feature_plot, plots, repeat(output_feature), file_paths))
+
+    n_rows = max(-(-len(plots) // n_cols), 1)
+    figure = (plt.figure if show else Figure)(figsize = (5*n_cols, 4*n_rows))
+    axes = figure.subplots(n_rows, n_cols, squeeze = False)
+    for ax, plot in zip(axes.flat, plots):
+        _draw_feature_plot(figure, ax, plot, output_feature)
+    for ax in axes.flat[len(plots):]:
+        ax.set_visible(False)
+    figure.tight_layout()
+    if show:
         plt.show()
-        print('\n\n\n')
+        return None
+    return figure
+
+
+def _aggregate_feature_plot(feature, x, y, kind, max_points, bins, rng):
+    # Small, picklable plot data: the points to draw, or the bin counts
+    is_finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[is_finite], y[is_finite]
+    if kind == 'auto':
+        kind = 'scatter' if len(x) <= max_points else 'hist2d'
+    if kind == 'sample' and len(x) > max_points:
+        keep = _stratified_sample(x, max_points, bins, rng)
+        x, y = x[keep], y[keep]
+
+    plot = {'feature': feature, 'kind': kind, 'n_rows': len(x)}
+    if kind in ('scatter', 'sample') or len(x) == 0:
+        plot.update(kind = 'scatter' if len(x) == 0 else kind, x = x, y = y)
+    elif kind == 'hist2d':
+        plot['counts'], plot['x_edges'], plot['y_edges'] = np.histogram2d(x, y, bins = bins)
+    else:
+        plot['x'], plot['y'], plot['counts'], plot['extent'], plot['gridsize'] = _hexbin(x, y, bins)
+    return plot
+
+
+def _draw_feature_plot(figure, ax, plot, output_feature):
+    if plot['kind'] in ('scatter', 'sample'):
+        ax.plot(plot['x'], plot['y'], 'r.', markersize = 2 if plot['kind'] == 'sample' else 6)
+    elif plot['kind'] == 'hist2d':
+        counts = np.ma.masked_equal(plot['counts'].T, 0)
+        mesh = ax.pcolormesh(plot['x_edges'], plot['y_edges'], counts, norm = LogNorm(), cmap = 'Reds')
+        figure.colorbar(mesh, ax = ax, label = 'count')
+    else:
+        hexagons = ax.hexbin(
+            plot['x'], plot['y'], C = plot['counts'], reduce_C_function = np.sum, gridsize = plot['gridsize'],
+            extent = plot['extent'], bins = 'log', mincnt = 1, cmap = 'Reds'
+        )
+        figure.colorbar(hexagons, ax = ax, label = 'count')
+    ax.set_xlabel(plot['feature'])
+    ax.set_ylabel(output_feature)
+    ax.set_title(f"{plot['feature']} ({plot['n_rows']} rows)" if plot['kind'] == 'sample' else plot['feature'])
+
+
+def _get_file_names(features):
+    # File names made of the word characters of each feature, with a counter when two features give the same name
+    file_names = list()
+    for feature in features:
+        base_name = file_name = re.sub(r'[^\w.-]+', '_', str(feature))
+        n_duplicates = 1
+        while file_name in file_names:
+            n_duplicates += 1
+            file_name = f'{base_name}_{n_duplicates}'
+        file_names.append(file_name)
+    return file_names
+
+
+def _hexbin(x, y, gridsize):
+    # Counts on a hexagonal grid of the extent, gridsize hexagons across and gridsize/sqrt(3) down: the centers are
+    # two rectangular lattices offset by half a step and every row goes to the nearer center, rows on the border
+    # to the nearest hexagon inside. Returns the centers of the non-empty hexagons, for ax.hexbin to draw with
+    # C = counts and the same gridsize and extent; a center is never near a hexagon boundary, so matplotlib puts
+    # it back in its own hexagon whatever its padding and edge rules are. Only a row exactly on the boundary of two
+    # hexagons may be counted in the other one than ax.hexbin would pick.
+    nx = gridsize
+    ny = max(int(nx / np.sqrt(3)), 1)
+    x_min, x_max = x.min(), x.max()
+    y_min, y_max = y.min(), y.max()
+    if x_max == x_min:
+        x_min, x_max = x_min - 0.5, x_max + 0.5
+    if y_max == y_min:
+        y_min, y_max = y_min - 0.5, y_max + 0.5
+    sx = (x_max - x_min) / nx
+    sy = (y_max - y_min) / ny
+    ix = (x - x_min) / sx
+    iy = (y - y_min) / sy
+    ix1, iy1 = np.clip(np.round(ix), 0, nx), np.clip(np.round(iy), 0, ny)
+    ix2, iy2 = np.clip(np.floor(ix), 0, nx - 1), np.clip(np.floor(iy), 0, ny - 1)
+    is_first_lattice = (ix - ix1)**2 + 3*(iy - iy1)**2 < (ix - ix2 - 0.5)**2 + 3*(iy - iy2 - 0.5)**2
+
+    # Centers in half steps, so that both lattices have integer keys
+    center_ix = np.where(is_first_lattice, 2*ix1, 2*ix2 + 1).astype(np.int64)
+    center_iy = np.where(is_first_lattice, 2*iy1, 2*iy2 + 1).astype(np.int64)
+    keys, counts = np.unique(center_ix * (2*ny + 1) + center_iy, return_counts = True)
+    center_ix, center_iy = np.divmod(keys, 2*ny + 1)
+    return x_min + center_ix/2 * sx, y_min + center_iy/2 * sy, counts.astype(np.float64), (x_min, x_max, y_min, y_max), (nx, ny)
+
+
+def _save_feature_plot(plot, output_feature, file_path):
+    # Figure without pyplot, so worker processes keep no global figure state
+    figure = Figure(figsize = (6, 4.5))
+    _draw_feature_plot(figure, figure.add_subplot(), plot, output_feature)
+    figure.tight_layout()
+    figure.savefig(file_path)
+    return file_path
+
+
+def _stratified_sample(x, max_points, bins, rng):
+    # Indices of max_points rows: every stratum (equal-width bin of x) keeps min(its size, cap) random rows
+    strata = np.minimum(((x - x.min()) / ((x.max() - x.min()) or 1) * bins).astype(np.int64), bins - 1)
+    stratum_sizes = np.bincount(strata, minlength = bins)
+    cap = max_points
+    remaining = max_points
+    sorted_sizes = np.sort(stratum_sizes[stratum_sizes > 0])
+    for i, size in enumerate(sorted_sizes.tolist()):
+        share = remaining // (len(sorted_sizes) - i)
+        if size > share:
+            cap = share
+            break
+        remaining -= size
+
+    # Random order inside each stratum, then the first cap rows of every stratum
+    order = np.lexsort((rng.random(len(x)), strata))
+    stratum_starts = np.concatenate(([0], np.cumsum(stratum_sizes)[:-1]))
+    ranks = np.arange(len(x)) - stratum_starts[strata[order]]
+    return np.sort(order[ranks < cap])
 
 
 
 class SqlDb(object):
-    def __init__(self, *, database_name = None, upgrade_sqlite_version = False):
+    # Trade durability for load speed, only for scratch databases that can be rebuilt from source
+    SCRATCH_PRAGMAS = {'journal_mode': 'OFF', 'synchronous': 'OFF', 'cache_size': -262144, 'mmap_size': 2**30}
+
+    # cached_statements: size of sqlite3's prepared statement cache, reused by parameterized queries
+    # result_cache_size: number of query results kept in an LRU cache keyed on (sql, params), 0 to disable
+    def __init__(self, *, database_name = None, upgrade_sqlite_version = False, pragmas = None,
+                 cached_statements = 128, result_cache_size = 0):
         if upgrade_sqlite_version:
             self._upgrade_sqlite_version()
         if database_name:
             if database_name.lower().endswith('.db'):
                 database_name = database_name.lower().replace('.db', '')
-            self.con = sqlite3.connect(f'{database_name}.db')
+            self.con = sqlite3.connect(f'{database_name}.db', cached_statements = cached_statements)
         else:
-            self.con = sqlite3.connect(':memory:')
-        self.cur = self.con.cursor()    
-    
-    def create_table(self, table_name, *, data_df):
+            self.con = sqlite3.connect(':memory:', cached_statements = cached_statements)
+        self.cur = self.con.cursor()
+        self.result_cache_size = result_cache_size
+        self._result_cache = OrderedDict()
+        if pragmas:
+            self.set_pragmas(**pragmas)
+
+    def set_pragmas(self, **pragmas):
+        # e.g. set_pragmas(journal_mode = 'WAL', synchronous = 'OFF', cache_size = -262144, mmap_size = 2**30)
+        for name, value in pragmas.items():
+            if not name.isidentifier():
+                raise ValueError(f'Invalid PRAGMA name: {name!r}')
+            if not isinstance(value, int) and not str(value).isidentifier():
+                raise ValueError(f'Invalid value for PRAGMA {name}: {value!r}')
+            self.cur.execute(f'PRAGMA {name} = {value}')
+        self.clear_result_cache()
+        return self
+
+    def clear_result_cache(self):
+        self._result_cache.clear()
+        return self
+
+    def create_table(self, table_name, *, data_df, bulk = False, chunksize = 100000, index_columns = None):
+        # bulk: no pandas index column, and chunked executemany inside a single transaction
+        # index_columns: columns (or tuples of columns) to index once the rows are loaded
         self.delete_table(table_name)
-        return data_df.to_sql(name = table_name, con = self.con)
+        if not bulk:
+            row_count = data_df.to_sql(name = table_name, con = self.con)
+        else:
+            row_count = self._bulk_load(table_name, data_df, chunksize)
+        self.clear_result_cache()
+        for columns in index_columns or []:
+            self.create_index(table_name, columns)
+        return row_count
+
+    def create_index(self, table_name, columns):
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        index_name = self._quote_identifier('_'.join(['ix', table_name] + columns))
+        column_names = ', '.join(map(self._quote_identifier, columns))
+        with self.con:
+            self.cur.execute(
+                f'CREATE INDEX IF NOT EXISTS {index_name} ON {self._quote_identifier(table_name)} ({column_names})'
+            )
 
     def delete_table(self, table_name):
-        return self.cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+        self.clear_result_cache()
+        return self.cur.execute(f'DROP TABLE IF EXISTS {self._quote_identifier(table_name)}')
+
+    def execute(self, sql, params = ()):
+        # Statement that changes the database, with ? or :name parameters bound by sqlite3
+        self.clear_result_cache()
+        return self.cur.execute(sql, params)
 
-    def insert_into(self, table_name, *, query_string):
-        data_df = self.query(query_string)
+    def insert_into(self, table_name, *, query_string, params = ()):
+        data_df = self.query(query_string, params)
         self.create_table(table_name, data_df = data_df)
         return data_df
     
-    def query(self, query_string):
-        res = self.cur.execute(query_string)
-        header = list(map(lambda x: x[0], res.description))
-        data = res.fetchall()
-        data_df = df(data = data, columns = header)
+    def iter_query(self, query_string, params = (), *, chunksize = 100000, dtypes = None):
+        # DataFrames of at most chunksize rows from fetchmany, so only one chunk of tuples is in memory.
+        # dtypes: column -> dtype applied to every chunk, e.g. {'order_id': 'string', 'price': 'float32'}
+        cursor = self.con.cursor()
+        try:
+            res = cursor.execute(query_string, params)
+            header = list(map(lambda x: x[0], res.description))
+            rows = res.fetchmany(chunksize)
+            yield self._to_dataframe(rows, header, dtypes) # even if empty, for the columns
+            while rows:
+                rows = res.fetchmany(chunksize)
+                if rows:
+                    yield self._to_dataframe(rows, header, dtypes)
+        finally:
+            cursor.close()
+
+    def iter_transactions(self, query_string, params = (), *, chunksize = 100000):
+        # Direct path into AprioriAlgorithm(dataset = ...): the query selects (transaction id, item)
+        # ORDER BY transaction id, and each transaction is yielded as a tuple of items (NULLs are dropped)
+        cursor = self.con.cursor()
+        try:
+            res = cursor.execute(query_string, params)
+            rows = chain.from_iterable(iter(lambda: res.fetchmany(chunksize), []))
+            for _, line_items in groupby(rows, key = lambda row: row[0]):
+                transaction = tuple(item for _, item in line_items if item is not None)
+                if transaction:
+                    yield transaction
+        finally:
+            cursor.close()
+
+    def query(self, query_string, params = (), *, dtypes = None, chunksize = 100000):
+        # Built chunk by chunk, so the whole result is never held as a list of tuples.
+        # Cached results are returned as copies, so callers can modify them.
+        # A chunk whose values of a column are all NULL gives an object column; object columns are inferred
+        # again after concatenation, so the dtypes do not depend on where the chunks split.
+        cache_key = self._get_cache_key(query_string, params, dtypes) if self.result_cache_size else None
+        if cache_key in self._result_cache:
+            self._result_cache.move_to_end(cache_key)
+            return self._result_cache[cache_key].copy()
+
+        data_df = concat(self.iter_query(query_string, params, chunksize = chunksize, dtypes = dtypes), ignore_index = True)
+        for column in data_df.columns[data_df.dtypes == object]:
+            if column not in (dtypes or {}):
+                data_df[column] = data_df[column].infer_objects()
+        if cache_key is not None:
+            self._result_cache[cache_key] = data_df.copy()
+            if len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last = False)
+        return data_df
+
+    def _bulk_load(self, table_name, data_df, chunksize):
+        insert_statement = (
+            f'INSERT INTO {self._quote_identifier(table_name)} VALUES ({", ".join("?" * len(data_df.columns))})'
+        )
+        with self.con:
+            self.cur.execute(get_schema(data_df, table_name, con = self.con))
+            for start in range(0, len(data_df), chunksize):
+                chunk_df = data_df.iloc[start:start + chunksize]
+                columns = [self._to_sql_values(chunk_df.iloc[:, i]) for i in range(chunk_df.shape[1])]
+                self.cur.executemany(insert_statement, zip(*columns))
+        return len(data_df)
+
+    @staticmethod
+    def _get_cache_key(query_string, params, dtypes):
+        params = tuple(sorted(params.items())) if isinstance(params, dict) else tuple(params)
+        dtypes = tuple(sorted((column, str(dtype)) for column, dtype in dtypes.items())) if dtypes else None
+        return query_string, params, dtypes
+
+    @staticmethod
+    def _quote_identifier(name):
+        return '"' + str(name).replace('"', '""') + '"'
+
+    @staticmethod
+    def _to_sql_values(column):
+        # Column to a list of values sqlite3 can bind, one vectorized conversion per column:
+        # numbers as is (NaN is stored as NULL), datetimes as ISO strings like to_sql, other missing values as None
+        if column.dtype.kind == 'M':
+            formatted = column.dt.strftime('%Y-%m-%d %H:%M:%S.%f').str.removesuffix('.000000')
+            return formatted.astype(object).where(column.notna(), None).tolist()
+        if column.hasnans and not (isinstance(column.dtype, np.dtype) and column.dtype.kind == 'f'):
+            return column.astype(object).where(column.notna(), None).tolist()
+        return column.tolist()
+
+    @staticmethod
+    def _to_dataframe(rows, header, dtypes):
+        data_df = df(data = rows, columns = header)
         data_df.drop(columns=['index'], inplace=True, errors='ignore')
+        if dtypes:
+            data_df = data_df.astype({column: dtype for column, dtype in dtypes.items() if column in data_df.columns})
         return data_df
 
     @staticmethod
@@ -0,0 +1,170 @@
+# Standard imports
+import json
+import os
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+
+
+
+# Mined frequent itemsets and rules stored as flat NumPy arrays, saved as .npy files in one directory
+# and opened with mmap on load:
+# - item_labels.json: the item dictionary, code -> label (labels must be JSON serializable)
+# - itemset_*.npy: itemsets in CSR layout (items/offsets), sorted by code tuple, with their supports
+# - rule_*.npy: antecedents and consequents in CSR layout, with support, confidence and lift
+# - index_*.npy: antecedent index, the rules whose antecedent's last (least frequent) item is each code
+class ItemsetIndex(object):
+    ARRAY_NAMES = (
+        'itemset_items', 'itemset_offsets', 'itemset_supports',
+        'rule_antecedent_items', 'rule_antecedent_offsets', 'rule_consequent_items', 'rule_consequent_offsets',
+        'rule_supports', 'rule_confidents', 'rule_lifts',
+        'index_rule_ids', 'index_offsets'
+    )
+    RULE_METRICS = ('support', 'confident', 'lift')
+
+    def __init__(self, *, item_labels, **arrays):
+        # Attributes
+        self.item_codes = {label: code for code, label in enumerate(item_labels)}
+        self.item_labels = list(item_labels)
+        for array_name in self.ARRAY_NAMES:
+            setattr(self, array_name, arrays[array_name])
+
+
+    @classmethod
+    def from_apriori_algorithm(cls, apriori_algorithm):
+        # The index needs the supports of all frequent itemsets and all rules between them
+        if apriori_algorithm.itemset_mode != 'all':
+            raise ValueError(f"ItemsetIndex needs itemset_mode 'all', got {apriori_algorithm.itemset_mode!r}")
+        if apriori_algorithm.all_rules is None:
+            apriori_algorithm.generate_all_rules()
+        all_frequent_itemsets = apriori_algorithm.all_frequent_itemsets
+        all_rules = apriori_algorithm.all_rules
+
+        # Codes ordered by descending single item support, so the last code of an itemset is its rarest item
+        single_item_supports = {
+            next(iter(itemset)): support for itemset, support in all_frequent_itemsets.items() if len(itemset) == 1
+        }
+        item_labels = sorted(single_item_supports, key = lambda label: -single_item_supports[label])
+        item_codes = {label: code for code, label in enumerate(item_labels)}
+        encode = lambda itemset: sorted(item_codes[label] for label in itemset)
+
+        encoded_itemsets = sorted((encode(itemset), support) for itemset, support in all_frequent_itemsets.items())
+        itemset_items, itemset_offsets = cls._to_csr([itemset for itemset, support in encoded_itemsets])
+
+        encoded_rules = [(encode(antecedent), encode(consequent), metrics) for (antecedent, consequent), metrics in all_rules.items()]
+        rule_antecedent_items, rule_antecedent_offsets = cls._to_csr([antecedent for antecedent, consequent, metrics in encoded_rules])
+        rule_consequent_items, rule_consequent_offsets = cls._to_csr([consequent for antecedent, consequent, metrics in encoded_rules])
+
+        # Antecedent index grouped by the antecedent's last code
+        index_keys = np.array([antecedent[-1] for antecedent, consequent, metrics in encoded_rules], dtype = np.int64)
+        index_rule_ids = np.argsort(index_keys, kind = 'stable')
+        index_offsets = np.concatenate(([0], np.cumsum(np.bincount(index_keys, minlength = len(item_labels)))))
+
+        return cls(
+            item_labels = item_labels,
+            itemset_items = itemset_items,
+            itemset_offsets = itemset_offsets,
+            itemset_supports = np.array([support for itemset, support in encoded_itemsets], dtype = np.float64),
+            rule_antecedent_items = rule_antecedent_items,
+            rule_antecedent_offsets = rule_antecedent_offsets,
+            rule_consequent_items = rule_consequent_items,
+            rule_consequent_offsets = rule_consequent_offsets,
+            rule_supports = np.array([metrics['support'] for antecedent, consequent, metrics in encoded_rules], dtype = np.float64),
+            rule_confidents = np.array([metrics['confident'] for antecedent, consequent, metrics in encoded_rules], dtype = np.float64),
+            rule_lifts = np.array([metrics['lift'] for antecedent, consequent, metrics in encoded_rules], dtype = np.float64),
+            index_rule_ids = index_rule_ids.astype(np.int64),
+            index_offsets = index_offsets.astype(np.int64)
+        )
+
+
+    @classmethod
+    def load(cls, directory, *, mmap_mode = 'r'):
+        with open(os.path.join(directory, 'item_labels.json')) as file:
+            item_labels = json.load(file)
+        arrays = {
+            array_name: np.load(os.path.join(directory, f'{array_name}.npy'), mmap_mode = mmap_mode)
+            for array_name in cls.ARRAY_NAMES
+        }
+        return cls(item_labels = item_labels, **arrays)
+
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok = True)
+        with open(os.path.join(directory, 'item_labels.json'), 'w') as file:
+            json.dump(self.item_labels, file)
+        for array_name in self.ARRAY_NAMES:
+            np.save(os.path.join(directory, f'{array_name}.npy'), getattr(self, array_name))
+        return self
+
+
+    def get_support(self, itemset):
+        codes = self._encode_itemset(itemset)
+        if codes is None:
+            return None
+
+        # Binary search over the sorted itemsets, touching only O(log n) rows
+        low, high = 0, len(self.itemset_offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            middle_codes = self._get_row(self.itemset_items, self.itemset_offsets, middle)
+            if middle_codes < codes:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.itemset_offsets) - 1 and self._get_row(self.itemset_items, self.itemset_offsets, low) == codes:
+            return float(self.itemset_supports[low])
+        return None
+
+
+    def recommend(self, basket, *, top_k = None, sort_by = 'confident'):
+        # Rules whose antecedent is in the basket and whose consequent is not, from best to worst
+        if sort_by not in self.RULE_METRICS:
+            raise ValueError(f'sort_by must be one of {self.RULE_METRICS}, got {sort_by!r}')
+        basket_codes = {self.item_codes[item] for item in basket if item in self.item_codes}
+
+        rules = list()
+        for code in basket_codes:
+            for rule_id in self.index_rule_ids[self.index_offsets[code]:self.index_offsets[code + 1]].tolist():
+                antecedent = self._get_row(self.rule_antecedent_items, self.rule_antecedent_offsets, rule_id)
+                if not basket_codes.issuperset(antecedent):
+                    continue
+                consequent = self._get_row(self.rule_consequent_items, self.rule_consequent_offsets, rule_id)
+                if basket_codes.intersection(consequent):
+                    continue
+                rules.append((self._decode_itemset(antecedent), self._decode_itemset(consequent), {
+                    'support': float(self.rule_supports[rule_id]),
+                    'confident': float(self.rule_confidents[rule_id]),
+                    'lift': float(self.rule_lifts[rule_id])
+                }))
+
+        rules.sort(key = lambda rule: rule[2][sort_by], reverse = True)
+        return rules if top_k is None else rules[:top_k]
+
+
+    def _decode_itemset(self, codes):
+        return frozenset(self.item_labels[code] for code in codes)
+
+
+    def _encode_itemset(self, itemset):
+        codes = list()
+        for item in set(itemset):
+            code = self.item_codes.get(item)
+            if code is None:
+                return None
+            codes.append(code)
+        return sorted(codes)
+
+
+    @staticmethod
+    def _get_row(items, offsets, row):
+        return items[offsets[row]:offsets[row + 1]].tolist()
+
+
+    @staticmethod
+    def _to_csr(rows):
+        offsets = np.zeros(len(rows) + 1, dtype = np.int64)
+        offsets[1:] = np.cumsum([len(row) for row in rows])
+        items = np.fromiter((code for row in rows for code in row), dtype = np.int32, count = int(offsets[-1]))
+        return items, offsets
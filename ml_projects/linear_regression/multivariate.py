@@ -0,0 +1,187 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ml_projects.linear_regression.training import CostHistory, StandardizedModel
+
+
+#===================================
+# Multivariate linear regression, promoted from car_price_prediction_multivariate.ipynb.
+# Every solver sets the same Theta (1 x (n_features + 1), intercept x_0 last) in the
+# scale of the original features:
+# - fit: closed-form least squares with QR or the normal equation
+# - train: full-batch gradient descent on standardized features
+# - train_sgd: mini-batch SGD, in memory or streamed from chunks of a larger-than-RAM dataset
+#===================================
+
+
+class MultivariateLinearRegression(StandardizedModel):
+    SOLVERS = ('qr', 'normal_equation')
+
+    # plot draws the model and the cost plot after training
+    def __init__(self, training_df, input_features, output_feature, *, verbose = 0, callback = None, plot = False, record_every = 1):
+        super().__init__(verbose = verbose, callback = callback, plot = plot, record_every = record_every, max_iterations = 100000)
+        # Parameters
+        self.input_features = list(input_features)
+        self.X_labels = self.input_features + ['x_0']
+        self.Y_label = output_feature
+
+        # Attributes
+        self.Theta = None
+        self.X = None
+        self.Y = None
+        self.alpha = 0.01 # learning rate on standardized features
+        self.m = None
+        self.training_df = None
+        self.x_mean = None
+        self.x_std = None
+
+        # Call methods
+        self.set_training_set(training_df) if training_df is not None else None
+
+
+    def set_training_set(self, training_df):
+        training_df = training_df[self.input_features + [self.Y_label]].copy()
+        count_null_values = len(training_df) - len(training_df.dropna())
+        if count_null_values > 0:
+            self.reporter.log(f'Dropped {count_null_values} null rows of training set')
+            training_df.dropna(inplace = True)
+        training_df['x_0'] = 1
+
+        self.training_df = training_df[self.X_labels+[self.Y_label]]
+        self.X = np.ascontiguousarray(self.training_df[self.X_labels], dtype = np.float64)
+        self.Y = np.ascontiguousarray(self.training_df[[self.Y_label]], dtype = np.float64)
+        self.m = len(self.training_df)
+        self.Theta = np.zeros((1, len(self.X_labels)))
+        self._set_scaling(self.X[:, :-1].mean(axis = 0), self.X[:, :-1].std(axis = 0))
+
+
+    def set_learning_rate(self, learning_rate):
+        self.alpha = learning_rate
+
+
+    def calculate_cost(self, data_df):
+        X, Y = self._to_arrays(data_df)
+        residual = X.dot(self.Theta.T) - Y
+        return float(np.vdot(residual, residual)) / (2*len(residual))
+
+
+    def draw_model(self):
+        # Predicted against actual output of the training set; a perfect model lies on the diagonal
+        predicted = self.X.dot(self.Theta[0])
+        plt.plot(self.Y[:, 0], predicted, 'r.')
+        plt.xlabel(self.Y_label)
+        plt.ylabel(f'predicted {self.Y_label}')
+
+        limits = [min(self.Y.min(), predicted.min()), max(self.Y.max(), predicted.max())]
+        plt.plot(limits, limits, '-b', label='model')
+        plt.legend(loc='upper left')
+        plt.show()
+
+
+    def fit(self, solver = 'qr'):
+        if solver not in self.SOLVERS:
+            raise ValueError(f'solver must be one of {self.SOLVERS}, got {solver!r}')
+
+        if solver == 'qr':
+            Q, R = np.linalg.qr(self.X)
+            Theta = np.linalg.solve(R, Q.T.dot(self.Y))
+        else:
+            Theta = np.linalg.solve(self.X.T.dot(self.X), self.X.T.dot(self.Y))
+        self.Theta = Theta.T
+        self.reporter.log(f'Finish fitting. Theta: \n+{self.X_labels}\n+{self.Theta}')
+        return self
+
+
+    def predict(self, input_values):
+        # One row of input values, a 2-D array with one row per prediction, or a DataFrame with the
+        # input features, selected by name (other columns, e.g. the output, are ignored)
+        if hasattr(input_values, 'columns'):
+            input_values = input_values[self.input_features]
+        input_array = np.asarray(input_values, dtype = np.float64)
+        output_value = input_array.dot(self.Theta[0, :-1]) + self.Theta[0, -1]
+        self.reporter.log(f'Predicted value: {output_value}', level = 2)
+        return output_value
+
+
+    def train(self):
+        # Full-batch gradient descent on standardized features, so one learning rate suits every feature
+        self.reporter.log('Start training.')
+        Z = self._standardize(self.X)
+        Y = self.Y[:, 0]
+
+        def objective(theta):
+            residual = Z.dot(theta) - Y
+            return float(np.vdot(residual, residual)) / (2*self.m), residual.dot(Z) / self.m
+
+        theta = self._minimize(objective, self._to_standardized_theta(self.Theta)[0], self.alpha)
+        self.Theta = self._to_original_theta(theta[np.newaxis, :])
+        self.reporter.log(f'Finish training. {self.training_result}. Theta: \n+{self.X_labels}\n+{self.Theta}')
+        if self.training_result.is_converged and self.plot:
+            self.draw_model()
+            self.draw_cost_plot()
+        return self
+
+
+    def train_sgd(self, *, chunks = None, batch_size = 256, n_epochs = 10, random_state = None):
+        # chunks: None to train on the training set, or a callable returning a fresh iterator of DataFrames
+        # for every epoch (e.g. lambda: read_csv(path, chunksize = 100000)) so only one chunk is in memory
+        self.reporter.log('Start training.')
+        if chunks is not None:
+            self._set_scaling_from_chunks(chunks())
+        Theta = self._to_standardized_theta(np.zeros((1, len(self.X_labels))) if self.Theta is None else self.Theta)
+        rng = np.random.default_rng(random_state)
+        cost_history = CostHistory(self.record_every, capacity = n_epochs + 1)
+
+        for epoch in range(1, n_epochs + 1):
+            squared_error = 0.0
+            m = 0
+            for X, Y in self._iter_arrays(chunks):
+                Z = self._standardize(X)
+                order = rng.permutation(len(Z))
+                for start in range(0, len(Z), batch_size):
+                    batch = order[start:start + batch_size]
+                    residual = Z[batch].dot(Theta.T) - Y[batch]
+                    squared_error += float(np.vdot(residual, residual))
+                    m += len(batch)
+                    Theta += - self.alpha * residual.T.dot(Z[batch]) / len(batch)
+
+            cost = squared_error / (2*m)
+            if cost_history.record(epoch, cost, force = epoch == n_epochs):
+                self.reporter.report(self, epoch, cost)
+
+        self.cost_list = cost_history.cost_list
+        self.iteration_list = cost_history.iteration_list
+        self.Theta = self._to_original_theta(Theta)
+        self.reporter.log(f'Finish training. Theta: \n+{self.X_labels}\n+{self.Theta}')
+        if self.plot:
+            self.draw_cost_plot()
+        return self
+
+
+    def _iter_arrays(self, chunks):
+        if chunks is None:
+            yield self.X, self.Y
+            return
+        for chunk_df in chunks():
+            yield self._to_arrays(chunk_df.dropna(subset = self.input_features + [self.Y_label]))
+
+
+    def _set_scaling_from_chunks(self, chunks):
+        # One streaming pass of sums and sums of squares
+        m = 0
+        x_sum = np.zeros(len(self.input_features))
+        x_square_sum = np.zeros(len(self.input_features))
+        for chunk_df in chunks:
+            X = chunk_df.dropna(subset = self.input_features + [self.Y_label])[self.input_features].to_numpy(dtype = np.float64)
+            m += len(X)
+            x_sum += X.sum(axis = 0)
+            x_square_sum += (X**2).sum(axis = 0)
+        x_mean = x_sum / m
+        self._set_scaling(x_mean, np.sqrt(np.maximum(x_square_sum / m - x_mean**2, 0)))
+
+
+    def _to_arrays(self, data_df):
+        X = np.ones((len(data_df), len(self.X_labels)))
+        X[:, :-1] = data_df[self.input_features].to_numpy(dtype = np.float64)
+        Y = data_df[[self.Y_label]].to_numpy(dtype = np.float64)
+        return X, Y
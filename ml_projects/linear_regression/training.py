@@ -0,0 +1,353 @@
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+#===================================
+# Helpers shared by the gradient-descent models:
+# - CostHistory: costs of every record_every-th iteration in a preallocated array
+# - TrainingReporter: opt-in logging (verbose) and per-record callback
+# - GradientDescent, Momentum, Adam, AdaptiveLearningRate: pluggable optimizers for minimize
+# - minimize: the training loop with iteration/wall-clock budgets and convergence checks
+# - GradientDescentModel, StandardizedModel: base classes of the regression models
+#===================================
+
+
+class CostHistory(object):
+    def __init__(self, record_every = 1, capacity = 1024):
+        # Parameters
+        self.record_every = max(int(record_every), 1)
+
+        # Attributes
+        self.costs = np.empty(capacity, dtype = np.float64)
+        self.iterations = np.empty(capacity, dtype = np.int64)
+        self.size = 0
+
+
+    @property
+    def cost_list(self):
+        return self.costs[:self.size]
+
+
+    @property
+    def iteration_list(self):
+        return self.iterations[:self.size]
+
+
+    def record(self, iteration, cost, *, force = False):
+        if not force and iteration % self.record_every:
+            return False
+        if self.size and self.iterations[self.size - 1] == iteration:
+            return False
+
+        # Grow geometrically, so long runs reallocate only O(log n) times
+        if self.size == len(self.costs):
+            self.costs = np.resize(self.costs, 2*len(self.costs))
+            self.iterations = np.resize(self.iterations, 2*len(self.iterations))
+        self.costs[self.size] = cost
+        self.iterations[self.size] = iteration
+        self.size += 1
+        return True
+
+
+
+class TrainingReporter(object):
+    # verbose 0: silent, 1: start and finish messages, 2: also every recorded iteration
+    # callback(model, iteration, cost) is called on every recorded iteration
+    def __init__(self, *, verbose = 0, callback = None):
+        # Parameters
+        self.callback = callback
+        self.verbose = verbose
+
+
+    def log(self, message, level = 1):
+        if self.verbose >= level:
+            print(message)
+
+
+    def report(self, model, iteration, cost):
+        if self.verbose >= 2:
+            print(f'Iterate: {iteration}, new cost: {cost}')
+        if self.callback is not None:
+            self.callback(model, iteration, cost)
+
+
+
+class TrainingResult(object):
+    # stop_reason: 'converged', 'max_iterations', 'max_time' or 'diverged'
+    def __init__(self, *, n_iterations, training_time, stop_reason):
+        # Parameters
+        self.n_iterations = n_iterations
+        self.stop_reason = stop_reason
+        self.training_time = training_time # seconds
+
+
+    def __repr__(self):
+        return f'TrainingResult({self.stop_reason}, {self.n_iterations} iterations, {self.training_time:.4f}s)'
+
+
+    @property
+    def is_converged(self):
+        return self.stop_reason == 'converged'
+
+
+
+# Optimizers turn a gradient into a parameter update. A step that increases the cost is rejected;
+# back_off() then decides whether to retry with a smaller step (True) or to stop training (False).
+class GradientDescent(object):
+    allow_cost_increase = False
+
+    def __init__(self, learning_rate = 0.01):
+        # Parameters
+        self.learning_rate = learning_rate
+
+
+    def accept(self):
+        pass
+
+
+    def back_off(self):
+        return False
+
+
+    def reset(self):
+        pass
+
+
+    def step(self, gradient):
+        return - self.learning_rate*gradient
+
+
+
+class Momentum(GradientDescent):
+    # Heavy-ball momentum overshoots by design, so cost increases are accepted
+    allow_cost_increase = True
+
+    def __init__(self, learning_rate = 0.01, beta = 0.9):
+        super().__init__(learning_rate)
+        # Parameters
+        self.beta = beta
+
+        # Attributes
+        self.velocity = None
+
+
+    def reset(self):
+        self.velocity = None
+
+
+    def step(self, gradient):
+        if self.velocity is None:
+            self.velocity = np.zeros_like(gradient, dtype = np.float64)
+        self.velocity = self.beta*self.velocity - self.learning_rate*gradient
+        return self.velocity
+
+
+
+class Adam(GradientDescent):
+    # Kingma & Ba, 2015: per-parameter step sizes from bias-corrected gradient moments
+    allow_cost_increase = True
+
+    def __init__(self, learning_rate = 0.001, beta_1 = 0.9, beta_2 = 0.999, epsilon = 1e-8):
+        super().__init__(learning_rate)
+        # Parameters
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+
+        # Attributes
+        self.first_moment = None
+        self.second_moment = None
+        self.t = 0
+
+
+    def reset(self):
+        self.first_moment = None
+        self.second_moment = None
+        self.t = 0
+
+
+    def step(self, gradient):
+        if self.first_moment is None:
+            self.first_moment = np.zeros_like(gradient, dtype = np.float64)
+            self.second_moment = np.zeros_like(gradient, dtype = np.float64)
+        self.t += 1
+        self.first_moment = self.beta_1*self.first_moment + (1 - self.beta_1)*gradient
+        self.second_moment = self.beta_2*self.second_moment + (1 - self.beta_2)*gradient**2
+        first_moment = self.first_moment / (1 - self.beta_1**self.t)
+        second_moment = self.second_moment / (1 - self.beta_2**self.t)
+        return - self.learning_rate*first_moment / (np.sqrt(second_moment) + self.epsilon)
+
+
+
+class AdaptiveLearningRate(GradientDescent):
+    # Backtracking "bold driver": a rejected step is retried with learning_rate*decrease,
+    # every accepted step grows the learning rate by increase. Stops below min_learning_rate.
+    def __init__(self, learning_rate = 0.01, *, decrease = 0.5, increase = 1.1, min_learning_rate = 1e-12):
+        super().__init__(learning_rate)
+        # Parameters
+        self.decrease = decrease
+        self.increase = increase
+        self.initial_learning_rate = learning_rate
+        self.min_learning_rate = min_learning_rate
+
+
+    def accept(self):
+        self.learning_rate *= self.increase
+
+
+    def back_off(self):
+        self.learning_rate *= self.decrease
+        return self.learning_rate >= self.min_learning_rate
+
+
+    def reset(self):
+        self.learning_rate = self.initial_learning_rate
+
+
+
+def minimize(objective, theta, optimizer, *, cost_history, report = None, max_iterations = None, max_time = None,
+             gradient_tolerance = 0.0, cost_tolerance = None):
+    # objective(theta) returns (cost, gradient). Stops when the gradient norm is at most gradient_tolerance,
+    # when an accepted step lowers the cost by less than cost_tolerance (relative), or when a budget runs out.
+    # Returns the last accepted theta and a TrainingResult.
+    start_time = time.perf_counter()
+    optimizer.reset()
+    cost, gradient = objective(theta)
+    cost_history.record(0, cost, force = True)
+
+    t = 0
+    stop_reason = 'max_iterations'
+    while max_iterations is None or t < max_iterations:
+        if np.sqrt(np.vdot(gradient, gradient)) <= gradient_tolerance:
+            stop_reason = 'converged'
+            break
+        if max_time is not None and time.perf_counter() - start_time >= max_time:
+            stop_reason = 'max_time'
+            break
+
+        t += 1
+        next_theta = theta + optimizer.step(gradient)
+        next_cost, next_gradient = objective(next_theta)
+        if not np.isfinite(next_cost) or (next_cost > cost and not optimizer.allow_cost_increase):
+            if optimizer.back_off():
+                continue
+            stop_reason = 'diverged'
+            break
+        optimizer.accept()
+
+        previous_cost = cost
+        theta, cost, gradient = next_theta, next_cost, next_gradient
+        if cost_history.record(t, cost) and report is not None:
+            report(t, cost)
+        if cost_tolerance is not None and 0 <= previous_cost - cost < cost_tolerance*previous_cost:
+            stop_reason = 'converged'
+            break
+
+    cost_history.record(t, cost, force = True)
+    return theta, TrainingResult(
+        n_iterations = t, training_time = time.perf_counter() - start_time, stop_reason = stop_reason
+    )
+
+
+
+class GradientDescentModel(object):
+    # Silent by default: verbose/callback opt into logging (see TrainingReporter), plot draws the model's plots
+    # after training, and the cost is recorded every record_every iterations. max_iterations and the other
+    # budgets of train can be changed with the setters below.
+    def __init__(self, *, verbose = 0, callback = None, plot = False, record_every = 1, max_iterations = None):
+        # Parameters
+        self.plot = plot
+        self.record_every = record_every
+        self.reporter = TrainingReporter(verbose = verbose, callback = callback)
+
+        # Attributes
+        self.cost_list = None
+        self.cost_tolerance = 10**-6
+        self.gradient_tolerance = 0.0
+        self.iteration_list = None
+        self.max_iterations = max_iterations
+        self.max_time = None
+        self.optimizer = None
+        self.training_result = None
+
+
+    def set_cost_tolerance(self, cost_tolerance):
+        # Minimum relative cost decrease per gradient-descent iteration, None to disable
+        self.cost_tolerance = cost_tolerance
+
+
+    def set_gradient_tolerance(self, gradient_tolerance):
+        self.gradient_tolerance = gradient_tolerance
+
+
+    def set_max_iterations(self, max_iterations):
+        self.max_iterations = max_iterations
+
+
+    def set_max_time(self, max_time):
+        # Wall-clock budget of train (and of Newton fit where a model has one) in seconds
+        self.max_time = max_time
+
+
+    def set_optimizer(self, optimizer):
+        # None trains with plain GradientDescent(learning_rate)
+        self.optimizer = optimizer
+
+
+    def draw_cost_plot(self):
+        plt.plot(self.iteration_list, self.cost_list)
+        plt.show()
+
+
+    def _minimize(self, objective, theta, learning_rate):
+        # minimize with the model's optimizer, budgets and reporter; keeps the cost history and training_result
+        cost_history = CostHistory(self.record_every)
+        theta, self.training_result = minimize(
+            objective,
+            theta,
+            self.optimizer or GradientDescent(learning_rate),
+            cost_history = cost_history,
+            report = lambda iteration, cost: self.reporter.report(self, iteration, cost),
+            max_iterations = self.max_iterations,
+            max_time = self.max_time,
+            gradient_tolerance = self.gradient_tolerance,
+            cost_tolerance = self.cost_tolerance
+        )
+        self.cost_list = cost_history.cost_list
+        self.iteration_list = cost_history.iteration_list
+        if self.training_result.stop_reason == 'diverged':
+            self.reporter.log('Cost is increasing. Please set a lower learning rate ')
+        return theta
+
+
+
+class StandardizedModel(GradientDescentModel):
+    # Models with Theta = 1 x (n_features + 1), intercept x_0 last, trained on standardized features
+    # z = (x - x_mean)/x_std so that one learning rate suits every feature
+    def _set_scaling(self, x_mean, x_std):
+        self.x_mean = x_mean
+        self.x_std = np.where(x_std > 0, x_std, 1.0)
+
+
+    def _standardize(self, X):
+        Z = np.empty_like(X)
+        Z[:, :-1] = (X[:, :-1] - self.x_mean) / self.x_std
+        Z[:, -1] = 1
+        return Z
+
+
+    def _to_original_theta(self, Theta):
+        # y = Theta_z.z with z = (x - mean)/std  =>  Theta_x = Theta_z/std, intercept shifted by the means
+        original_Theta = np.empty_like(Theta)
+        original_Theta[0, :-1] = Theta[0, :-1] / self.x_std
+        original_Theta[0, -1] = Theta[0, -1] - original_Theta[0, :-1].dot(self.x_mean)
+        return original_Theta
+
+
+    def _to_standardized_theta(self, Theta):
+        standardized_Theta = np.empty_like(Theta, dtype = np.float64)
+        standardized_Theta[0, :-1] = Theta[0, :-1] * self.x_std
+        standardized_Theta[0, -1] = Theta[0, -1] + Theta[0, :-1].dot(self.x_mean)
+        return standardized_Theta
@@ -1,6 +1,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from ml_projects.linear_regression.training import GradientDescentModel
+
 
 #===================================
 # The purpose of this file is for creating linear regression function. What 
@@ -12,38 +14,34 @@ import numpy as np
 #===================================
 
 
-class UnivariateLinearRegression(object):
-    def __init__(self, training_set, input_feature, output_feature):
+class UnivariateLinearRegression(GradientDescentModel):
+    # plot draws the model and the cost plot after training
+    def __init__(self, training_set, input_feature, output_feature, *, verbose = 0, callback = None, plot = False, record_every = 1):
+        super().__init__(verbose = verbose, callback = callback, plot = plot, record_every = record_every)
         # Parameters
         self.input_feature = input_feature
         self.output_feature = output_feature
 
         # Attributes
-        self.cost_list = None
-        self.iteration_list = None
         self.learning_rate = 10**-5
         self.m = None
         self.test_set = None
         self.theta_0 = 0
         self.theta_1 = 0
         self.training_set = None
+        self._x = None # training input as contiguous float64 array
+        self._y = None # training output as contiguous float64 array
 
         # Call methods
         self.set_training_set(training_set)
 
 
     def calculate_cost(self, data_df):
-        m = len(data_df)
-        cost = 0
-        for i in range(m):
-            cost += (self.theta_0 + self.theta_1*data_df[self.input_feature].iloc[i] - data_df[self.output_feature].iloc[i])**2
-        cost /= 2*m 
-        return cost
+        x = data_df[self.input_feature].to_numpy(dtype = np.float64)
+        y = data_df[self.output_feature].to_numpy(dtype = np.float64)
+        residual = self.theta_0 + self.theta_1*x - y
+        return residual.dot(residual) / (2*len(residual))
 
-    
-    def draw_cost_plot(self):
-        plt.plot(self.iteration_list, self.cost_list)
-        plt.show()
 
 
     def draw_model(self):
@@ -58,59 +56,55 @@ class UnivariateLinearRegression(object):
         plt.show()
 
 
+    def fit(self):
+        # Closed-form least squares, no gradient descent
+        x_mean = self._x.mean()
+        y_mean = self._y.mean()
+        x_centered = self._x - x_mean
+        x_variance = x_centered.dot(x_centered)
+        self.theta_1 = x_centered.dot(self._y - y_mean) / x_variance if x_variance else 0.0
+        self.theta_0 = y_mean - self.theta_1*x_mean
+        self.reporter.log(f'Finish fitting. theta_0: {self.theta_0}, theta_1: {self.theta_1}')
+        return self
+
+
     def predict(self, input_value):
+        # Scalars, NumPy arrays and pandas Series are computed in one vectorized expression
+        if isinstance(input_value, (list, tuple)):
+            input_value = np.asarray(input_value, dtype = np.float64)
         output_value = self.theta_0 + self.theta_1*input_value
-        print(f'Predicted value: {output_value}')
+        self.reporter.log(f'Predicted value: {output_value}', level = 2)
         return output_value
     
     
     def test(self, test_set=None):
-        if test_set:
+        if test_set is not None:
             test_cost = self.calculate_cost(test_set)
         else:
             test_cost = self.calculate_cost(self.test_set)
-        print('Cost of test set:', test_cost)
+        self.reporter.log(f'Cost of test set: {test_cost}')
         return test_cost
 
 
     def train(self):
-        print('Start training.')
-        cost = self.calculate_cost(self.training_set)
-        print(f'Init theta_0: {self.theta_0}, theta_1: {self.theta_1}, cost: {cost}')
-
-        self.cost_list = [cost]
-        self.iteration_list = [0]
-
-        t = 1
-        is_continue = True
-        while is_continue:
-            derive_theta_0 = 0
-            derive_theta_1 = 0
-            for i in range(self.m):
-                derive_theta_0 += self.theta_0 + self.theta_1*self.training_set[self.input_feature].iloc[i] - self.training_set[self.output_feature].iloc[i]
-                derive_theta_1 += (self.theta_0 + self.theta_1*self.training_set[self.input_feature].iloc[i] - self.training_set[self.output_feature].iloc[i])*self.training_set[self.input_feature].iloc[i]
-            derive_theta_0 /= self.m
-            derive_theta_1 /= self.m
-
-            self.theta_0 += - self.learning_rate*derive_theta_0
-            self.theta_1 += - self.learning_rate*derive_theta_1
-
-            cost = self.calculate_cost(self.training_set)
-            print(f'Iterate: {t}, new cost: {cost}')
-
-            self.cost_list.append(cost)
-            self.iteration_list.append(t)
-            t += 1
-
-            if self.cost_list[-1] > self.cost_list[-2]:
-                print('Cost is increasing. Please set a lower learning rate ') 
-                break
-            elif (self.cost_list[-1] - self.cost_list[-2])*100/self.cost_list[-2] > -0.0001:
-                is_continue = False
-                print(f'Finish training. theta_0: {self.theta_0}, theta_1: {self.theta_1}')
-                self.draw_model()
-                self.draw_cost_plot()
-                
+        self.reporter.log('Start training.')
+        x = self._x
+        y = self._y
+        self.reporter.log(f'Init theta_0: {self.theta_0}, theta_1: {self.theta_1}')
+
+        # Cost and gradient both come from one residual vector per iteration
+        def objective(theta):
+            residual = theta[0] + theta[1]*x - y
+            return residual.dot(residual) / (2*self.m), np.array([residual.sum(), residual.dot(x)]) / self.m
+
+        theta = self._minimize(objective, np.array([self.theta_0, self.theta_1], dtype = np.float64), self.learning_rate)
+        self.theta_0, self.theta_1 = float(theta[0]), float(theta[1])
+        self.reporter.log(f'Finish training. theta_0: {self.theta_0}, theta_1: {self.theta_1}, {self.training_result}')
+        if self.training_result.is_converged and self.plot:
+            self.draw_model()
+            self.draw_cost_plot()
+        return self
+
 
     def set_learning_rate(self, learning_rate):
         self.learning_rate = learning_rate
@@ -121,7 +115,7 @@ class UnivariateLinearRegression(object):
 
         count_null_values = len(self.test_set) - len(self.test_set.dropna())
         if count_null_values > 0:
-            print(f'Dropped {count_null_values} null rows of test set')
+            self.reporter.log(f'Dropped {count_null_values} null rows of test set')
             self.test_set.dropna(inplace = True)
 
 
@@ -130,7 +124,9 @@ class UnivariateLinearRegression(object):
 
         count_null_values = len(self.training_set) - len(self.training_set.dropna())
         if count_null_values > 0:
-            print(f'Dropped {count_null_values} null rows of training set')
+            self.reporter.log(f'Dropped {count_null_values} null rows of training set')
             self.training_set.dropna(inplace = True)
         
-        self.m = len(self.training_set)
\ No newline at end of file
+        self.m = len(self.training_set)
+        self._x = np.ascontiguousarray(self.training_set[self.input_feature], dtype = np.float64)
+        self._y = np.ascontiguousarray(self.training_set[self.output_feature], dtype = np.float64)
@@ -0,0 +1,190 @@
+import time
+
+import numpy as np
+
+from ml_projects.linear_regression.training import CostHistory, StandardizedModel, TrainingResult
+
+
+#===================================
+# Binary logistic regression, consistent with MultivariateLinearRegression: Theta is
+# 1 x (n_features + 1) with the intercept x_0 last, in the scale of the original features.
+# - fit: Newton / IRLS, converges in a handful of iterations for small feature counts
+# - train: full-batch gradient descent on standardized features
+# - l2: L2 penalty on the standardized coefficients (never on the intercept)
+# - na_strategy: 'drop' rows with missing inputs, or fill them with the training 'mean'
+#===================================
+
+
+def _sigmoid(z):
+    # tanh form does not overflow for large |z|
+    return 0.5 * (1 + np.tanh(0.5 * z))
+
+
+
+class LogisticRegression(StandardizedModel):
+    NA_STRATEGIES = ('drop', 'mean')
+
+    # plot draws the cost plot after training
+    def __init__(self, training_df, input_features, output_feature, *, l2 = 0.0, na_strategy = 'drop',
+                 verbose = 0, callback = None, plot = False, record_every = 1):
+        if na_strategy not in self.NA_STRATEGIES:
+            raise ValueError(f'na_strategy must be one of {self.NA_STRATEGIES}, got {na_strategy!r}')
+        super().__init__(verbose = verbose, callback = callback, plot = plot, record_every = record_every, max_iterations = 10000)
+
+        # Parameters
+        self.input_features = list(input_features)
+        self.X_labels = self.input_features + ['x_0']
+        self.Y_label = output_feature
+        self.l2 = l2
+        self.na_strategy = na_strategy
+
+        # Attributes
+        self.Theta = None
+        self.X = None
+        self.Y = None
+        self.alpha = 0.5 # learning rate on standardized features
+        self.fill_values = None
+        self.m = None
+        self.tolerance = 1e-8 # Newton step size
+        self.training_df = None
+        self.x_mean = None
+        self.x_std = None
+
+        # Call methods
+        self.set_training_set(training_df)
+
+
+    def set_training_set(self, training_df):
+        training_df = training_df[self.input_features + [self.Y_label]].dropna(subset = [self.Y_label])
+        self.fill_values = training_df[self.input_features].mean()
+
+        count_null_values = len(training_df) - len(training_df.dropna())
+        if count_null_values > 0 and self.na_strategy == 'drop':
+            self.reporter.log(f'Dropped {count_null_values} null rows of training set')
+            training_df = training_df.dropna()
+        elif count_null_values > 0:
+            self.reporter.log(f'Filled {count_null_values} null rows of training set with the mean')
+            training_df = training_df.fillna(self.fill_values)
+
+        self.training_df = training_df
+        self.X = self._to_input_array(training_df, fill_na = False)
+        self.Y = training_df[self.Y_label].to_numpy(dtype = np.float64)
+        self.m = len(training_df)
+        self.Theta = np.zeros((1, len(self.X_labels)))
+
+        self._set_scaling(self.X[:, :-1].mean(axis = 0), self.X[:, :-1].std(axis = 0))
+
+
+    def set_learning_rate(self, learning_rate):
+        self.alpha = learning_rate
+
+
+    def calculate_cost(self, data_df):
+        data_df = data_df.dropna(subset = [self.Y_label] + (self.input_features if self.na_strategy == 'drop' else []))
+        X = self._to_input_array(data_df)
+        Y = data_df[self.Y_label].to_numpy(dtype = np.float64)
+        return self._calculate_cost(self._standardize(X), Y, self._to_standardized_theta(self.Theta)[0])
+
+
+    def fit(self):
+        # Newton / IRLS: theta -= H^-1 g, with H = Z^T W Z / m (+ l2 / m on the coefficients).
+        # Stops when the step is below tolerance or when the max_iterations or max_time budget runs out.
+        self.reporter.log('Start fitting.')
+        start_time = time.perf_counter()
+        Z = self._standardize(self.X)
+        theta = self._to_standardized_theta(self.Theta)[0]
+        penalty = self._penalty_vector()
+        cost_history = CostHistory(self.record_every)
+        cost_history.record(0, self._calculate_cost(Z, self.Y, theta), force = True)
+
+        t = 0
+        stop_reason = 'max_iterations'
+        while t < self.max_iterations:
+            if self.max_time is not None and time.perf_counter() - start_time >= self.max_time:
+                stop_reason = 'max_time'
+                break
+
+            t += 1
+            p = _sigmoid(Z.dot(theta))
+            gradient = Z.T.dot(p - self.Y) / self.m + penalty * theta
+            hessian = (Z.T * (p * (1 - p))).dot(Z) / self.m + np.diag(penalty)
+            step = np.linalg.lstsq(hessian, gradient, rcond = None)[0]
+            theta -= step
+
+            cost = self._calculate_cost(Z, self.Y, theta)
+            if cost_history.record(t, cost):
+                self.reporter.report(self, t, cost)
+            if np.abs(step).max() < self.tolerance:
+                stop_reason = 'converged'
+                break
+
+        cost_history.record(t, self._calculate_cost(Z, self.Y, theta), force = True)
+        self.training_result = TrainingResult(
+            n_iterations = t, training_time = time.perf_counter() - start_time, stop_reason = stop_reason
+        )
+        self.cost_list = cost_history.cost_list
+        self.iteration_list = cost_history.iteration_list
+        return self._finish_training(theta)
+
+
+    def predict(self, input_values, *, threshold = 0.5, batch_size = None):
+        return (self.predict_proba(input_values, batch_size = batch_size) >= threshold).astype(np.int64)
+
+
+    def predict_proba(self, input_values, *, batch_size = None):
+        # input_values: a DataFrame with the input features, a 2-D array with one row per prediction, or one row.
+        # With batch_size the rows are scored in slices into one preallocated output.
+        X = self._to_input_array(input_values)
+        probabilities = np.empty(len(X))
+        batch_size = batch_size or max(len(X), 1)
+        for start in range(0, len(X), batch_size):
+            probabilities[start:start + batch_size] = _sigmoid(X[start:start + batch_size].dot(self.Theta[0]))
+        return probabilities[0] if np.ndim(input_values) == 1 else probabilities
+
+
+    def train(self):
+        # Full-batch gradient descent on standardized features
+        self.reporter.log('Start training.')
+        Z = self._standardize(self.X)
+        penalty = self._penalty_vector()
+
+        def objective(theta):
+            gradient = Z.T.dot(_sigmoid(Z.dot(theta)) - self.Y) / self.m + penalty * theta
+            return self._calculate_cost(Z, self.Y, theta), gradient
+
+        theta = self._minimize(objective, self._to_standardized_theta(self.Theta)[0], self.alpha)
+        return self._finish_training(theta)
+
+
+    def _calculate_cost(self, Z, Y, theta):
+        # Cross-entropy from the logits, log(1 + e^z) - y*z, plus the L2 penalty
+        z = Z.dot(theta)
+        cost = (np.logaddexp(0, z) - Y*z).mean()
+        return float(cost + 0.5 * self._penalty_vector().dot(theta**2))
+
+
+    def _finish_training(self, theta):
+        self.Theta = self._to_original_theta(theta[np.newaxis, :])
+        self.reporter.log(f'Finish training. {self.training_result}. Theta: \n+{self.X_labels}\n+{self.Theta}')
+        if self.plot:
+            self.draw_cost_plot()
+        return self
+
+
+    def _penalty_vector(self):
+        penalty = np.full(len(self.X_labels), self.l2 / self.m)
+        penalty[-1] = 0
+        return penalty
+
+
+    def _to_input_array(self, input_values, *, fill_na = True):
+        if hasattr(input_values, 'columns'):
+            input_df = input_values[self.input_features]
+            if fill_na and self.na_strategy == 'mean':
+                input_df = input_df.fillna(self.fill_values)
+            input_values = input_df.to_numpy(dtype = np.float64)
+        input_values = np.atleast_2d(np.asarray(input_values, dtype = np.float64))
+
+        X = np.ones((len(input_values), len(self.X_labels)))
+        X[:, :-1] = input_values
+        return X
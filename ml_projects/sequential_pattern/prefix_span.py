@@ -0,0 +1,277 @@
+# Standard imports
+from array import array
+from collections import Counter
+
+# Third-party imports
+import numpy as np
+from pandas import factorize
+
+# Local imports
+
+
+
+# Integer-encoded sequence dataset in a two-level CSR layout:
+# - items: sorted, de-duplicated item codes of every element (itemset), one element after another
+# - element_offsets: element j is items[element_offsets[j]:element_offsets[j+1]]
+# - sequence_offsets: sequence i is made of elements sequence_offsets[i]..sequence_offsets[i+1]-1
+# Iterating over the store yields the sequences as lists of tuples of labels.
+class SequenceStore(object):
+    ITEM_TYPECODE = 'i'
+    OFFSET_TYPECODE = 'q'
+
+    def __init__(self, sequences = None):
+        # Attributes
+        self.element_offsets = array(self.OFFSET_TYPECODE, [0])
+        self.item_codes = dict()
+        self.item_labels = list()
+        self.items = array(self.ITEM_TYPECODE)
+        self.sequence_offsets = array(self.OFFSET_TYPECODE, [0])
+
+        # Call methods
+        if sequences is not None:
+            self.add_sequences(sequences)
+
+
+    @classmethod
+    def from_dataframe(cls, data_df, *, customer_id_column, order_id_column, itemset_column, order_by_column = None):
+        # One line item per row: the orders of a customer are the elements of its sequence
+        order_by_column = order_by_column or order_id_column
+        columns = list(dict.fromkeys([customer_id_column, order_id_column, order_by_column, itemset_column]))
+        line_items_df = data_df[columns].dropna()
+
+        customer_codes, _ = factorize(line_items_df[customer_id_column], sort = True)
+        order_codes, _ = factorize(line_items_df[order_id_column], sort = True)
+        order_by_codes, _ = factorize(line_items_df[order_by_column], sort = True)
+        item_codes, item_labels = factorize(line_items_df[itemset_column], sort = True)
+
+        # Sort by customer, order time, order and item, then drop duplicated line items
+        order = np.lexsort((item_codes, order_codes, order_by_codes, customer_codes))
+        customer_codes, order_codes, item_codes = customer_codes[order], order_codes[order], item_codes[order]
+        is_new_line_item = np.ones(len(order), dtype = bool)
+        is_new_line_item[1:] = (
+            (customer_codes[1:] != customer_codes[:-1])
+            | (order_codes[1:] != order_codes[:-1])
+            | (item_codes[1:] != item_codes[:-1])
+        )
+        customer_codes, order_codes, item_codes = (
+            customer_codes[is_new_line_item], order_codes[is_new_line_item], item_codes[is_new_line_item]
+        )
+
+        is_new_element = np.ones(len(item_codes), dtype = bool)
+        is_new_element[1:] = (customer_codes[1:] != customer_codes[:-1]) | (order_codes[1:] != order_codes[:-1])
+        element_starts = np.flatnonzero(is_new_element)
+        element_customer_codes = customer_codes[element_starts]
+        is_new_sequence = np.ones(len(element_starts), dtype = bool)
+        is_new_sequence[1:] = element_customer_codes[1:] != element_customer_codes[:-1]
+
+        sequence_store = cls()
+        sequence_store.item_labels = item_labels.tolist()
+        sequence_store.item_codes = {label: code for code, label in enumerate(sequence_store.item_labels)}
+        sequence_store.items = array(cls.ITEM_TYPECODE, item_codes.astype(np.intc).tobytes())
+        sequence_store.element_offsets = array(
+            cls.OFFSET_TYPECODE, np.append(element_starts, len(item_codes)).astype(np.int64).tobytes()
+        )
+        sequence_store.sequence_offsets = array(
+            cls.OFFSET_TYPECODE, np.append(np.flatnonzero(is_new_sequence), len(element_starts)).astype(np.int64).tobytes()
+        )
+        return sequence_store
+
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield [
+                tuple(self.item_labels[code] for code in self.get_element(j))
+                for j in range(self.sequence_offsets[i], self.sequence_offsets[i + 1])
+            ]
+
+
+    def __len__(self):
+        return len(self.sequence_offsets) - 1
+
+
+    def add_sequence(self, sequence):
+        for element in sequence:
+            codes = set()
+            for item in element:
+                code = self.item_codes.get(item)
+                if code is None:
+                    code = self.item_codes[item] = len(self.item_labels)
+                    self.item_labels.append(item)
+                codes.add(code)
+            self.items.extend(sorted(codes))
+            self.element_offsets.append(len(self.items))
+        self.sequence_offsets.append(len(self.element_offsets) - 1)
+        return self
+
+
+    def add_sequences(self, sequences):
+        for sequence in sequences:
+            self.add_sequence(sequence)
+        return self
+
+
+    def decode_sequence(self, sequence):
+        return tuple(frozenset(self.item_labels[code] for code in element) for element in sequence)
+
+
+    def get_element(self, element_index):
+        return self.items[self.element_offsets[element_index]:self.element_offsets[element_index + 1]]
+
+
+
+# https://www-users.cs.umn.edu/~kumar001/dmbook/ch7.pdf (section 7.4)
+# PrefixSpan (Pei et al., 2001) with pseudo-projection: a projected database is a list of
+# (sequence index, element indexes where the prefix can end) pairs, never a copy of the sequences.
+# - max_gap: consecutive elements of a pattern are at most max_gap elements (orders) apart
+# - max_length: maximum number of items in a pattern
+class PrefixSpan(object):
+    def __init__(self, *, dataset = None, minsup = None, max_gap = None, max_length = None):
+        # Attributes
+        self.all_frequent_sequences = None
+        self.dataset = None
+        self.max_gap = None
+        self.max_length = None
+        self.minsup = None
+        self.n = None # number of sequences
+        self.sequence_store = None
+
+        # Call methods
+        self.set_dataset(dataset) if dataset else None
+        self.set_minsup(minsup)
+        self.set_max_gap(max_gap)
+        self.set_max_length(max_length)
+
+
+    def set_dataset(self, dataset):
+        self.dataset = dataset
+        self.sequence_store = dataset if isinstance(dataset, SequenceStore) else SequenceStore(dataset)
+        self.n = len(self.sequence_store)
+        return self
+
+
+    def set_max_gap(self, max_gap):
+        self.max_gap = max_gap
+        return self
+
+
+    def set_max_length(self, max_length):
+        self.max_length = max_length
+        return self
+
+
+    def set_minsup(self, minsup):
+        self.minsup = minsup
+        return self
+
+
+    def set_sequence_dataset(self, *, sequence_dataset, customer_id_column, order_id_column, itemset_column, order_by_column = None):
+        sequence_store = SequenceStore.from_dataframe(
+            sequence_dataset,
+            customer_id_column = customer_id_column,
+            order_id_column = order_id_column,
+            itemset_column = itemset_column,
+            order_by_column = order_by_column
+        )
+        return self.set_dataset(sequence_store)
+
+
+    def generate_all_frequent_sequences(self):
+        self.all_frequent_sequences = dict()
+        sequence_store = self.sequence_store
+        sequence_offsets = sequence_store.sequence_offsets
+
+        # Frequent single items, counted once per sequence, and all their projected databases in one pass
+        # over the (item, sequence, element) triples of the frequent items, grouped by item
+        items = np.frombuffer(sequence_store.items, dtype = np.intc).astype(np.int64)
+        if not len(items):
+            return self
+        element_ids = np.repeat(
+            np.arange(len(sequence_store.element_offsets) - 1), np.diff(np.frombuffer(sequence_store.element_offsets, dtype = np.int64))
+        )
+        sequence_ids = np.repeat(np.arange(self.n), np.diff(np.frombuffer(sequence_offsets, dtype = np.int64)))[element_ids]
+        n_items = len(sequence_store.item_labels)
+        item_counts = np.bincount(np.unique(sequence_ids * n_items + items) % n_items, minlength = n_items)
+        is_frequent = item_counts/self.n >= self.minsup
+
+        is_kept = is_frequent[items]
+        items, sequence_ids, element_ids = items[is_kept], sequence_ids[is_kept], element_ids[is_kept]
+        order = np.lexsort((element_ids, sequence_ids, items))
+        projected_databases = {item: list() for item in np.flatnonzero(is_frequent).tolist()}
+        projected_database = ends = None
+        previous_item = previous_i = None
+        for item, i, j in zip(items[order].tolist(), sequence_ids[order].tolist(), element_ids[order].tolist()):
+            if item != previous_item:
+                projected_database = projected_databases[item]
+                previous_item, previous_i = item, None
+            if i != previous_i:
+                ends = list()
+                projected_database.append((i, ends))
+                previous_i = i
+            ends.append(j)
+
+        for item, projected_database in projected_databases.items():
+            self._mine_projected_database(((item,),), projected_database, int(item_counts[item]))
+        return self
+
+
+    def _count_extensions(self, prefix, projected_database):
+        sequence_store = self.sequence_store
+        last_item = prefix[-1][-1]
+        i_extension_counts = Counter()
+        s_extension_counts = Counter()
+        for i, ends in projected_database:
+            i_extension_items = set()
+            for j in ends:
+                i_extension_items.update(item for item in sequence_store.get_element(j) if item > last_item)
+            i_extension_counts.update(i_extension_items)
+
+            s_extension_items = set()
+            for j in self._iter_next_elements(i, ends):
+                s_extension_items.update(sequence_store.get_element(j))
+            s_extension_counts.update(s_extension_items)
+        return i_extension_counts, s_extension_counts
+
+
+    def _iter_next_elements(self, sequence_index, ends):
+        # Elements that can follow one of the ends, within max_gap
+        sequence_end = self.sequence_store.sequence_offsets[sequence_index + 1]
+        if self.max_gap is None:
+            return range(ends[0] + 1, sequence_end)
+
+        next_elements = set()
+        for j in ends:
+            next_elements.update(range(j + 1, min(j + self.max_gap + 1, sequence_end)))
+        return sorted(next_elements)
+
+
+    def _mine_projected_database(self, prefix, projected_database, count):
+        self.all_frequent_sequences[self.sequence_store.decode_sequence(prefix)] = round(count/self.n, 7)
+        if self.max_length is not None and sum(map(len, prefix)) >= self.max_length:
+            return
+
+        sequence_store = self.sequence_store
+        i_extension_counts, s_extension_counts = self._count_extensions(prefix, projected_database)
+
+        # Itemset extension: the item joins the last element of the prefix
+        for item, extension_count in sorted(i_extension_counts.items()):
+            if extension_count/self.n < self.minsup:
+                continue
+            extended_projected_database = list()
+            for i, ends in projected_database:
+                extended_ends = [j for j in ends if item in sequence_store.get_element(j)]
+                if extended_ends:
+                    extended_projected_database.append((i, extended_ends))
+            self._mine_projected_database(
+                prefix[:-1] + (prefix[-1] + (item,),), extended_projected_database, extension_count
+            )
+
+        # Sequence extension: the item starts a new element after the prefix
+        for item, extension_count in sorted(s_extension_counts.items()):
+            if extension_count/self.n < self.minsup:
+                continue
+            extended_projected_database = list()
+            for i, ends in projected_database:
+                extended_ends = [j for j in self._iter_next_elements(i, ends) if item in sequence_store.get_element(j)]
+                if extended_ends:
+                    extended_projected_database.append((i, extended_ends))
+            self._mine_projected_database(prefix + ((item,),), extended_projected_database, extension_count)
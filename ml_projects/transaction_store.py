@@ -0,0 +1,263 @@
+# Standard imports
+from array import array
+
+# Third-party imports
+import numpy as np
+from pandas import factorize
+from pandas import read_csv
+
+# Local imports
+
+
+
+# Compact, integer-encoded transaction dataset in CSR layout:
+# - item_labels/item_codes: the item dictionary, code -> label and label -> code
+# - item_counts: number of transactions containing each item code
+# - items: sorted, de-duplicated item codes of all transactions, one transaction after another
+# - offsets: transaction i is items[offsets[i]:offsets[i+1]]
+# Iterating over the store yields the transactions as tuples of labels, so it can be used
+# wherever a list of transactions is expected.
+class TransactionStore(object):
+    ITEM_TYPECODE = 'i'
+    OFFSET_TYPECODE = 'q'
+
+    def __init__(self, transactions = None):
+        # Attributes
+        self.item_codes = dict()
+        self.item_counts = array(self.OFFSET_TYPECODE)
+        self.item_labels = list()
+        self.items = array(self.ITEM_TYPECODE)
+        self.offsets = array(self.OFFSET_TYPECODE, [0])
+
+        # Call methods
+        if transactions is not None:
+            self.add_transactions(transactions)
+            self.sort_items_by_frequency()
+
+
+    @classmethod
+    def from_codes(cls, transaction_codes, item_codes, item_labels):
+        # Vectorized build from one (transaction code, item code) pair per line item
+        transaction_codes = np.asarray(transaction_codes, dtype = np.int64)
+        item_codes = np.asarray(item_codes, dtype = np.int64)
+        n_items = len(item_labels)
+        n_transactions = int(transaction_codes.max()) + 1 if len(transaction_codes) else 0
+
+        # Drop duplicated line items and order them by transaction
+        line_items = np.unique(transaction_codes * n_items + item_codes)
+        transaction_codes, item_codes = np.divmod(line_items, n_items) if n_items else (line_items, line_items)
+
+        # Re-number the item codes by descending frequency, then sort the codes inside each transaction
+        item_counts = np.bincount(item_codes, minlength = n_items)
+        order = np.argsort(-item_counts, kind = 'stable')
+        recode = np.empty(n_items, dtype = np.int64)
+        recode[order] = np.arange(n_items)
+        item_codes = np.sort(transaction_codes * n_items + recode[item_codes]) - transaction_codes * n_items
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(transaction_codes, minlength = n_transactions))))
+
+        transaction_store = cls()
+        transaction_store.item_labels = [item_labels[code] for code in order.tolist()]
+        transaction_store.item_codes = {label: code for code, label in enumerate(transaction_store.item_labels)}
+        transaction_store.item_counts = array(cls.OFFSET_TYPECODE, item_counts[order].astype(np.int64).tobytes())
+        transaction_store.items = array(cls.ITEM_TYPECODE, item_codes.astype(np.intc).tobytes())
+        transaction_store.offsets = array(cls.OFFSET_TYPECODE, offsets.astype(np.int64).tobytes())
+        return transaction_store
+
+
+    @classmethod
+    def from_dataframe(cls, data_df, *, transaction_id_column, itemset_column):
+        # One line item per row; transactions are ordered by transaction id, missing values are dropped
+        line_items_df = data_df[[transaction_id_column, itemset_column]].dropna()
+        transaction_codes, _ = factorize(line_items_df[transaction_id_column], sort = True)
+        item_codes, item_labels = factorize(line_items_df[itemset_column], sort = True)
+        return cls.from_codes(transaction_codes, item_codes, item_labels.tolist())
+
+
+    @classmethod
+    def from_csv(cls, file_path, *, transaction_id_column, itemset_column, chunksize = 100000, **read_csv_kwargs):
+        chunks = read_csv(
+            file_path,
+            usecols = [transaction_id_column, itemset_column],
+            chunksize = chunksize,
+            **read_csv_kwargs
+        )
+        return cls.from_line_item_chunks(
+            chunks,
+            transaction_id_column = transaction_id_column,
+            itemset_column = itemset_column
+        )
+
+
+    @classmethod
+    def from_line_item_chunks(cls, chunks, *, transaction_id_column, itemset_column):
+        # Line items may arrive in any order and a transaction may span several chunks. Only the
+        # encoded (transaction code, item code) pairs are kept until the store is built.
+        transaction_id_codes = dict()
+        item_label_codes = dict()
+        transaction_codes = array(cls.OFFSET_TYPECODE)
+        item_codes = array(cls.ITEM_TYPECODE)
+        for chunk_df in chunks:
+            chunk_df = chunk_df[[transaction_id_column, itemset_column]].dropna()
+            transaction_codes.frombytes(
+                cls._encode_values(chunk_df[transaction_id_column], transaction_id_codes).astype(np.int64).tobytes()
+            )
+            item_codes.frombytes(
+                cls._encode_values(chunk_df[itemset_column], item_label_codes).astype(np.intc).tobytes()
+            )
+
+        return cls.from_codes(
+            np.frombuffer(transaction_codes, dtype = np.int64),
+            np.frombuffer(item_codes, dtype = np.intc),
+            list(item_label_codes)
+        )
+
+
+    @classmethod
+    def from_sql(cls, sql_db, query_string, *, transaction_id_column, itemset_column, chunksize = 100000):
+        return cls.from_line_item_chunks(
+            sql_db.iter_query(query_string, chunksize = chunksize),
+            transaction_id_column = transaction_id_column,
+            itemset_column = itemset_column
+        )
+
+
+    def __getitem__(self, index):
+        return tuple(self.item_labels[code] for code in self.get_encoded_transaction(index))
+
+
+    def __iter__(self):
+        for transaction in self.iter_encoded_transactions():
+            yield tuple(self.item_labels[code] for code in transaction)
+
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+    def add_transaction(self, transaction):
+        codes = set()
+        for item in transaction:
+            code = self.item_codes.get(item)
+            if code is None:
+                code = self.item_codes[item] = len(self.item_labels)
+                self.item_labels.append(item)
+                self.item_counts.append(0)
+            codes.add(code)
+
+        for code in codes:
+            self.item_counts[code] += 1
+        self.items.extend(sorted(codes))
+        self.offsets.append(len(self.items))
+        return self
+
+
+    def add_transactions(self, transactions):
+        for transaction in transactions:
+            self.add_transaction(transaction)
+        return self
+
+
+    def copy(self):
+        # Independent store with the same item codes, adding transactions to it leaves this store unchanged
+        transaction_store = TransactionStore()
+        transaction_store.item_codes = dict(self.item_codes)
+        transaction_store.item_counts = array(self.OFFSET_TYPECODE, self.item_counts)
+        transaction_store.item_labels = list(self.item_labels)
+        transaction_store.items = array(self.ITEM_TYPECODE, self.items)
+        transaction_store.offsets = array(self.OFFSET_TYPECODE, self.offsets)
+        return transaction_store
+
+
+    def decode_itemset(self, codes):
+        return frozenset(self.item_labels[code] for code in codes)
+
+
+    def encode_itemset(self, itemset):
+        codes = list()
+        for item in set(itemset):
+            code = self.item_codes.get(item)
+            if code is None:
+                return None
+            codes.append(code)
+        return tuple(sorted(codes))
+
+
+    def get_encoded_transaction(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transaction index out of range')
+        return self.items[self.offsets[index]:self.offsets[index + 1]]
+
+
+    def get_partition(self, start, stop):
+        # Transactions start..stop-1 as a new store with a copy of this store's item dictionary
+        first_offset = self.offsets[start]
+        transaction_store = TransactionStore()
+        transaction_store.item_codes = dict(self.item_codes)
+        transaction_store.item_labels = list(self.item_labels)
+        transaction_store.items = self.items[first_offset:self.offsets[stop]]
+        transaction_store.offsets = array(
+            self.OFFSET_TYPECODE,
+            (offset - first_offset for offset in self.offsets[start:stop + 1])
+        )
+        item_counts = np.bincount(np.frombuffer(transaction_store.items, dtype = np.intc), minlength = len(self.item_labels))
+        transaction_store.item_counts = array(self.OFFSET_TYPECODE, item_counts.astype(np.int64).tobytes())
+        return transaction_store
+
+
+    def get_subset(self, indices):
+        # Transactions at the given indices, in that order, as a new store with a copy of this store's item dictionary
+        indices = np.asarray(indices, dtype = np.int64)
+        offsets = np.frombuffer(self.offsets, dtype = np.int64)
+        starts = offsets[indices]
+        lengths = offsets[indices + 1] - starts
+        subset_offsets = np.concatenate(([0], np.cumsum(lengths)))
+        positions = np.repeat(starts - subset_offsets[:-1], lengths) + np.arange(subset_offsets[-1])
+        items = np.frombuffer(self.items, dtype = np.intc)[positions]
+
+        transaction_store = TransactionStore()
+        transaction_store.item_codes = dict(self.item_codes)
+        transaction_store.item_labels = list(self.item_labels)
+        transaction_store.items = array(self.ITEM_TYPECODE, items.tobytes())
+        transaction_store.offsets = array(self.OFFSET_TYPECODE, subset_offsets.astype(np.int64).tobytes())
+        item_counts = np.bincount(items, minlength = len(self.item_labels))
+        transaction_store.item_counts = array(self.OFFSET_TYPECODE, item_counts.astype(np.int64).tobytes())
+        return transaction_store
+
+
+    def iter_encoded_transactions(self, start = 0, stop = None):
+        items = self.items
+        offsets = self.offsets
+        stop = len(self) if stop is None else stop
+        for i in range(start, stop):
+            yield items[offsets[i]:offsets[i + 1]]
+
+
+    def sort_items_by_frequency(self):
+        # Re-number the item codes so that code 0 is the most frequent item (ties keep first-seen order)
+        order = sorted(range(len(self.item_labels)), key = lambda code: -self.item_counts[code])
+        recode = array(self.ITEM_TYPECODE, [0]) * len(order)
+        for new_code, old_code in enumerate(order):
+            recode[old_code] = new_code
+
+        self.item_labels = [self.item_labels[old_code] for old_code in order]
+        self.item_counts = array(self.OFFSET_TYPECODE, (self.item_counts[old_code] for old_code in order))
+        self.item_codes = {label: code for code, label in enumerate(self.item_labels)}
+
+        items = array(self.ITEM_TYPECODE)
+        for transaction in self.iter_encoded_transactions():
+            items.extend(sorted(recode[code] for code in transaction))
+        self.items = items
+        return self
+
+
+    @staticmethod
+    def _encode_values(values, value_codes):
+        # Factorize one chunk, then map its uniques onto the codes shared by all chunks
+        chunk_codes, uniques = factorize(values)
+        chunk_to_shared_codes = np.array(
+            [value_codes.setdefault(value, len(value_codes)) for value in uniques.tolist()],
+            dtype = np.int64
+        )
+        return chunk_to_shared_codes[chunk_codes]
@@ -6,9 +6,14 @@ from copy import deepcopy
 from collections import Counter
 
 # Third-party library
-# from pandas import DataFrame as df
+from pandas import DataFrame as df
 # from pandas import read_csv
 
+# Local imports
+from ml_projects.apriori_algorithm import AprioriAlgorithm
+from ml_projects.benchmarks.generators import generate_transactions
+from ml_projects.fp_growth import FPGrowth
+from ml_projects.transaction_store import TransactionStore
 
 
 class TestAprioriAlgorithm(unittest.TestCase):
@@ -23,6 +28,7 @@ class TestAprioriAlgorithm(unittest.TestCase):
     apriori_algorithm_case_1 = AprioriAlgorithm(dataset = dataset, minsup = 2/16, minconf = 0.1)
     apriori_algorithm_case_2 = AprioriAlgorithm(dataset = dataset, minsup = 3/16, minconf = 0.2)
     apriori_algorithm_case_3 = AprioriAlgorithm(dataset = dataset, minsup = 6/16, minconf = 0.3)
+    apriori_algorithm_vertical_case_1 = AprioriAlgorithm(dataset = dataset, minsup = 2/16, minconf = 0.1, support_counting = 'vertical')
 
 
     def test__calculate_support(self):
@@ -36,6 +42,31 @@ class TestAprioriAlgorithm(unittest.TestCase):
         self.assertEqual(self.apriori_algorithm_case_1._calculate_support(['a','b','c','d']), 0/16)
 
 
+    def test__calculate_support_vertical(self):
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['a']), 6/16)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['c']), 9/16)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['d']), 1/16)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['a','b']), 2/16)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['a','b','c']), 1/16)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['a','b','c','d']), 0/16)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1._calculate_support(['e']), 0/16)
+
+        with self.assertRaises(ValueError):
+            AprioriAlgorithm(dataset = self.dataset, support_counting = 'diagonal')
+
+
+    def test__count_supports(self):
+        itemsets = [frozenset(itemset) for itemset in [['a'], ['a','b'], ['a','c'], ['b','c'], ['a','b','c'], ['a','b','c','d'], ['e']]]
+        self.assertEqual(
+            self.apriori_algorithm_case_1._count_supports(itemsets),
+            {itemset: self.apriori_algorithm_case_1._calculate_support(itemset) for itemset in itemsets}
+        )
+        self.assertEqual(
+            self.apriori_algorithm_vertical_case_1._count_supports(itemsets),
+            self.apriori_algorithm_case_1._count_supports(itemsets)
+        )
+
+
     def test__prune_frequent_itemsets(self):
         self.assertEqual(
             self.apriori_algorithm_case_1._prune_frequent_itemsets([['a'],['b'],['c'],['d']]), 
@@ -117,6 +148,15 @@ class TestAprioriAlgorithm(unittest.TestCase):
             Counter([frozenset({'c', 'b', 'a'})])
         )
 
+        # {'b', 'c'} is missing, so {'a', 'b', 'c'} cannot be frequent and is not generated
+        candidate_itemsets = self.apriori_algorithm_case_1._generate_candidate_itemsets(
+            [['a','b'], ['a','c'], ['a','d'], ['c','d']]
+        )
+        self.assertEqual(
+            Counter(candidate_itemsets), 
+            Counter([frozenset({'a', 'c', 'd'})])
+        )
+
         
     def test_generate_all_frequent_itemsets(self):
         self.apriori_algorithm_case_1.generate_all_frequent_itemsets()
@@ -219,6 +259,10 @@ class TestAprioriAlgorithm(unittest.TestCase):
             }
         )
         
+        self.apriori_algorithm_vertical_case_1.generate_all_rules()
+        self.assertEqual(self.apriori_algorithm_vertical_case_1.all_frequent_itemsets, self.apriori_algorithm_case_1.all_frequent_itemsets)
+        self.assertEqual(self.apriori_algorithm_vertical_case_1.all_rules, self.apriori_algorithm_case_1.all_rules)
+
         self.apriori_algorithm_case_1b = deepcopy(self.apriori_algorithm_case_1)
         self.apriori_algorithm_case_1b.set_minconf(0.4)
         self.apriori_algorithm_case_1b.generate_all_frequent_itemsets().generate_all_rules()
@@ -238,12 +282,374 @@ class TestAprioriAlgorithm(unittest.TestCase):
             }
         )
 
+        # Multi-item consequents
+        apriori_algorithm = AprioriAlgorithm(
+            dataset = [
+                ['bread', 'milk'], ['bread', 'diaper', 'beer', 'eggs'], ['milk', 'diaper', 'beer', 'cola'],
+                ['bread', 'milk', 'diaper', 'beer'], ['bread', 'milk', 'diaper', 'cola']
+            ],
+            minsup = 0.4,
+            minconf = 0.5
+        ).generate_all_rules()
+        self.assertEqual(
+            apriori_algorithm.all_rules[(frozenset({'bread'}), frozenset({'milk', 'diaper'}))],
+            {'support': 0.4, 'confident': 0.5, 'lift': 0.8333333}
+        )
+        self.assertEqual(
+            apriori_algorithm.all_rules[(frozenset({'beer'}), frozenset({'diaper'}))],
+            {'support': 0.6, 'confident': 1.0, 'lift': 1.25}
+        )
+        self.assertEqual(
+            apriori_algorithm.all_rules[(frozenset({'cola'}), frozenset({'milk', 'diaper'}))],
+            {'support': 0.4, 'confident': 1.0, 'lift': 1.6666667}
+        )
+
+
+    def test_iter_rules(self):
+        apriori_algorithm = deepcopy(self.apriori_algorithm_case_1).generate_all_frequent_itemsets()
+        all_rules = {
+            (antecedent, consequent): metrics for antecedent, consequent, metrics in apriori_algorithm.iter_rules(minconf = 0.1)
+        }
+        self.assertEqual(all_rules, apriori_algorithm.generate_all_rules().all_rules)
+
+        self.assertEqual(
+            {(antecedent, consequent) for antecedent, consequent, metrics in apriori_algorithm.iter_rules(min_lift = 1)},
+            {(frozenset({'a'}), frozenset({'b'})), (frozenset({'b'}), frozenset({'a'}))}
+        )
+        top_rules = list(apriori_algorithm.iter_rules(top_k = 3, sort_by = 'confident'))
+        self.assertEqual([metrics['confident'] for antecedent, consequent, metrics in top_rules], [0.4, 0.4, 0.3333333])
+        self.assertEqual(
+            {(antecedent, consequent) for antecedent, consequent, metrics in top_rules[:2]},
+            {(frozenset({'b'}), frozenset({'a'})), (frozenset({'b'}), frozenset({'c'}))}
+        )
+        self.assertEqual(list(apriori_algorithm.iter_rules(top_k = 0)), [])
+        with self.assertRaises(ValueError):
+            apriori_algorithm.iter_rules(sort_by = 'conviction')
+        with self.assertRaises(ValueError):
+            apriori_algorithm.iter_rules(top_k = -1)
+
+        rules_df = apriori_algorithm.rules_dataframe(minconf = 0.3, top_k = 2)
+        self.assertEqual(rules_df.columns.tolist(), ['antecedent', 'consequent', 'support', 'confident', 'lift'])
+        self.assertEqual(rules_df['lift'].tolist(), [1.0666667, 1.0666667])
+
+        # Labels of mixed types never have to be ordered, consequents are joined on item codes
+        labels = {'bread': 'bread', 'milk': 1, 'diaper': 2.5, 'beer': ('beer',), 'cola': None}
+        dataset = [
+            ['bread', 'milk'], ['bread', 'diaper', 'beer'], ['milk', 'diaper', 'beer', 'cola'],
+            ['bread', 'milk', 'diaper', 'beer'], ['bread', 'milk', 'diaper', 'cola']
+        ]
+        relabel = lambda itemset: frozenset(labels[item] for item in itemset)
+        apriori_algorithm = AprioriAlgorithm(dataset = dataset, minsup = 0.2, minconf = 0.1).generate_all_rules()
+        mixed_apriori_algorithm = AprioriAlgorithm(
+            dataset = [[labels[item] for item in transaction] for transaction in dataset], minsup = 0.2, minconf = 0.1
+        ).generate_all_rules()
+        self.assertEqual(mixed_apriori_algorithm.all_rules, {
+            (relabel(antecedent), relabel(consequent)): metrics for (antecedent, consequent), metrics in apriori_algorithm.all_rules.items()
+        })
+
+
+    def test_set_transaction_dataset(self):
+        transaction_dataset = df(
+            data = [
+                (f'order_{transaction_id:02}', item) for transaction_id, transaction in enumerate(self.dataset) for item in transaction
+            ] + [('order_01', 'a'), ('order_02', None)],
+            columns = ['order_id', 'category']
+        )
+        apriori_algorithm = AprioriAlgorithm(minsup = 2/16, minconf = 0.1).set_transaction_dataset(
+            transaction_dataset = transaction_dataset,
+            transaction_id_column = 'order_id',
+            itemset_column = 'category'
+        )
+        self.assertEqual(apriori_algorithm.n, 16)
+        self.assertEqual(
+            [frozenset(transaction) for transaction in apriori_algorithm.dataset],
+            [frozenset(transaction) for transaction in self.dataset]
+        )
+
+        apriori_algorithm = AprioriAlgorithm(dataset = apriori_algorithm.dataset, minsup = 2/16, minconf = 0.1)
+        apriori_algorithm.generate_all_frequent_itemsets().generate_all_rules()
+        expected_apriori_algorithm = AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, minconf = 0.1)
+        expected_apriori_algorithm.generate_all_frequent_itemsets().generate_all_rules()
+        self.assertEqual(apriori_algorithm.all_frequent_itemsets, expected_apriori_algorithm.all_frequent_itemsets)
+        self.assertEqual(apriori_algorithm.all_rules, expected_apriori_algorithm.all_rules)
+
+
+    def test_partitioned_mining(self):
+        for apriori_algorithm in [self.apriori_algorithm_case_1, self.apriori_algorithm_case_2, self.apriori_algorithm_case_3]:
+            apriori_algorithm = deepcopy(apriori_algorithm).generate_all_frequent_itemsets()
+            for support_counting in AprioriAlgorithm.SUPPORT_COUNTING_MODES:
+                partitioned_apriori_algorithm = AprioriAlgorithm(
+                    dataset = self.dataset,
+                    minsup = apriori_algorithm.minsup,
+                    support_counting = support_counting,
+                    n_jobs = 2,
+                    n_partitions = 3
+                ).generate_all_frequent_itemsets()
+                self.assertEqual(partitioned_apriori_algorithm.all_frequent_itemsets, apriori_algorithm.all_frequent_itemsets)
+
+
+    def test_add_transactions(self):
+        new_transactions = [["a", "b"], ["a", "b", "d"], ["b", "d"], ["d", "e"], ["a", "b", "c"]]
+        for support_counting in AprioriAlgorithm.SUPPORT_COUNTING_MODES:
+            expected_apriori_algorithm = AprioriAlgorithm(
+                dataset = self.dataset + new_transactions,
+                minsup = 3/21,
+                minconf = 0.3,
+                support_counting = support_counting
+            ).generate_all_rules()
+
+            apriori_algorithm = AprioriAlgorithm(
+                dataset = self.dataset,
+                minsup = 3/21,
+                minconf = 0.3,
+                support_counting = support_counting
+            ).generate_all_rules()
+            self.assertNotIn(frozenset({'a', 'b'}), apriori_algorithm.all_frequent_itemsets)
+            apriori_algorithm.add_transactions(new_transactions[:2]).add_transactions(iter(new_transactions[2:]))
+            self.assertEqual(apriori_algorithm.n, 21)
+            self.assertEqual(apriori_algorithm.all_frequent_itemsets, expected_apriori_algorithm.all_frequent_itemsets)
+            self.assertEqual(apriori_algorithm.all_rules, expected_apriori_algorithm.all_rules)
+            self.assertIn(frozenset({'a', 'b'}), apriori_algorithm.all_frequent_itemsets)
+            self.assertIn(frozenset({'d'}), apriori_algorithm.all_frequent_itemsets)
+
+        # A shared transaction store is copied, the other miner on it keeps the old transactions
+        transaction_store = TransactionStore(self.dataset)
+        apriori_algorithm = AprioriAlgorithm(dataset = transaction_store, minsup = 3/21, minconf = 0.3).generate_all_rules()
+        other_apriori_algorithm = AprioriAlgorithm(dataset = transaction_store, minsup = 3/21, minconf = 0.3)
+        apriori_algorithm.add_transactions(new_transactions)
+        self.assertEqual(apriori_algorithm.all_frequent_itemsets, expected_apriori_algorithm.all_frequent_itemsets)
+        self.assertEqual(len(transaction_store), 16)
+        self.assertNotIn('e', transaction_store.item_codes)
+        self.assertEqual(
+            other_apriori_algorithm.generate_all_frequent_itemsets().all_frequent_itemsets,
+            AprioriAlgorithm(dataset = self.dataset, minsup = 3/21).generate_all_frequent_itemsets().all_frequent_itemsets
+        )
+
+
+    def test_fp_growth_parity(self):
+        for apriori_algorithm in [self.apriori_algorithm_case_1, self.apriori_algorithm_case_2, self.apriori_algorithm_case_3]:
+            apriori_algorithm = deepcopy(apriori_algorithm).generate_all_frequent_itemsets().generate_all_rules()
+            fp_growth = FPGrowth(
+                dataset = self.dataset,
+                minsup = apriori_algorithm.minsup,
+                minconf = apriori_algorithm.minconf
+            ).generate_all_frequent_itemsets().generate_all_rules()
+            self.assertEqual(fp_growth.all_frequent_itemsets, apriori_algorithm.all_frequent_itemsets)
+            self.assertEqual(fp_growth.all_rules, apriori_algorithm.all_rules)
+
+        dataset = [
+            ['bread', 'milk'], ['bread', 'diaper', 'beer', 'eggs'], ['milk', 'diaper', 'beer', 'cola'],
+            ['bread', 'milk', 'diaper', 'beer'], ['bread', 'milk', 'diaper', 'cola']
+        ]
+        apriori_algorithm = AprioriAlgorithm(dataset = dataset, minsup = 0.4, minconf = 0.5).generate_all_rules()
+        fp_growth = FPGrowth(dataset = dataset, minsup = 0.4, minconf = 0.5).generate_all_rules()
+        self.assertEqual(fp_growth.all_frequent_itemsets, apriori_algorithm.all_frequent_itemsets)
+        self.assertEqual(fp_growth.all_rules, apriori_algorithm.all_rules)
+
+
+    def test_profiling(self):
+        callback_stats = list()
+        apriori_algorithm = AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, minconf = 0.1).set_profiling(
+            True, callback = lambda apriori_algorithm, stats: callback_stats.append((stats['k'], sorted(stats)))
+        )
+        apriori_algorithm.generate_all_frequent_itemsets().generate_all_rules()
+        self.assertEqual(apriori_algorithm.all_rules, deepcopy(self.apriori_algorithm_case_1).generate_all_rules().all_rules)
+
+        counts = [
+            (stats['k'], stats['n_candidates'], stats['n_pruned'], stats['n_frequent'], stats['n_scanned_transactions'])
+            for stats in apriori_algorithm.level_stats
+        ]
+        self.assertEqual(counts, [(1, 4, 0, 3, 0), (2, 3, 0, 3, 16), (3, 1, 0, 0, 16)])
+        self.assertEqual(apriori_algorithm.level_stats[1]['n_rules'], 6)
+        self.assertGreaterEqual(apriori_algorithm.level_stats[1]['rule_generation_seconds'], 0)
+        self.assertEqual([k for k, stats_keys in callback_stats], [1, 2, 3, 2])
+        self.assertIn('counting_seconds', callback_stats[0][1])
+
+        # Joined candidates with an infrequent subset are pruned
+        dataset = [['a', 'b'], ['a', 'c'], ['b', 'c'], ['a', 'b'], ['a', 'c'], ['a', 'b', 'c', 'd'], ['a', 'd']]
+        apriori_algorithm = AprioriAlgorithm(dataset = dataset, minsup = 2/7, profile = True).generate_all_frequent_itemsets()
+        self.assertEqual([stats['n_pruned'] for stats in apriori_algorithm.level_stats], [0, 0, 2])
+
+        # Disabled by default
+        self.assertIsNone(deepcopy(self.apriori_algorithm_case_2).generate_all_frequent_itemsets().level_stats)
+
+        # Incremental and verified sampled mining go through the same profiled levels
+        apriori_algorithm = AprioriAlgorithm(dataset = self.dataset[:8], minsup = 2/16, profile = True).generate_all_frequent_itemsets()
+        apriori_algorithm.add_transactions(self.dataset[8:])
+        self.assertEqual([stats['n_frequent'] for stats in apriori_algorithm.level_stats], [3, 3, 0])
+        self.assertEqual(apriori_algorithm.level_stats[1]['n_scanned_transactions'], 8)
+        apriori_algorithm.set_sampling(8, error = 0.1, random_state = 0).generate_all_frequent_itemsets()
+        self.assertEqual([stats['n_frequent'] for stats in apriori_algorithm.level_stats], [3, 3, 0])
+
+        # Other paths warn, at the caller's line, and record nothing
+        for apriori_algorithm in [
+            AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, profile = True, itemset_mode = 'closed'),
+            AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, profile = True, sample_size = 8).set_sampling(8, mode = 'estimate'),
+            FPGrowth(dataset = self.dataset, minsup = 2/16, profile = True)
+        ]:
+            with self.assertWarns(RuntimeWarning) as warning:
+                apriori_algorithm.generate_all_frequent_itemsets()
+            self.assertEqual(warning.filename, __file__)
+            self.assertIsNone(apriori_algorithm.level_stats)
+
+
+    def test_max_candidates(self):
+        apriori_algorithm = AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, max_candidates = 2)
+        with self.assertWarns(RuntimeWarning) as warning:
+            apriori_algorithm.generate_all_frequent_itemsets()
+        self.assertEqual(warning.filename, __file__)
+        with self.assertWarns(RuntimeWarning) as warning:
+            deepcopy(apriori_algorithm).set_profiling(True).generate_all_frequent_itemsets()
+        self.assertEqual(warning.filename, __file__)
+        self.assertEqual(apriori_algorithm.all_frequent_itemsets, deepcopy(self.apriori_algorithm_case_1).generate_all_frequent_itemsets().all_frequent_itemsets)
+
+        apriori_algorithm.set_max_candidates(2, action = 'raise')
+        with self.assertRaises(RuntimeError):
+            apriori_algorithm.generate_all_frequent_itemsets()
+        apriori_algorithm.set_max_candidates(-1)._check_max_candidates([])
+
+        # Miners without candidate generation warn that the guard and the workers are ignored
+        for apriori_algorithm in [
+            FPGrowth(dataset = self.dataset, minsup = 2/16, max_candidates = 2, n_jobs = 2),
+            AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, max_candidates = 2, itemset_mode = 'maximal')
+        ]:
+            with self.assertWarns(RuntimeWarning) as warning:
+                apriori_algorithm.generate_all_frequent_itemsets()
+            self.assertEqual(warning.filename, __file__)
+        with self.assertRaises(ValueError):
+            apriori_algorithm.set_max_candidates(2, action = 'stop')
+
+
+    def test_closed_and_maximal_itemsets(self):
+        dataset = [
+            ['bread', 'milk'], ['bread', 'diaper', 'beer', 'eggs'], ['milk', 'diaper', 'beer', 'cola'],
+            ['bread', 'milk', 'diaper', 'beer'], ['bread', 'milk', 'diaper', 'cola']
+        ]
+        for dataset, minsup in [(self.dataset, 2/16), (dataset, 0.2), (dataset, 0.4)]:
+            apriori_algorithm = AprioriAlgorithm(dataset = dataset, minsup = minsup, minconf = 0.3).generate_all_rules()
+            all_frequent_itemsets = apriori_algorithm.all_frequent_itemsets
+            closed = AprioriAlgorithm(dataset = dataset, minsup = minsup, minconf = 0.3, itemset_mode = 'closed')
+            maximal = AprioriAlgorithm(dataset = dataset, minsup = minsup, itemset_mode = 'maximal')
+
+            self.assertEqual(closed.generate_all_frequent_itemsets().all_frequent_itemsets, {
+                itemset: support for itemset, support in all_frequent_itemsets.items()
+                if not any(itemset < other and all_frequent_itemsets[other] == support for other in all_frequent_itemsets)
+            })
+            self.assertEqual(maximal.generate_all_frequent_itemsets().all_frequent_itemsets, {
+                itemset: support for itemset, support in all_frequent_itemsets.items()
+                if not any(itemset < other for other in all_frequent_itemsets)
+            })
+
+            # Supports of every subset are recovered, non-redundant rules are a subset of all rules
+            for itemset, support in all_frequent_itemsets.items():
+                self.assertEqual(closed.get_support(itemset), support)
+                self.assertEqual(maximal.get_support(itemset), support)
+            self.assertEqual(closed.get_support(['bread', 'unknown']), 0.0)
+            closed_rules = closed.generate_all_rules().all_rules
+            self.assertTrue(closed_rules)
+            for rule, metrics in closed_rules.items():
+                self.assertEqual(apriori_algorithm.all_rules[rule], metrics)
+
+            # Every rule follows from the basis: exact rules give closures, approximate rules join two closures
+            exact_rules = [(antecedent, consequent) for (antecedent, consequent), metrics in closed_rules.items() if metrics['confident'] == 1]
+            def closure(itemset):
+                while True:
+                    closed_itemset = itemset.union(*(consequent for antecedent, consequent in exact_rules if antecedent <= itemset))
+                    if closed_itemset == itemset:
+                        return itemset
+                    itemset = closed_itemset
+            for (antecedent, consequent), metrics in apriori_algorithm.all_rules.items():
+                antecedent_closure, itemset_closure = closure(antecedent), closure(antecedent | consequent)
+                if antecedent_closure == itemset_closure:
+                    self.assertEqual(metrics['confident'], 1)
+                else:
+                    closed_metrics = closed_rules[(antecedent_closure, itemset_closure - antecedent_closure)]
+                    self.assertEqual((closed_metrics['support'], closed_metrics['confident']), (metrics['support'], metrics['confident']))
+
+        self.assertEqual(
+            set(AprioriAlgorithm(dataset = self.dataset, minsup = 2/16, itemset_mode = 'maximal').generate_all_frequent_itemsets().all_frequent_itemsets),
+            {frozenset(['a', 'b']), frozenset(['a', 'c']), frozenset(['b', 'c'])}
+        )
+        self.assertEqual(closed_rules[(frozenset(['diaper']), frozenset(['beer']))]['confident'], 0.75)
+        closed.set_minconf(0.9).generate_all_rules()
+        self.assertIn((frozenset(['beer']), frozenset(['diaper'])), closed.all_rules)
+        with self.assertRaises(ValueError):
+            maximal.generate_all_rules()
+        with self.assertRaises(ValueError):
+            maximal.set_itemset_mode('generators')
+
+        # Settings the depth-first tidset mining cannot honour are rejected
+        for itemset_mode in ['closed', 'maximal']:
+            for kwargs in [{'n_jobs': 2}, {'sample_size': 3}, {'support_counting': 'vertical'}]:
+                with self.assertRaises(ValueError):
+                    AprioriAlgorithm(dataset = dataset, minsup = 0.4, itemset_mode = itemset_mode, **kwargs).generate_all_frequent_itemsets()
+            with self.assertRaises(ValueError):
+                FPGrowth(dataset = dataset, minsup = 0.4, itemset_mode = itemset_mode)
+
+
+    def test_sampling(self):
+        transactions = generate_transactions(n_transactions = 2000, n_items = 50, avg_transaction_size = 5, random_state = 0)
+        exact = AprioriAlgorithm(dataset = transactions, minsup = 0.05, minconf = 0.5).generate_all_rules()
+
+        # Verified sampling is exact, also when the sample is too small to find every frequent itemset
+        for sample_size, error in [(500, 0.02), (20, 0.001)]:
+            apriori_algorithm = AprioriAlgorithm(dataset = transactions, minsup = 0.05, minconf = 0.5, sample_size = sample_size)
+            apriori_algorithm.set_sampling(sample_size, error = error, random_state = 1).generate_all_rules()
+            self.assertEqual(apriori_algorithm.all_frequent_itemsets, exact.all_frequent_itemsets)
+            self.assertEqual(apriori_algorithm.all_rules, exact.all_rules)
+            self.assertEqual(apriori_algorithm.sampling_stats['sample_size'], sample_size)
+        self.assertGreater(apriori_algorithm.sampling_stats['n_missed'], 0)
+
+        # The sample is mined below minsup, also when error exceeds minsup
+        apriori_algorithm.set_sampling(10, random_state = 1).generate_all_frequent_itemsets()
+        self.assertEqual(apriori_algorithm.all_frequent_itemsets, exact.all_frequent_itemsets)
+        self.assertTrue(0 < apriori_algorithm.sampling_stats['mining_minsup'] < 0.05)
+
+        # Estimates from the sample only, with bounds around the sample supports
+        apriori_algorithm = AprioriAlgorithm(dataset = transactions, minsup = 0.05, minconf = 0.5)
+        apriori_algorithm.set_sampling(error = 0.05, mode = 'estimate', random_state = 1).generate_all_rules()
+        self.assertEqual(apriori_algorithm.sampling_stats['sample_size'], 600)
+        self.assertEqual(apriori_algorithm.sampling_stats['n_scanned_transactions'] % 600, 0)
+        supports = apriori_algorithm._count_supports(list(apriori_algorithm.all_frequent_itemsets))
+        n_covered = 0
+        for itemset, support in apriori_algorithm.all_frequent_itemsets.items():
+            lower, upper = apriori_algorithm.support_bounds[itemset]
+            self.assertTrue(lower <= support <= upper)
+            n_covered += lower <= round(supports[itemset], 7) <= upper
+        self.assertGreater(n_covered / len(supports), 0.85)
+
+        # A sample of the whole dataset gives exact supports
+        apriori_algorithm.set_sampling(len(transactions), mode = 'estimate').generate_all_frequent_itemsets()
+        self.assertEqual(apriori_algorithm.all_frequent_itemsets, exact.all_frequent_itemsets)
+        self.assertTrue(all(lower == upper for lower, upper in apriori_algorithm.support_bounds.values()))
+
+        with self.assertRaises(ValueError):
+            apriori_algorithm.set_sampling(100, mode = 'exact')
+        for error, mode in [(0, 'estimate'), (1, 'estimate'), (0.05, 'verify')]:
+            with self.assertRaises(ValueError):
+                apriori_algorithm.set_sampling(error = error, mode = mode)
+        with self.assertRaises(ValueError):
+            FPGrowth(dataset = transactions, minsup = 0.05, sample_size = 500)
+        with self.assertRaises(ValueError):
+            apriori_algorithm.set_itemset_mode('closed').generate_all_frequent_itemsets()
+
 
 if __name__ == "__main__":
     test_apriori_algorithm = TestAprioriAlgorithm()
     test_apriori_algorithm.test__calculate_support()
+    test_apriori_algorithm.test__calculate_support_vertical()
+    test_apriori_algorithm.test__count_supports()
     test_apriori_algorithm.test__prune_frequent_itemsets()
     test_apriori_algorithm.test__generate_frequent_single_itemsets()
     test_apriori_algorithm.test__generate_candidate_itemsets()
     test_apriori_algorithm.test_generate_all_frequent_itemsets()
-    test_apriori_algorithm.test_generate_all_rules()
\ No newline at end of file
+    test_apriori_algorithm.test_generate_all_rules()
+    test_apriori_algorithm.test_iter_rules()
+    test_apriori_algorithm.test_set_transaction_dataset()
+    test_apriori_algorithm.test_partitioned_mining()
+    test_apriori_algorithm.test_add_transactions()
+    test_apriori_algorithm.test_fp_growth_parity()
+    test_apriori_algorithm.test_profiling()
+    test_apriori_algorithm.test_max_candidates()
+    test_apriori_algorithm.test_closed_and_maximal_itemsets()
+    test_apriori_algorithm.test_sampling()
\ No newline at end of file
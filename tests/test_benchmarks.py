@@ -0,0 +1,87 @@
+# Standard library
+import os
+import tempfile
+import unittest
+
+# Third-party library
+import numpy as np
+
+# Local imports
+from ml_projects.benchmarks.benchmark import Benchmark, run_benchmarks
+from ml_projects.benchmarks.generators import (
+    CAR_OUTPUT_FEATURE, generate_regression_data, generate_transactions, transactions_to_line_items
+)
+
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generate_transactions(self):
+        transactions = generate_transactions(n_transactions = 2000, n_items = 100, avg_transaction_size = 8, random_state = 0)
+        self.assertEqual(len(transactions), 2000)
+        self.assertEqual(transactions, generate_transactions(n_transactions = 2000, n_items = 100, avg_transaction_size = 8, random_state = 0))
+        self.assertNotEqual(transactions, generate_transactions(n_transactions = 2000, n_items = 100, avg_transaction_size = 8, random_state = 1))
+        self.assertAlmostEqual(np.mean([len(transaction) for transaction in transactions]), 8, delta = 1)
+        self.assertTrue(all(transaction == tuple(sorted(set(transaction))) for transaction in transactions))
+        self.assertTrue(all(0 <= item < 100 for transaction in transactions for item in transaction))
+
+        line_items_df = transactions_to_line_items(transactions[:3])
+        self.assertEqual(
+            line_items_df.groupby('order_id')['item'].apply(tuple).tolist(), transactions[:3]
+        )
+
+        # Baskets larger than the item set are capped instead of hanging
+        for n_items, avg_transaction_size in [(15, 10), (5, 12), (1, 3)]:
+            transactions = generate_transactions(
+                n_transactions = 500, n_items = n_items, avg_transaction_size = avg_transaction_size, random_state = 0
+            )
+            self.assertEqual(len(transactions), 500)
+            self.assertTrue(all(len(transaction) <= n_items for transaction in transactions))
+
+
+    def test_generate_regression_data(self):
+        regression_df = generate_regression_data(n_rows = 5000, random_state = 0)
+        self.assertEqual(len(regression_df), 5000)
+        self.assertTrue(regression_df.equals(generate_regression_data(n_rows = 5000, random_state = 0)))
+        self.assertAlmostEqual(regression_df['Year'].mean(), 2010.4, delta = 0.5)
+        self.assertGreater(regression_df[['Engine HP', CAR_OUTPUT_FEATURE]].corr().iloc[0, 1], 0.5)
+
+
+    def test_nested_phases(self):
+        # The inner phase resets the tracemalloc peak, the outer phase still reports its own earlier peak
+        benchmark = Benchmark()
+        with benchmark.phase('outer'):
+            data = bytearray(10**7)
+            del data
+            with benchmark.phase('inner'):
+                data = bytearray(10**5)
+                del data
+        inner, outer = benchmark.phases
+        self.assertEqual((inner['name'], outer['name']), ('inner', 'outer'))
+        self.assertGreaterEqual(outer['peak_memory_bytes'], 10**7)
+        self.assertLess(inner['peak_memory_bytes'], 10**7)
+
+
+    def test_benchmark(self):
+        benchmark = run_benchmarks(scale = 0.05, minsup = 0.05)
+        self.assertIn('apriori.generate_all_frequent_itemsets.vertical', [phase['name'] for phase in benchmark.phases])
+        self.assertTrue(all(phase['seconds'] >= 0 and phase['peak_memory_bytes'] >= 0 for phase in benchmark.phases))
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'benchmark.json')
+            benchmark.save(file_path)
+            baseline = Benchmark.load(file_path)
+        self.assertEqual(baseline.phases, benchmark.phases)
+        self.assertEqual(benchmark.compare(baseline), [])
+
+        slower_baseline = Benchmark(config = baseline.config)
+        slower_baseline.phases = [dict(phase, seconds = phase['seconds'] / 2) for phase in baseline.phases]
+        self.assertEqual(
+            {regression['name'] for regression in benchmark.compare(slower_baseline, time_tolerance = 0.5)},
+            {phase['name'] for phase in benchmark.phases if phase['seconds'] > 0}
+        )
+        with self.assertRaises(ValueError):
+            benchmark.compare(Benchmark(config = {'scale': 1.0}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+# Standard library
+import os
+import tempfile
+import unittest
+
+# Third-party library
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from pandas import DataFrame as df
+
+# Local imports
+from ml_projects.apriori_algorithm import AprioriAlgorithm
+from ml_projects.helpers import SqlDb, _hexbin, _stratified_sample, plot_by_feature
+
+
+
+class TestSqlDb(unittest.TestCase):
+    line_items_df = df({
+        'order_id': [1, 1, 2, 3, 3, 3],
+        'category': ['book', 'pen', None, 'book', 'ink', 'pen'],
+        'price': [12.5, 1.0, 3.0, np.nan, 7.25, 1.0],
+        'quantity': pd.array([1, 2, None, 1, 1, 4], dtype = 'Int64'),
+        'ordered_at': pd.to_datetime(['2021-01-01', '2021-01-01', '2021-01-02', None, '2021-01-03', '2021-01-03'])
+    })
+
+
+    def test_create_table_bulk(self):
+        sql_db = SqlDb(pragmas = SqlDb.SCRATCH_PRAGMAS)
+
+        row_count = sql_db.create_table(
+            'line_item', data_df = self.line_items_df, bulk = True, chunksize = 4, index_columns = ['order_id', ('category', 'order_id')]
+        )
+        self.assertEqual(row_count, 6)
+        self.assertEqual(sql_db.query('PRAGMA synchronous').iloc[0, 0], 0)
+
+        # Same rows as to_sql, without the pandas index column
+        default_sql_db = SqlDb()
+        default_sql_db.create_table('line_item', data_df = self.line_items_df)
+        query_string = 'SELECT * FROM line_item ORDER BY rowid'
+        pd.testing.assert_frame_equal(sql_db.query(query_string), default_sql_db.query(query_string))
+        self.assertEqual(
+            sql_db.query("SELECT name FROM pragma_table_info('line_item')")['name'].tolist(),
+            ['order_id', 'category', 'price', 'quantity', 'ordered_at']
+        )
+        self.assertEqual(
+            sorted(sql_db.query("SELECT name FROM sqlite_master WHERE type = 'index'")['name']),
+            ['ix_line_item_category_order_id', 'ix_line_item_order_id']
+        )
+
+        # Reloading replaces the table and its indexes
+        sql_db.create_table('line_item', data_df = self.line_items_df.head(2), bulk = True)
+        self.assertEqual(sql_db.query('SELECT COUNT(*) AS n FROM line_item')['n'].tolist(), [2])
+        self.assertEqual(len(sql_db.query("SELECT name FROM sqlite_master WHERE type = 'index'")), 0)
+
+
+    def test_iter_query(self):
+        sql_db = SqlDb()
+        sql_db.create_table('line_item', data_df = self.line_items_df)
+        chunks = list(sql_db.iter_query(
+            'SELECT order_id, category, price FROM line_item', chunksize = 4, dtypes = {'order_id': 'int32', 'category': 'string'}
+        ))
+        self.assertEqual([len(chunk_df) for chunk_df in chunks], [4, 2])
+        self.assertEqual(str(chunks[0]['order_id'].dtype), 'int32')
+        self.assertEqual(str(chunks[0]['category'].dtype), 'string')
+
+        data_df = sql_db.query('SELECT * FROM line_item', chunksize = 4)
+        self.assertEqual(data_df.columns.tolist(), self.line_items_df.columns.tolist())
+        self.assertEqual(data_df.index.tolist(), list(range(6)))
+        self.assertEqual(data_df['price'].tolist()[:3], [12.5, 1.0, 3.0])
+
+        # Same dtypes whatever the chunks, also when the last chunk is all NULL
+        query_string = 'SELECT order_id, category, price, quantity FROM line_item WHERE price IS NOT NULL OR order_id = 3 ORDER BY price IS NULL'
+        pd.testing.assert_frame_equal(sql_db.query(query_string, chunksize = 5), sql_db.query(query_string))
+        self.assertEqual(str(sql_db.query(query_string, chunksize = 5)['price'].dtype), 'float64')
+
+        # An empty result keeps its columns
+        self.assertEqual(sql_db.query('SELECT order_id, price FROM line_item WHERE 0').columns.tolist(), ['order_id', 'price'])
+
+
+    def test_iter_transactions(self):
+        sql_db = SqlDb()
+        sql_db.create_table('line_item', data_df = self.line_items_df, bulk = True)
+        transactions = sql_db.iter_transactions('SELECT order_id, category FROM line_item ORDER BY order_id', chunksize = 4)
+
+        apriori_algorithm = AprioriAlgorithm(dataset = transactions, minsup = 0.5, minconf = 0.5)
+        expected_apriori_algorithm = AprioriAlgorithm(minsup = 0.5, minconf = 0.5).set_transaction_dataset(
+            transaction_dataset = self.line_items_df, transaction_id_column = 'order_id', itemset_column = 'category'
+        )
+        self.assertEqual(apriori_algorithm.n, 2)
+        self.assertEqual(
+            apriori_algorithm.generate_all_frequent_itemsets().all_frequent_itemsets,
+            expected_apriori_algorithm.generate_all_frequent_itemsets().all_frequent_itemsets
+        )
+
+
+    def test_query_parameters(self):
+        sql_db = SqlDb()
+        sql_db.create_table('line_item', data_df = self.line_items_df)
+        query_string = 'SELECT category FROM line_item WHERE order_id = ? ORDER BY category'
+        self.assertEqual(sql_db.query(query_string, (3,))['category'].tolist(), ['book', 'ink', 'pen'])
+        self.assertEqual(
+            sql_db.query('SELECT COUNT(*) AS n FROM line_item WHERE category = :category', {'category': 'pen'})['n'].tolist(), [2]
+        )
+
+        sql_db.execute('DELETE FROM line_item WHERE category = ?', ('pen',))
+        self.assertEqual(sql_db.query(query_string, (3,))['category'].tolist(), ['book', 'ink'])
+
+        # Table names are quoted identifiers
+        sql_db.create_table('line item; --', data_df = self.line_items_df, bulk = True)
+        sql_db.delete_table('line item; --')
+        self.assertEqual(len(sql_db.query("SELECT name FROM sqlite_master WHERE name = 'line_item'")), 1)
+
+
+    def test_result_cache(self):
+        sql_db = SqlDb(result_cache_size = 2)
+        sql_db.create_table('line_item', data_df = self.line_items_df, bulk = True)
+        query_string = 'SELECT COUNT(*) AS n FROM line_item WHERE order_id = ?'
+        self.assertEqual(sql_db.query(query_string, (3,))['n'].tolist(), [3])
+        self.assertEqual(sql_db.query(query_string, (1,))['n'].tolist(), [2])
+
+        # Cached copies, least recently used evicted first
+        data_df = sql_db.query(query_string, (3,))
+        data_df.loc[0, 'n'] = 0
+        self.assertEqual(sql_db.query(query_string, (3,))['n'].tolist(), [3])
+        sql_db.query(query_string, (2,))
+        self.assertEqual(
+            list(sql_db._result_cache), [(query_string, (3,), None), (query_string, (2,), None)]
+        )
+
+        # Invalidated by every change of the tables
+        sql_db.create_table('line_item', data_df = self.line_items_df.head(4), bulk = True)
+        self.assertEqual(sql_db.query(query_string, (3,))['n'].tolist(), [1])
+        sql_db.insert_into('pen_line_item', query_string = 'SELECT * FROM line_item WHERE category = ?', params = ('pen',))
+        self.assertEqual(len(sql_db._result_cache), 0)
+        sql_db.execute('DELETE FROM line_item')
+        self.assertEqual(sql_db.query(query_string, (3,))['n'].tolist(), [0])
+        sql_db.query('PRAGMA cache_size')
+        sql_db.set_pragmas(cache_size = -4096)
+        self.assertEqual(sql_db.query('PRAGMA cache_size').iloc[0, 0], -4096)
+
+
+    def test_set_pragmas(self):
+        with self.assertRaises(ValueError):
+            SqlDb().set_pragmas(journal_mode = 'OFF; DROP TABLE line_item')
+
+
+
+class TestPlotByFeature(unittest.TestCase):
+    rng = np.random.default_rng(0)
+    data_df = df({
+        'float32': rng.normal(size = 5000).astype('float32'),
+        'uint8': rng.integers(0, 100, 5000).astype('uint8'),
+        'nullable int': pd.array(rng.integers(0, 5, 5000), dtype = 'Int64'),
+        'flag': rng.random(5000) < 0.5,
+        'label': 'x',
+        'price': rng.normal(size = 5000)
+    })
+
+
+    def tearDown(self):
+        plt.close('all')
+
+
+    def test_plot_kinds(self):
+        # Every numeric dtype but bool, scatter up to max_points rows and aggregated above
+        figure = plot_by_feature(self.data_df, 'price', show = False)
+        # Returned without pyplot, so a notebook renders it once
+        self.assertEqual(plt.get_fignums(), [])
+        self.assertIsNone(plot_by_feature(self.data_df, 'price'))
+        self.assertEqual([ax.get_title() for ax in figure.axes if ax.get_title()], ['float32', 'uint8', 'nullable int'])
+        self.assertEqual(len(figure.axes[0].lines[0].get_xdata()), 5000)
+
+        figure = plot_by_feature(self.data_df, 'price', max_points = 1000, bins = 20, show = False)
+        self.assertEqual(len(figure.axes[0].lines), 0)
+        self.assertEqual(figure.axes[0].collections[0].get_array().sum(), 5000)
+
+        figure = plot_by_feature(self.data_df, 'price', kind = 'sample', max_points = 1000, show = False)
+        self.assertLessEqual(len(figure.axes[0].lines[0].get_xdata()), 1000)
+        with self.assertRaises(ValueError):
+            plot_by_feature(self.data_df, 'price', kind = 'scatter3d')
+
+
+    def test_hexbin(self):
+        # Pre-binned centers draw the same hexagons as matplotlib binning every row
+        x = self.data_df['float32'].to_numpy(dtype = np.float64)
+        y = self.data_df['price'].to_numpy()
+        centers_x, centers_y, counts, extent, gridsize = _hexbin(x, y, 30)
+        ax = plt.figure().add_subplot()
+        expected = ax.hexbin(x, y, gridsize = gridsize, extent = extent, mincnt = 1)
+        hexagons = ax.hexbin(centers_x, centers_y, C = counts, reduce_C_function = np.sum, gridsize = gridsize, extent = extent, mincnt = 1)
+        np.testing.assert_array_equal(hexagons.get_offsets(), expected.get_offsets())
+        np.testing.assert_array_equal(hexagons.get_array(), expected.get_array())
+
+        # Rows on the border and a constant feature keep every row
+        for x, y in [(np.array([0.0, 1.0, 1.0, 0.5]), np.array([0.0, 1.0, 0.0, 1.0])), (np.zeros(10), y[:10])]:
+            centers_x, centers_y, counts, extent, gridsize = _hexbin(x, y, 5)
+            hexagons = ax.hexbin(centers_x, centers_y, C = counts, reduce_C_function = np.sum, gridsize = gridsize, extent = extent, mincnt = 1)
+            self.assertEqual(counts.sum(), len(x))
+            self.assertEqual(hexagons.get_array().sum(), len(x))
+
+
+    def test_stratified_sample(self):
+        # Sparse strata are kept whole, so the sample still covers the extremes
+        x = np.concatenate([self.rng.normal(size = 100000), [-50.0, 50.0]])
+        sample = _stratified_sample(x, 2000, 50, self.rng)
+        self.assertLessEqual(len(sample), 2000)
+        self.assertEqual(len(np.unique(sample)), len(sample))
+        self.assertEqual((x[sample].min(), x[sample].max()), (-50.0, 50.0))
+
+
+    def test_output_dir(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            data_df = self.data_df.assign(**{'nullable/int': self.data_df['uint8']})
+            file_paths = plot_by_feature(data_df, 'price', kind = 'hexbin', output_dir = output_dir, n_jobs = 2)
+            self.assertEqual(
+                [os.path.basename(file_path) for file_path in file_paths],
+                ['float32.png', 'uint8.png', 'nullable_int.png', 'nullable_int_2.png']
+            )
+            self.assertTrue(all(os.path.getsize(file_path) > 0 for file_path in file_paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# Standard library
+import tempfile
+import unittest
+
+# Third-party library
+import numpy as np
+
+# Local imports
+from ml_projects.apriori_algorithm import AprioriAlgorithm
+from ml_projects.itemset_index import ItemsetIndex
+
+
+
+class TestItemsetIndex(unittest.TestCase):
+    dataset = [
+        ['bread', 'milk'], ['bread', 'diaper', 'beer', 'eggs'], ['milk', 'diaper', 'beer', 'cola'],
+        ['bread', 'milk', 'diaper', 'beer'], ['bread', 'milk', 'diaper', 'cola']
+    ]
+    apriori_algorithm = AprioriAlgorithm(dataset = dataset, minsup = 0.4, minconf = 0.5).generate_all_rules()
+
+
+    def test_save_load(self):
+        itemset_index = ItemsetIndex.from_apriori_algorithm(self.apriori_algorithm)
+        with tempfile.TemporaryDirectory() as directory:
+            itemset_index.save(directory)
+            loaded_itemset_index = ItemsetIndex.load(directory)
+            self.assertIsInstance(loaded_itemset_index.rule_lifts, np.memmap)
+            self.assertEqual(loaded_itemset_index.item_labels, itemset_index.item_labels)
+
+            for itemset, support in self.apriori_algorithm.all_frequent_itemsets.items():
+                self.assertEqual(loaded_itemset_index.get_support(itemset), support)
+            self.assertIsNone(loaded_itemset_index.get_support(['bread', 'cola']))
+            self.assertIsNone(loaded_itemset_index.get_support(['bread', 'eggs']))
+
+            for item in itemset_index.item_labels:
+                self.assertEqual(
+                    loaded_itemset_index.recommend(['bread', item]),
+                    itemset_index.recommend(['bread', item])
+                )
+            del loaded_itemset_index
+
+
+    def test_recommend(self):
+        itemset_index = ItemsetIndex.from_apriori_algorithm(self.apriori_algorithm)
+        rules = itemset_index.recommend(['beer', 'milk'])
+        expected_rules = [
+            (antecedent, consequent, metrics) for (antecedent, consequent), metrics in self.apriori_algorithm.all_rules.items()
+            if antecedent <= {'beer', 'milk'} and not consequent & {'beer', 'milk'}
+        ]
+        self.assertEqual(len(rules), len(expected_rules))
+        self.assertEqual(set((antecedent, consequent) for antecedent, consequent, metrics in rules), set(
+            (antecedent, consequent) for antecedent, consequent, metrics in expected_rules
+        ))
+        self.assertEqual(
+            [metrics['confident'] for antecedent, consequent, metrics in rules],
+            sorted([metrics['confident'] for antecedent, consequent, metrics in expected_rules], reverse = True)
+        )
+
+        top_rules = itemset_index.recommend(['beer', 'milk', 'unknown'], top_k = 2, sort_by = 'lift')
+        self.assertEqual([metrics['lift'] for antecedent, consequent, metrics in top_rules], [1.25, 1.25])
+
+
+    def test_itemset_mode(self):
+        for itemset_mode in ['closed', 'maximal']:
+            apriori_algorithm = AprioriAlgorithm(dataset = self.dataset, minsup = 0.4, minconf = 0.5, itemset_mode = itemset_mode)
+            with self.assertRaises(ValueError):
+                ItemsetIndex.from_apriori_algorithm(apriori_algorithm.generate_all_frequent_itemsets())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# Standard library
+import unittest
+
+# Third-party library
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from pandas import DataFrame as df
+
+# Local imports
+from ml_projects.logistics_regression.logistic_regression import LogisticRegression
+
+
+
+class TestLogisticRegression(unittest.TestCase):
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.normal(50, 8, 2000), rng.normal(230, 40, 2000)])
+    Y = (rng.uniform(size = 2000) < 1 / (1 + np.exp(-(0.08*X[:, 0] + 0.01*X[:, 1] - 6.5)))).astype(float)
+    training_df = df({'age': X[:, 0], 'totChol': X[:, 1], 'TenYearCHD': Y})
+
+
+    def test_fit_and_train_agree(self):
+        newton_model = LogisticRegression(self.training_df, ['age', 'totChol'], 'TenYearCHD').fit()
+        self.assertLess(len(newton_model.iteration_list), 20)
+
+        # Newton solves the gradient to zero
+        p = newton_model.predict_proba(self.X)
+        np.testing.assert_allclose(np.column_stack([self.X, np.ones(2000)]).T.dot(p - self.Y) / 2000, 0, atol = 1e-8)
+
+        gd_model = LogisticRegression(self.training_df, ['age', 'totChol'], 'TenYearCHD')
+        gd_model.set_learning_rate(1.0)
+        gd_model.train()
+        self.assertAlmostEqual(gd_model.calculate_cost(self.training_df), newton_model.calculate_cost(self.training_df), places = 4)
+
+
+    def test_fit_max_time(self):
+        model = LogisticRegression(self.training_df, ['age', 'totChol'], 'TenYearCHD')
+        model.set_max_time(0)
+        model.fit()
+        self.assertEqual(model.training_result.stop_reason, 'max_time')
+        self.assertEqual(model.training_result.n_iterations, 0)
+        model.set_max_time(None)
+        self.assertEqual(model.fit().training_result.stop_reason, 'converged')
+
+
+    def test_l2(self):
+        model = LogisticRegression(self.training_df, ['age', 'totChol'], 'TenYearCHD').fit()
+        l2_model = LogisticRegression(self.training_df, ['age', 'totChol'], 'TenYearCHD', l2 = 500.0).fit()
+        self.assertLess(np.abs(l2_model.Theta[0, :-1] * l2_model.x_std).sum(), np.abs(model.Theta[0, :-1] * model.x_std).sum())
+
+
+    def test_na_strategy(self):
+        training_df = self.training_df.copy()
+        training_df.loc[:99, 'totChol'] = np.nan
+        self.assertEqual(LogisticRegression(training_df, ['age', 'totChol'], 'TenYearCHD').m, 1900)
+
+        model = LogisticRegression(training_df, ['age', 'totChol'], 'TenYearCHD', na_strategy = 'mean').fit()
+        self.assertEqual(model.m, 2000)
+        self.assertFalse(np.isnan(model.predict_proba(training_df)).any())
+        with self.assertRaises(ValueError):
+            LogisticRegression(training_df, ['age', 'totChol'], 'TenYearCHD', na_strategy = 'zero')
+
+
+    def test_predict_proba(self):
+        model = LogisticRegression(self.training_df, ['age', 'totChol'], 'TenYearCHD').fit()
+        probabilities = model.predict_proba(self.training_df)
+        np.testing.assert_allclose(model.predict_proba(self.X, batch_size = 300), probabilities)
+        self.assertAlmostEqual(model.predict_proba(self.X[0]), probabilities[0])
+        np.testing.assert_array_equal(model.predict(self.X, threshold = 0.3), probabilities >= 0.3)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
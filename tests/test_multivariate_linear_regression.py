@@ -0,0 +1,74 @@
+# Standard library
+import unittest
+
+# Third-party library
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from pandas import DataFrame as df
+
+# Local imports
+from ml_projects.linear_regression.multivariate import MultivariateLinearRegression
+
+
+
+class TestMultivariateLinearRegression(unittest.TestCase):
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.uniform(1990, 2017, 500), rng.uniform(100, 700, 500)])
+    Y = 700*X[:, 0] + 150*X[:, 1] - 1400000 + rng.normal(0, 10, 500)
+    training_df = df({'Year': X[:, 0], 'Engine HP': X[:, 1], 'MSRP': Y})
+    expected_Theta = np.linalg.lstsq(np.column_stack([X, np.ones(500)]), Y, rcond = None)[0]
+
+
+    def test_fit(self):
+        for solver in MultivariateLinearRegression.SOLVERS:
+            model = MultivariateLinearRegression(self.training_df, ['Year', 'Engine HP'], 'MSRP').fit(solver)
+            np.testing.assert_allclose(model.Theta[0], self.expected_Theta, rtol = 1e-6)
+        with self.assertRaises(ValueError):
+            model.fit('svd')
+
+
+    def test_train(self):
+        # Standardized features converge with a plain learning rate
+        model = MultivariateLinearRegression(self.training_df, ['Year', 'Engine HP'], 'MSRP')
+        model.set_learning_rate(0.5)
+        model.train()
+        np.testing.assert_allclose(model.Theta[0], self.expected_Theta, rtol = 1e-3)
+        self.assertLess(len(model.cost_list), 1000)
+
+
+    def test_train_sgd(self):
+        model = MultivariateLinearRegression(self.training_df, ['Year', 'Engine HP'], 'MSRP')
+        model.set_learning_rate(0.05)
+        model.train_sgd(batch_size = 32, n_epochs = 30, random_state = 0)
+        np.testing.assert_allclose(model.Theta[0, :2], self.expected_Theta[:2], rtol = 1e-2)
+
+        chunks = lambda: (self.training_df[start:start + 100] for start in range(0, 500, 100))
+        model = MultivariateLinearRegression(self.training_df, ['Year', 'Engine HP'], 'MSRP')
+        model.set_learning_rate(0.05)
+        model.train_sgd(chunks = chunks, batch_size = 32, n_epochs = 30, random_state = 0)
+        np.testing.assert_allclose(model.Theta[0, :2], self.expected_Theta[:2], rtol = 1e-2)
+
+
+    def test_predict(self):
+        model = MultivariateLinearRegression(self.training_df, ['Year', 'Engine HP'], 'MSRP').fit()
+        self.assertAlmostEqual(model.predict([2010, 700]), self.expected_Theta.dot([2010, 700, 1]), places = 3)
+        np.testing.assert_allclose(
+            model.predict(self.training_df[['Year', 'Engine HP']]),
+            np.column_stack([self.X, np.ones(500)]).dot(self.expected_Theta)
+        )
+
+        # DataFrame columns are selected by name, in any order and with extra columns
+        np.testing.assert_allclose(model.predict(self.training_df[['Engine HP', 'Year']]), model.predict(self.X))
+        np.testing.assert_allclose(model.predict(self.training_df), model.predict(self.X))
+
+
+    def test_plot(self):
+        model = MultivariateLinearRegression(self.training_df, ['Year', 'Engine HP'], 'MSRP', plot = True)
+        model.set_learning_rate(0.5)
+        model.train()
+        self.assertTrue(model.training_result.is_converged)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# Standard library
+import unittest
+
+# Third-party library
+from pandas import DataFrame as df
+
+# Local imports
+from ml_projects.sequential_pattern.prefix_span import PrefixSpan, SequenceStore
+
+
+
+class TestPrefixSpan(unittest.TestCase):
+    maxDiff = None
+    dataset = [
+        [['a','b'], ['c'], ['f','g'], ['g'], ['e']],
+        [['a','d'], ['c'], ['b'], ['a','b','e','f']],
+        [['a'],['b'], ['f','g'], ['e']],
+        [['b'], ['f','g']]
+    ]
+
+
+    def test_generate_all_frequent_sequences(self):
+        prefix_span = PrefixSpan(dataset = self.dataset, minsup = 0.75).generate_all_frequent_sequences()
+        self.assertEqual(
+            prefix_span.all_frequent_sequences,
+            {
+                (frozenset({'a'}),): 0.75,
+                (frozenset({'b'}),): 1.0,
+                (frozenset({'e'}),): 0.75,
+                (frozenset({'f'}),): 1.0,
+                (frozenset({'g'}),): 0.75,
+                (frozenset({'f', 'g'}),): 0.75,
+                (frozenset({'a'}), frozenset({'e'})): 0.75,
+                (frozenset({'a'}), frozenset({'f'})): 0.75,
+                (frozenset({'b'}), frozenset({'e'})): 0.75,
+                (frozenset({'b'}), frozenset({'f'})): 1.0,
+                (frozenset({'b'}), frozenset({'g'})): 0.75,
+                (frozenset({'b'}), frozenset({'f', 'g'})): 0.75,
+            }
+        )
+
+        prefix_span = PrefixSpan(dataset = self.dataset, minsup = 0.5, max_length = 2).generate_all_frequent_sequences()
+        self.assertEqual(max(sum(map(len, sequence)) for sequence in prefix_span.all_frequent_sequences), 2)
+        self.assertIn((frozenset({'a', 'b'}),), prefix_span.all_frequent_sequences)
+        self.assertIn((frozenset({'a'}), frozenset({'c'})), prefix_span.all_frequent_sequences)
+
+        # 'a' is 2 or 3 orders before 'e' except in the second sequence
+        prefix_span = PrefixSpan(dataset = self.dataset, minsup = 0.5, max_gap = 1).generate_all_frequent_sequences()
+        self.assertNotIn((frozenset({'a'}), frozenset({'e'})), prefix_span.all_frequent_sequences)
+        self.assertEqual(prefix_span.all_frequent_sequences[(frozenset({'b'}), frozenset({'f', 'g'}))], 0.5)
+        self.assertEqual(prefix_span.all_frequent_sequences[(frozenset({'g'}), frozenset({'e'}))], 0.5)
+        self.assertNotIn((frozenset({'f', 'g'}), frozenset({'e'})), prefix_span.all_frequent_sequences)
+
+
+    def test_set_sequence_dataset(self):
+        line_items_df = df(
+            data = [
+                (f'customer_{i}', f'order_{i}_{j}', f'2020-01-{j + 1:02}', item)
+                for i, sequence in enumerate(self.dataset) for j, element in enumerate(sequence) for item in element
+            ] + [('customer_0', 'order_0_0', '2020-01-01', 'a'), ('customer_1', None, '2020-01-01', 'a')],
+            columns = ['customer_id', 'order_id', 'order_date', 'category']
+        ).sample(frac = 1, random_state = 0)
+        prefix_span = PrefixSpan(minsup = 0.5).set_sequence_dataset(
+            sequence_dataset = line_items_df,
+            customer_id_column = 'customer_id',
+            order_id_column = 'order_id',
+            itemset_column = 'category',
+            order_by_column = 'order_date'
+        )
+        self.assertIsInstance(prefix_span.dataset, SequenceStore)
+        self.assertEqual(prefix_span.n, 4)
+        self.assertEqual(
+            [[frozenset(element) for element in sequence] for sequence in prefix_span.dataset],
+            [[frozenset(element) for element in sequence] for sequence in self.dataset]
+        )
+        self.assertEqual(
+            prefix_span.generate_all_frequent_sequences().all_frequent_sequences,
+            PrefixSpan(dataset = self.dataset, minsup = 0.5).generate_all_frequent_sequences().all_frequent_sequences
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
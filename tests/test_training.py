@@ -0,0 +1,84 @@
+# Standard library
+import unittest
+
+# Third-party library
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from pandas import DataFrame as df
+
+# Local imports
+from ml_projects.linear_regression.training import (
+    Adam, AdaptiveLearningRate, CostHistory, GradientDescent, Momentum, minimize
+)
+from ml_projects.linear_regression.univariate import UnivariateLinearRegression
+
+
+
+class TestTraining(unittest.TestCase):
+    # Ill-conditioned quadratic 0.5*(x^2 + 100*y^2), minimum at the origin
+    scales = np.array([1.0, 100.0])
+
+
+    def objective(self, theta):
+        return 0.5*float(self.scales.dot(theta**2)), self.scales*theta
+
+
+    def test_minimize_optimizers(self):
+        for optimizer in [GradientDescent(0.015), Momentum(0.01), Adam(0.1), AdaptiveLearningRate(0.001)]:
+            theta, training_result = minimize(
+                self.objective, np.array([5.0, 3.0]), optimizer,
+                cost_history = CostHistory(), max_iterations = 20000, gradient_tolerance = 1e-6
+            )
+            self.assertTrue(training_result.is_converged, (optimizer, training_result))
+            np.testing.assert_allclose(theta, 0, atol = 1e-5)
+
+
+    def test_minimize_back_off(self):
+        # Plain gradient descent stops on a rising cost, the adaptive learning rate backs off and converges
+        theta, training_result = minimize(
+            self.objective, np.array([5.0, 3.0]), GradientDescent(0.05), cost_history = CostHistory()
+        )
+        self.assertEqual(training_result.stop_reason, 'diverged')
+        np.testing.assert_array_equal(theta, [5.0, 3.0])
+
+        optimizer = AdaptiveLearningRate(0.05)
+        theta, training_result = minimize(
+            self.objective, np.array([5.0, 3.0]), optimizer, cost_history = CostHistory(), gradient_tolerance = 1e-6
+        )
+        self.assertTrue(training_result.is_converged)
+        self.assertLess(training_result.n_iterations, 1000)
+
+
+    def test_minimize_budgets(self):
+        cost_history = CostHistory(record_every = 10)
+        theta, training_result = minimize(
+            self.objective, np.array([5.0, 3.0]), GradientDescent(0.001), cost_history = cost_history, max_iterations = 25
+        )
+        self.assertEqual((training_result.stop_reason, training_result.n_iterations), ('max_iterations', 25))
+        self.assertEqual(cost_history.iteration_list.tolist(), [0, 10, 20, 25])
+
+        theta, training_result = minimize(
+            self.objective, np.array([5.0, 3.0]), GradientDescent(1e-9), cost_history = CostHistory(), max_time = 0.05
+        )
+        self.assertEqual(training_result.stop_reason, 'max_time')
+        self.assertGreaterEqual(training_result.training_time, 0.05)
+
+
+    def test_model_optimizer(self):
+        training_set = df({'x': [1.0, 2.0, 3.0, 4.0, 5.0], 'y': [3.1, 4.9, 7.2, 8.8, 11.1]})
+        expected_model = UnivariateLinearRegression(training_set, 'x', 'y').fit()
+
+        model = UnivariateLinearRegression(training_set, 'x', 'y')
+        model.set_optimizer(Adam(0.1))
+        model.set_cost_tolerance(None)
+        model.set_gradient_tolerance(1e-8)
+        model.train()
+        self.assertTrue(model.training_result.is_converged)
+        self.assertAlmostEqual(model.theta_0, expected_model.theta_0, places = 6)
+        self.assertAlmostEqual(model.theta_1, expected_model.theta_1, places = 6)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
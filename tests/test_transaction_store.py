@@ -0,0 +1,136 @@
+# Standard library
+import os
+import tempfile
+import unittest
+
+# Third-party library
+from pandas import DataFrame as df
+
+# Local imports
+from ml_projects.helpers import SqlDb
+from ml_projects.transaction_store import TransactionStore
+
+
+
+class TestTransactionStore(unittest.TestCase):
+    dataset = [
+        ["a"], ["a", "b", "c"], ["a", "c"], ["c"],
+        ["a"], ["c"], ["b", "c", "c"],
+        ["a", "b"], ["d"], ["c"], ["b"], ["c"],
+        ["a"], ["c"], ["b"], ["c"]
+    ]
+
+
+    def test_encoding(self):
+        transaction_store = TransactionStore(self.dataset)
+        self.assertEqual(len(transaction_store), 16)
+        # Codes are dense and ordered by descending frequency
+        self.assertEqual(transaction_store.item_labels, ['c', 'a', 'b', 'd'])
+        self.assertEqual(list(transaction_store.item_counts), [9, 6, 5, 1])
+        self.assertEqual(transaction_store.item_codes, {'c': 0, 'a': 1, 'b': 2, 'd': 3})
+        self.assertEqual(len(transaction_store.items), 21)
+        self.assertEqual(transaction_store.offsets[-1], 21)
+
+
+    def test_transactions(self):
+        transaction_store = TransactionStore(self.dataset)
+        self.assertEqual(list(transaction_store.get_encoded_transaction(1)), [0, 1, 2])
+        self.assertEqual(list(transaction_store.get_encoded_transaction(6)), [0, 2])
+        self.assertEqual(transaction_store[1], ('c', 'a', 'b'))
+        self.assertEqual(transaction_store[-1], ('c',))
+        self.assertEqual([frozenset(transaction) for transaction in transaction_store], [frozenset(transaction) for transaction in self.dataset])
+        with self.assertRaises(IndexError):
+            transaction_store[16]
+
+
+    def test_get_subset(self):
+        transaction_store = TransactionStore(self.dataset)
+        subset = transaction_store.get_subset([6, 1, 8])
+        self.assertEqual(len(subset), 3)
+        self.assertEqual(list(subset), [transaction_store[6], transaction_store[1], transaction_store[8]])
+        self.assertEqual(list(subset.item_counts), [2, 1, 2, 1])
+        self.assertEqual(subset.item_codes, transaction_store.item_codes)
+        # The subset has its own item dictionary, new items do not reach the parent store
+        subset.add_transaction(['e'])
+        self.assertNotIn('e', transaction_store.item_codes)
+        self.assertEqual(len(transaction_store.item_labels), 4)
+        self.assertEqual(len(transaction_store.get_subset([])), 0)
+
+
+    def test_copy(self):
+        transaction_store = TransactionStore(self.dataset)
+        copied_transaction_store = transaction_store.copy().add_transactions([['a', 'e'], ['b']])
+        self.assertEqual(len(copied_transaction_store), 18)
+        self.assertEqual(copied_transaction_store.item_labels, ['c', 'a', 'b', 'd', 'e'])
+        self.assertEqual(len(transaction_store), 16)
+        self.assertEqual(transaction_store.item_labels, ['c', 'a', 'b', 'd'])
+        self.assertEqual(list(transaction_store.item_counts), [9, 6, 5, 1])
+
+
+    def test_itemsets(self):
+        transaction_store = TransactionStore(self.dataset)
+        self.assertEqual(transaction_store.encode_itemset(['b', 'a']), (1, 2))
+        self.assertEqual(transaction_store.encode_itemset(['a', 'e']), None)
+        self.assertEqual(transaction_store.decode_itemset((1, 2)), frozenset({'a', 'b'}))
+
+
+    def test_from_dataframe(self):
+        line_items_df = df(
+            data = [
+                (transaction_id, item) for transaction_id, transaction in enumerate(self.dataset) for item in transaction
+            ] + [(3, None), (16, None)],
+            columns = ['order_id', 'category']
+        ).sample(frac = 1, random_state = 0)
+        transaction_store = TransactionStore.from_dataframe(
+            line_items_df,
+            transaction_id_column = 'order_id',
+            itemset_column = 'category'
+        )
+        expected_transaction_store = TransactionStore(self.dataset)
+        self.assertEqual(transaction_store.item_labels, expected_transaction_store.item_labels)
+        self.assertEqual(transaction_store.item_counts, expected_transaction_store.item_counts)
+        self.assertEqual(transaction_store.items, expected_transaction_store.items)
+        self.assertEqual(transaction_store.offsets, expected_transaction_store.offsets)
+
+
+    def test_streaming_ingestion(self):
+        line_items_df = df(
+            data = [
+                (transaction_id, item) for transaction_id, transaction in enumerate(self.dataset) for item in transaction
+            ],
+            columns = ['order_id', 'category']
+        )
+        expected_transactions = [frozenset(transaction) for transaction in self.dataset]
+
+        transaction_store = TransactionStore(iter(self.dataset))
+        self.assertEqual([frozenset(transaction) for transaction in transaction_store], expected_transactions)
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'line_items.csv')
+            line_items_df.to_csv(file_path, index = False)
+            transaction_store = TransactionStore.from_csv(
+                file_path,
+                transaction_id_column = 'order_id',
+                itemset_column = 'category',
+                chunksize = 5
+            )
+        self.assertEqual([frozenset(transaction) for transaction in transaction_store], expected_transactions)
+        self.assertEqual(list(transaction_store.item_counts), [9, 6, 5, 1])
+
+        sql_db = SqlDb()
+        sql_db.create_table('order_line_item', data_df = line_items_df)
+        transaction_store = TransactionStore.from_sql(
+            sql_db,
+            'SELECT order_id, category FROM order_line_item ORDER BY category',
+            transaction_id_column = 'order_id',
+            itemset_column = 'category',
+            chunksize = 4
+        )
+        self.assertEqual(
+            sorted(map(sorted, transaction_store)),
+            sorted(map(sorted, expected_transactions))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Standard library
+import contextlib
+import io
+import unittest
+
+# Third-party library
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from pandas import DataFrame as df
+from pandas import Series
+
+# Local imports
+from ml_projects.linear_regression.univariate import UnivariateLinearRegression
+
+
+
+class TestUnivariateLinearRegression(unittest.TestCase):
+    training_set = df({
+        'x': [1.0, 2.0, 3.0, 4.0, 5.0, None],
+        'y': [3.1, 4.9, 7.2, 8.8, 11.1, 1.0]
+    })
+
+
+    def test_calculate_cost(self):
+        model = UnivariateLinearRegression(self.training_set, 'x', 'y')
+        model.theta_0 = 1
+        model.theta_1 = 2
+        residual = 1 + 2*np.array([1.0, 2.0, 3.0, 4.0, 5.0]) - np.array([3.1, 4.9, 7.2, 8.8, 11.1])
+        self.assertAlmostEqual(model.calculate_cost(model.training_set), (residual**2).sum() / 10)
+
+
+    def test_fit(self):
+        model = UnivariateLinearRegression(self.training_set, 'x', 'y').fit()
+        theta_1, theta_0 = np.polyfit([1.0, 2.0, 3.0, 4.0, 5.0], [3.1, 4.9, 7.2, 8.8, 11.1], 1)
+        self.assertAlmostEqual(model.theta_0, theta_0)
+        self.assertAlmostEqual(model.theta_1, theta_1)
+
+
+    def test_train(self):
+        model = UnivariateLinearRegression(self.training_set, 'x', 'y')
+        model.set_learning_rate(0.05)
+        model.train()
+        self.assertEqual(model.m, 5)
+        self.assertEqual(len(model.cost_list), len(model.iteration_list))
+        self.assertLess(model.cost_list[-1], model.cost_list[0])
+        self.assertAlmostEqual(model.calculate_cost(model.training_set), model.cost_list[-1])
+
+
+    def test_predict(self):
+        model = UnivariateLinearRegression(self.training_set, 'x', 'y')
+        model.theta_0 = 1
+        model.theta_1 = 2
+        self.assertEqual(model.predict(3), 7)
+        np.testing.assert_array_equal(model.predict(np.array([1.0, 2.0])), [3.0, 5.0])
+        np.testing.assert_array_equal(model.predict([1.0, 2.0]), [3.0, 5.0])
+        predictions = model.predict(Series([1.0, 2.0], index = ['a', 'b']))
+        self.assertEqual(predictions.to_dict(), {'a': 3.0, 'b': 5.0})
+
+
+    def test_silent_training(self):
+        output = io.StringIO()
+        recorded_iterations = list()
+        with contextlib.redirect_stdout(output):
+            model = UnivariateLinearRegression(
+                self.training_set, 'x', 'y',
+                record_every = 10,
+                callback = lambda model, iteration, cost: recorded_iterations.append(iteration)
+            )
+            model.set_learning_rate(0.05)
+            model.train()
+            model.predict(np.array([1.0, 2.0]))
+        self.assertEqual(output.getvalue(), '')
+
+        # Iteration 0, every 10th iteration and the last one
+        last_iteration = model.iteration_list[-1]
+        self.assertEqual(recorded_iterations, list(range(10, last_iteration + 1, 10)))
+        self.assertEqual(model.iteration_list.tolist(), sorted({0, *recorded_iterations, last_iteration}))
+        self.assertAlmostEqual(model.calculate_cost(model.training_set), model.cost_list[-1])
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            model = UnivariateLinearRegression(self.training_set, 'x', 'y', verbose = 1)
+            model.set_learning_rate(0.05)
+            model.train()
+        self.assertIn('Dropped 1 null rows of training set', output.getvalue())
+        self.assertIn('Finish training.', output.getvalue())
+        self.assertNotIn('Iterate:', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()